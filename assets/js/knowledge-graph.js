@@ -120,6 +120,14 @@
         if (typeof data === 'string') {
             data = JSON.parse(data);
         }
+        // scripts/build_graph.py --int-ids writes per-node adjacency arrays instead of links.
+        if (data && Array.isArray(data.nodes) && Array.isArray(data.adjacency)) {
+            const links = [];
+            data.adjacency.forEach((targets, source) => {
+                targets.forEach(target => links.push({ source, target }));
+            });
+            data = { nodes: data.nodes, links };
+        }
         if (!data || !Array.isArray(data.nodes) || !Array.isArray(data.links)) {
             throw new Error('Graph data must include nodes and links arrays.');
         }
@@ -289,17 +297,17 @@
             panelSummary.textContent = node.summary || '';
             panelDate.style.display = 'block';
             panelSummary.style.display = 'block';
-            panelLink.href = node.id;
+            panelLink.href = node.url || node.id;
             panelLinkText.textContent = 'Read Article';
         } else {
             panelDate.style.display = 'none';
             panelSummary.style.display = 'none';
 
             if (node.group === 'category') {
-                panelLink.href = '/posts/?category=' + node.id.replace('cat-', '');
+                panelLink.href = '/posts/?category=' + (node.slug || node.id.replace('cat-', ''));
                 panelLinkText.textContent = 'Explore Category';
             } else if (node.group === 'tag') {
-                panelLink.href = '/posts/?tag=' + node.id.replace('tag-', '');
+                panelLink.href = '/posts/?tag=' + (node.slug || node.id.replace('tag-', ''));
                 panelLinkText.textContent = 'Browse Tag';
             }
         }
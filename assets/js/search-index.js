@@ -0,0 +1,149 @@
+(function () {
+    'use strict';
+
+    // Client for the sharded index written by scripts/build_search.py. Only the manifest,
+    // the shards covering the query tokens and the doc chunks of the top hits are fetched.
+    if (window.TheLogosSearch) return;
+
+    const BASE = document.currentScript?.dataset.searchIndex || '/search/';
+    const HANGUL_RE = /[가-힣]+/g;
+    const WORD_RE = /[a-z0-9]+/g;
+    const cache = new Map();
+
+    async function fetchRaw(name) {
+        // Prefer the precompressed copy; fall back to plain JSON where gzip streams are unsupported.
+        if (typeof DecompressionStream === 'function') {
+            try {
+                const response = await fetch(BASE + name + '.gz');
+                if (response.ok) {
+                    const bytes = new Uint8Array(await response.arrayBuffer());
+                    // A server may already have decoded it (Content-Encoding: gzip).
+                    if (bytes[0] !== 0x1f || bytes[1] !== 0x8b) {
+                        return JSON.parse(new TextDecoder().decode(bytes));
+                    }
+                    const stream = new Blob([bytes]).stream().pipeThrough(new DecompressionStream('gzip'));
+                    return await new Response(stream).json();
+                }
+            } catch (error) {
+                console.warn('[Search] Falling back to uncompressed index:', error);
+            }
+        }
+        const response = await fetch(BASE + name);
+        if (!response.ok) throw new Error('Search index file missing: ' + name);
+        return response.json();
+    }
+
+    function fetchJSON(name) {
+        if (!cache.has(name)) {
+            const promise = fetchRaw(name);
+            promise.catch(() => cache.delete(name));
+            cache.set(name, promise);
+        }
+        return cache.get(name);
+    }
+
+    // Keep in sync with tokenize() in scripts/build_search.py.
+    function tokenize(text, stopwords) {
+        const normalized = (text || '').normalize('NFC').toLowerCase();
+        const tokens = new Set();
+        for (const run of normalized.match(HANGUL_RE) || []) {
+            if (run.length === 1) {
+                tokens.add(run);
+            } else {
+                for (let i = 0; i < run.length - 1; i += 1) tokens.add(run.slice(i, i + 2));
+            }
+        }
+        for (const word of normalized.match(WORD_RE) || []) {
+            if (word.length > 1 && !stopwords.has(word)) tokens.add(word);
+        }
+        return Array.from(tokens);
+    }
+
+    // Index of the shard whose range holds token: the last boundary <= token.
+    function shardFor(shards, token) {
+        let lo = 0;
+        let hi = shards.length - 1;
+        while (lo < hi) {
+            const mid = (lo + hi + 1) >> 1;
+            if (shards[mid][0] <= token) lo = mid;
+            else hi = mid - 1;
+        }
+        return lo;
+    }
+
+    function decode(postings, into) {
+        let docId = 0;
+        for (const value of postings) {
+            docId += value >> 1;
+            into.set(docId, (into.get(docId) || 0) | (value & 1));
+        }
+        return into;
+    }
+
+    // {docId: inTitle} for one query token. A lone Hangul syllable also matches every
+    // bigram that starts with it, which may span the next shards.
+    async function lookup(manifest, token) {
+        const prefix = token.length === 1 && /[가-힣]/.test(token);
+        const first = shardFor(manifest.shards, token);
+        const hits = new Map();
+        for (let i = first; i < manifest.shards.length; i += 1) {
+            if (i > first && !(prefix && manifest.shards[i][0].startsWith(token))) break;
+            const shard = await fetchJSON(manifest.shards[i][1]);
+            for (const [term, postings] of Object.entries(shard)) {
+                if (term === token || (prefix && term.startsWith(token))) decode(postings, hits);
+            }
+            if (!prefix) break;
+        }
+        return hits;
+    }
+
+    let manifestPromise = null;
+
+    function loadManifest() {
+        if (!manifestPromise) {
+            manifestPromise = fetchJSON('manifest.json').then(manifest => {
+                manifest.stopwordSet = new Set(manifest.stopwords || []);
+                return manifest;
+            });
+            manifestPromise.catch(() => { manifestPromise = null; });
+        }
+        return manifestPromise;
+    }
+
+    /**
+     * Every query token must match (AND). Score = sum of idf * (3 for a title/tag hit, else 1);
+     * ties keep index order, which is newest first.
+     */
+    async function search(query, limit = 20) {
+        const manifest = await loadManifest();
+        const tokens = tokenize(query, manifest.stopwordSet);
+        if (!tokens.length) return [];
+
+        const lists = await Promise.all(tokens.map(token => lookup(manifest, token)));
+        lists.sort((a, b) => a.size - b.size);
+        const scores = new Map();
+        for (const [docId] of lists[0]) scores.set(docId, 0);
+        for (const hits of lists) {
+            const idf = Math.log(1 + manifest.docs / Math.max(hits.size, 1));
+            for (const docId of Array.from(scores.keys())) {
+                if (!hits.has(docId)) scores.delete(docId);
+                else scores.set(docId, scores.get(docId) + idf * (hits.get(docId) ? 3 : 1));
+            }
+        }
+
+        const ranked = Array.from(scores.entries())
+            .sort((a, b) => b[1] - a[1] || a[0] - b[0])
+            .slice(0, limit);
+        const chunks = await Promise.all(
+            Array.from(new Set(ranked.map(([docId]) => Math.floor(docId / manifest.doc_chunk))))
+                .map(chunk => fetchJSON('docs-' + chunk + '.json').then(docs => [chunk, docs]))
+        );
+        const docsByChunk = new Map(chunks);
+        return ranked.map(([docId, score]) => {
+            const [url, title, date, summary] = docsByChunk.get(Math.floor(docId / manifest.doc_chunk))[docId % manifest.doc_chunk];
+            return { url, title, date, summary, score };
+        });
+    }
+
+    window.TheLogosSearch = { search };
+})();
@@ -1,6 +1,38 @@
 
 // Import Ethers.js from CDN in the layout, or assume it's global 'ethers'
 
+// Merkle site manifest (scripts/sign_content.py --merkle):
+//   leaf = sha256(0x00 || content_hash), node = sha256(0x01 || left || right)
+// Proof steps are "L:<hex>" / "R:<hex>" for a sibling on the left / right.
+function merkleRootFromProof(contentHash, proof) {
+    let node = ethers.getBytes(ethers.sha256(ethers.concat([new Uint8Array([0]), withHexPrefix(contentHash)])));
+    for (const step of proof) {
+        const [side, sibling] = step.split(':');
+        const pair = side === 'L' ? [withHexPrefix(sibling), node] : [node, withHexPrefix(sibling)];
+        node = ethers.getBytes(ethers.sha256(ethers.concat([new Uint8Array([1]), ...pair])));
+    }
+    return ethers.hexlify(node).slice(2);
+}
+
+function withHexPrefix(hex) {
+    return hex.startsWith('0x') ? hex : '0x' + hex;
+}
+
+// The root signature is the same for every post, so recover it once per root and cache the signer.
+function recoverRootSigner(root, signature) {
+    const cacheKey = `logos-merkle-root:${root}`;
+    try {
+        const cached = localStorage.getItem(cacheKey);
+        if (cached) return cached;
+    } catch (e) { /* storage disabled */ }
+
+    const recovered = ethers.verifyMessage(root, withHexPrefix(signature));
+    try {
+        localStorage.setItem(cacheKey, recovered);
+    } catch (e) { /* storage disabled */ }
+    return recovered;
+}
+
 async function verifyContent() {
     const statusEl = document.getElementById('verification-status');
     const verifyBtn = document.getElementById('verify-btn-text');
@@ -37,7 +69,18 @@ async function verifyContent() {
         // Python: encode_defunct(text=content_hash) -> sign_message
         // This allows 'ethers.verifyMessage(content_hash, signature)'
 
-        const recoveredAddress = ethers.verifyMessage(messageHash, signature);
+        let recoveredAddress;
+        const merkleRoot = document.getElementById('meta-merkle-root');
+        if (merkleRoot) {
+            // O(log N): fold the proof up to the root, then check the one site-wide root signature.
+            const proof = JSON.parse(document.getElementById('meta-merkle-proof').content);
+            if (merkleRootFromProof(messageHash, proof) !== merkleRoot.content) {
+                throw new Error("Merkle proof does not lead to the signed root");
+            }
+            recoveredAddress = recoverRootSigner(merkleRoot.content, signature);
+        } else {
+            recoveredAddress = ethers.verifyMessage(messageHash, withHexPrefix(signature));
+        }
 
         if (recoveredAddress.toLowerCase() === signer.toLowerCase()) {
             // Success
@@ -0,0 +1,150 @@
+"""
+Deterministic synthetic corpus for the benchmarks.
+
+Posts look like the ones in content/posts: TOML front matter (title, date, tags,
+categories, optionally an existing [params.verification] table), mixed Korean/English
+paragraphs, an {{< instagram >}} embed, either an {{< ai_summary >}} shortcode or the
+legacy <div class="ai-summary-box"> that migrate_to_shortcode.py rewrites, and some
+emoji noise for contentlint. The same (count, seed) always yields the same bytes.
+
+    python benchmarks/corpus.py /tmp/corpus --posts 1000
+"""
+
+import argparse
+import random
+import string
+from datetime import datetime, timedelta
+from pathlib import Path
+
+KOREAN_WORDS = (
+    "하나님 은혜 믿음 소망 사랑 교회 공동체 말씀 기도 예배 창조 질서 혼돈 자유 의지 진리 지혜 "
+    "시간 역사 기억 고난 위로 정의 평화 생명 죽음 부활 구원 언약 세계 인간 기술 인공지능 알고리즘 "
+    "데이터 시스템 구조 관계 의미 질문 대답 철학 신학 과학 우주 양자 에너지 엔트로피 확률"
+).split()
+KOREAN_ENDINGS = ("이다.", "을 생각한다.", "은 무엇인가?", "에 대하여.", "를 묻는다.", "와 함께 걷는다.", "이 드러난다.")
+ENGLISH_WORDS = (
+    "grace faith hope love church community word prayer worship creation order chaos freedom "
+    "truth wisdom time history memory suffering justice peace life death system structure "
+    "meaning question answer theology science universe entropy probability network signal"
+).split()
+EMOJIS = ("😀", "🙏", "✨", "📖", "❤️", "🔥", "👍🏻", "👨‍👩‍👧", "☀", "✝")
+TAGS = ("신앙", "철학", "AI", "과학", "묵상", "공동체", "역사", "기술", "writing", "essay", "theology")
+CATEGORIES = ("writing", "religion", "science", "technology", "philosophy")
+SHORTCODE_ALPHABET = string.ascii_letters + string.digits + "_-"
+
+
+def shortcode(rng):
+    return rng.choice("BCD") + "".join(rng.choice(SHORTCODE_ALPHABET) for _ in range(10))
+
+
+def korean_sentence(rng):
+    return " ".join(rng.choice(KOREAN_WORDS) for _ in range(rng.randint(4, 12))) + rng.choice(KOREAN_ENDINGS)
+
+
+def english_sentence(rng):
+    words = [rng.choice(ENGLISH_WORDS) for _ in range(rng.randint(6, 16))]
+    return " ".join(words).capitalize() + "."
+
+
+def paragraph(rng, emoji_rate):
+    sentences = []
+    for _ in range(rng.randint(2, 6)):
+        sentence = korean_sentence(rng) if rng.random() < 0.7 else english_sentence(rng)
+        if rng.random() < emoji_rate:
+            sentence += " " + rng.choice(EMOJIS)
+        sentences.append(sentence)
+    return " ".join(sentences)
+
+
+def toml_string(text):
+    return '"' + text.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+def make_post(index, rng, start=datetime(2019, 1, 1)):
+    """Return (file name, text, instagram shortcode) for post number index."""
+    title = f"{korean_sentence(rng).rstrip('.?')} {index}"
+    code = shortcode(rng)
+    date = start + timedelta(hours=index * 7 + rng.randint(0, 6), minutes=rng.randint(0, 59))
+    tags = rng.sample(TAGS, rng.randint(1, 4))
+    lines = [
+        "+++",
+        f"title = {toml_string(title)}",
+        f"date = {date.isoformat()}+09:00",
+        "draft = false",
+        f"categories = [{toml_string(rng.choice(CATEGORIES))}]",
+        f"tags = [{', '.join(toml_string(tag) for tag in tags)}]",
+    ]
+    if rng.random() < 0.3:
+        # An older signature, so re-signing has a table to replace.
+        lines += [
+            "",
+            "[params.verification]",
+            f'  signer_address = "0x{rng.getrandbits(160):040x}"',
+            f'  signature = "{rng.getrandbits(520):0130x}"',
+            f'  content_hash = "{rng.getrandbits(256):064x}"',
+            f'  timestamp = "{date:%Y-%m-%d}"',
+        ]
+    lines.append("+++")
+
+    summary = "\n".join(f"- {korean_sentence(rng)}" for _ in range(3))
+    body = [f"{{{{< instagram {code} >}}}}", ""]
+    if rng.random() < 0.25:
+        body += ['<div class="ai-summary-box">', summary, "</div>", ""]
+    else:
+        body += ["{{< ai_summary >}}", summary, "{{< /ai_summary >}}", ""]
+    for _ in range(rng.randint(3, 12)):
+        body += [paragraph(rng, emoji_rate=0.15), ""]
+    body.append(" ".join(f"#{tag}" for tag in tags))
+    return f"post-{index:05d}.md", "\n".join(lines) + "\n" + "\n".join(body) + "\n", code
+
+
+def generate(root, posts, seed=0):
+    """Write posts files into root (created if needed); return the list of paths."""
+    root = Path(root)
+    root.mkdir(parents=True, exist_ok=True)
+    rng = random.Random(seed)
+    paths = []
+    for index in range(posts):
+        name, text, _ = make_post(index, rng)
+        path = root / name
+        path.write_text(text, encoding="utf-8")
+        paths.append(path)
+    return paths
+
+
+def instagram_items(count, seed=0):
+    """Inputs for create_hugo_post/extract_shortcode: (url, title, shortcode, date, tags, mentions, summary, caption)."""
+    rng = random.Random(seed + 1)
+    items = []
+    for index in range(count):
+        code = shortcode(rng)
+        kind = "reel" if rng.random() < 0.2 else "p"
+        url = f"https://www.instagram.com/{kind}/{code}/?utm_source=ig_web_copy_link&igsh={rng.getrandbits(40):x}"
+        tags = rng.sample(TAGS, rng.randint(1, 4))
+        caption = "\n\n".join(paragraph(rng, emoji_rate=0.3) for _ in range(rng.randint(1, 5)))
+        caption += "\n\n\n" + " ".join(f"#{tag}" for tag in tags)
+        items.append({
+            "url": url,
+            "title": f'{korean_sentence(rng).rstrip(".?")} "{index}"',
+            "shortcode": code,
+            "post_date": datetime(2024, 1, 1) + timedelta(hours=index),
+            "tags": tags,
+            "mentions": [f"user{rng.randint(1, 500)}" for _ in range(rng.randint(0, 2))],
+            "summary": "\n".join(f"- {korean_sentence(rng)}" for _ in range(3)),
+            "caption": caption,
+        })
+    return items
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write a synthetic post corpus.")
+    parser.add_argument("output", help="directory to write the posts into")
+    parser.add_argument("--posts", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    paths = generate(args.output, args.posts, args.seed)
+    print(f"Wrote {len(paths)} posts to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,218 @@
+"""
+Load test for the Instagram import pipeline against the local stand-in (standin.py).
+
+Synthetic links (corpus.instagram_items) are pushed through
+insta_to_post.process_instagram_link by a pool of worker threads, or through run_batch
+with --batch. Posts are written to a temporary content directory, so the site is never
+touched, and no real Instagram or Gemini traffic happens.
+
+Usage:
+    python benchmarks/import_load.py                          # 10000 links, 16 workers
+    python benchmarks/import_load.py --links 1000 --throttle-rate 0.05 --error-rate 0.02
+    python benchmarks/import_load.py --cassette scripts/.state/cassette.jsonl --passes 2
+    python benchmarks/import_load.py --links 1000 --max-failures 0 --min-throughput 50 --max-p99-ms 3000
+    python benchmarks/import_load.py --links 1000 --near-dup reuse --dup-rate 0.05 --max-failures 0 --min-reused 10
+
+The report has throughput, per-link latency percentiles, the per-stage trace summary,
+cache hits, retries and circuit-breaker pauses per service, and the stand-in's own
+request counts. It goes to benchmarks/results/import-<date>-<commit>.json. With
+--passes 2 the second pass reuses the first pass's cache, which shows the warm-cache
+path. --dup-rate makes the stand-in serve that share of reposted captions; with
+--near-dup reuse every one of them must still be written (a reused summary keeps its
+title, so the file name gets the shortcode), and --min-reused checks the reuse path
+actually ran. --max-failures / --min-throughput / --max-p99-ms / --min-reused make the
+exit status 1 when a limit is broken, for CI.
+
+Only python-dotenv is needed (insta_to_post imports it); the stand-in session never
+imports instaloader or google-generativeai.
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+for path in (BENCH_DIR, BENCH_DIR.parent / "scripts"):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+import corpus  # noqa: E402
+import standin  # noqa: E402
+from run import RESULTS_DIR, git_commit  # noqa: E402
+
+RESULTS_VERSION = 1
+
+
+# ------------------------------------------------------------
+# One pass
+# ------------------------------------------------------------
+def run_pass(args, server, urls, work, cache_path):
+    """Push urls through the pipeline once; return the pass report."""
+    import insta_to_post
+    from insta_cache import ImportCache
+    from insta_index import ShortcodeIndex
+    from insta_trace import Tracer, percentile
+
+    posts = work / "posts"
+    posts.mkdir(parents=True)
+    insta_to_post.CONTENT_DIR = posts
+    insta_to_post.PROJECT_ROOT = work
+    index = ShortcodeIndex.build(posts, path=None)
+    tracer = Tracer()
+    session = standin.session_class()(server.url, cache=ImportCache(cache_path), tracer=tracer,
+                                      retries=args.retries)
+    for service in (session.instagram, session.gemini):
+        service.base_delay = args.base_delay
+        service.breaker.base_cooldown = service.breaker._cooldown = args.cooldown
+    requests_before = {name: dict(stats) for name, stats in server.stats.items()}
+
+    latencies = []
+
+    def one(url):
+        started = time.perf_counter()
+        ok = insta_to_post.process_instagram_link(url, session, index=index, near_dup=args.near_dup)
+        latencies.append((time.perf_counter() - started) * 1000)
+        return ok
+
+    with session, open(os.devnull, "w", encoding="utf-8") as devnull, contextlib.redirect_stdout(devnull):
+        started = time.perf_counter()
+        if args.batch:
+            succeeded = len(insta_to_post.run_batch(
+                urls, session, insta_workers=args.workers, insta_rps=args.rps,
+                gemini_workers=args.workers, gemini_rps=args.rps, index=index, near_dup=args.near_dup))
+        else:
+            with ThreadPoolExecutor(max_workers=args.workers, thread_name_prefix="link") as pool:
+                succeeded = sum(pool.map(one, urls))
+        seconds = time.perf_counter() - started
+        hits, misses = session.cache.hits, session.cache.misses
+
+    latencies.sort()
+    spans = tracer.spans  # every worker has finished
+    return {
+        "links": len(urls),
+        "succeeded": succeeded,
+        "failed": len(urls) - succeeded,
+        "seconds": round(seconds, 3),
+        "links_per_second": round(len(urls) / seconds, 1) if seconds else None,
+        "latency_ms": {
+            "p50": round(percentile(latencies, 50), 1),
+            "p95": round(percentile(latencies, 95), 1),
+            "p99": round(percentile(latencies, 99), 1),
+            "max": round(latencies[-1], 1),
+        } if latencies else None,
+        "cache": {"hits": hits, "misses": misses},
+        "near_duplicates": {
+            "matched": sum(1 for span in spans if span["name"] == "near_duplicate" and "match" in span),
+            "reused_written": sum(1 for span in spans if span["name"] == "write" and span.get("reused")
+                                  and span["status"] == "ok" and not span.get("skipped")),
+        },
+        "services": {service.name: {**service.stats, "paused_s": round(service.stats["paused_s"], 3),
+                                    "breaker_opened": service.breaker.opened}
+                     for service in (session.instagram, session.gemini)},
+        "server": {name: {key: value - requests_before[name][key] for key, value in stats.items()}
+                   for name, stats in server.stats.items()},
+        "stages": tracer.summary(),
+    }
+
+
+def print_pass(number, report):
+    latency = report["latency_ms"] or {}
+    print(f"pass {number}: {report['succeeded']}/{report['links']} ok in {report['seconds']:.1f}s "
+          f"({report['links_per_second']}/s)")
+    if latency:
+        print(f"  latency ms  p50 {latency['p50']}  p95 {latency['p95']}  p99 {latency['p99']}  max {latency['max']}")
+    print(f"  cache       {report['cache']['hits']} hits, {report['cache']['misses']} misses")
+    print(f"  near-dups   {report['near_duplicates']['matched']} matched, "
+          f"{report['near_duplicates']['reused_written']} written with a reused summary")
+    for name, stats in report["services"].items():
+        server = report["server"][name]
+        print(f"  {name:10}  {server['requests']} requests ({server['throttled']} x 429, {server['errors']} x 503), "
+              f"{stats['retries']} retries, breaker opened {stats['breaker_opened']}x, paused {stats['paused_s']}s")
+
+
+def check_limits(args, reports):
+    """Messages for every limit the last pass broke."""
+    last = reports[-1]
+    broken = []
+    if args.max_failures is not None and last["failed"] > args.max_failures:
+        broken.append(f"{last['failed']} failed links > {args.max_failures}")
+    if args.min_throughput is not None and (last["links_per_second"] or 0) < args.min_throughput:
+        broken.append(f"{last['links_per_second']} links/s < {args.min_throughput}")
+    if args.max_p99_ms is not None and last["latency_ms"] and last["latency_ms"]["p99"] > args.max_p99_ms:
+        broken.append(f"p99 {last['latency_ms']['p99']} ms > {args.max_p99_ms}")
+    if args.min_reused is not None and last["near_duplicates"]["reused_written"] < args.min_reused:
+        broken.append(f"{last['near_duplicates']['reused_written']} posts written with a reused summary "
+                      f"< {args.min_reused}")
+    return broken
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test the import pipeline against the local stand-in.")
+    parser.add_argument("--links", type=int, default=10000)
+    parser.add_argument("--workers", type=int, default=16, help="concurrent links (or per-service workers with --batch)")
+    parser.add_argument("--batch", action="store_true", help="use run_batch instead of process_instagram_link")
+    parser.add_argument("--rps", type=float, default=0, help="per-service rate limit with --batch (0 = none)")
+    parser.add_argument("--passes", type=int, default=1, help="passes over the same links; later ones reuse the cache")
+    parser.add_argument("--cassette", type=Path, help="recording from insta_to_post.py --record to replay")
+    parser.add_argument("--insta-latency", type=float, default=30.0, help="stand-in Instagram latency in ms")
+    parser.add_argument("--gemini-latency", type=float, default=200.0, help="stand-in Gemini latency in ms")
+    parser.add_argument("--slow-rate", type=float, default=0.01, help="share of responses delayed by --slow-ms")
+    parser.add_argument("--slow-ms", type=float, default=1000.0)
+    parser.add_argument("--error-rate", type=float, default=0.01, help="share of requests answered with 503")
+    parser.add_argument("--throttle-rate", type=float, default=0.02, help="share of requests answered with 429")
+    parser.add_argument("--retry-after", type=float, default=0.1, help="Retry-After seconds on a 429")
+    parser.add_argument("--retries", type=int, default=4)
+    parser.add_argument("--base-delay", type=float, default=0.05, help="client backoff base in seconds")
+    parser.add_argument("--cooldown", type=float, default=0.5, help="client circuit-breaker cooldown in seconds")
+    parser.add_argument("--near-dup", choices=("skip", "reuse", "off"), default="skip")
+    parser.add_argument("--dup-rate", type=float, default=0.0, help="share of stand-in posts that are reposts")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="report file (default: benchmarks/results/import-<date>-<commit>.json)")
+    parser.add_argument("--max-failures", type=int, help="fail when more links than this fail")
+    parser.add_argument("--min-throughput", type=float, help="fail below this many links per second")
+    parser.add_argument("--max-p99-ms", type=float, help="fail when p99 per-link latency is above this")
+    parser.add_argument("--min-reused", type=int, help="fail when fewer posts than this reuse a near-duplicate's summary")
+    args = parser.parse_args(argv)
+
+    urls = [item["url"] for item in corpus.instagram_items(args.links, args.seed)]
+    reports = []
+    with tempfile.TemporaryDirectory(prefix="import-load-") as tmp, standin.StandIn(
+            args.cassette, insta_latency=args.insta_latency, gemini_latency=args.gemini_latency,
+            slow_rate=args.slow_rate, slow_ms=args.slow_ms, error_rate=args.error_rate,
+            throttle_rate=args.throttle_rate, retry_after=args.retry_after, seed=args.seed,
+            dup_rate=args.dup_rate) as server:
+        cache_path = Path(tmp) / "cache.sqlite3"
+        for number in range(1, args.passes + 1):
+            report = run_pass(args, server, urls, Path(tmp) / f"pass{number}", cache_path)
+            reports.append(report)
+            print_pass(number, report)
+
+    commit = git_commit()
+    result = {
+        "version": RESULTS_VERSION,
+        "commit": commit,
+        "created": datetime.now().astimezone().isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "options": {key: str(value) if isinstance(value, Path) else value for key, value in vars(args).items()},
+        "passes": reports,
+    }
+    output = Path(args.output) if args.output else RESULTS_DIR / f"import-{datetime.now():%Y%m%d-%H%M%S}-{commit}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(result, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+    print(f"Saved {output}")
+
+    broken = check_limits(args, reports)
+    for message in broken:
+        print(f"LIMIT BROKEN: {message}")
+    return 1 if broken else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,135 @@
+"""
+Import-time budget for the scripts, measured with `python -X importtime`.
+
+Pre-commit hooks and CI steps usually have nothing to do, so what they cost is mostly
+interpreter start-up plus imports. For every entry in BUDGETS a fresh interpreter
+imports the module and the cumulative import time reported by -X importtime is checked
+against its budget; COMMANDS times whole no-op invocations of the unified entry point
+(`python scripts ...`) against a wall-clock budget.
+
+Usage:
+    python benchmarks/importtime.py            # exit status 1 when anything is over budget
+    python benchmarks/importtime.py --repeat 5 --output /tmp/imports.json
+
+run.py includes these results in its report unless --no-importtime is given.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = BENCH_DIR.parent
+SCRIPTS_DIR = PROJECT_ROOT / "scripts"
+
+# Cumulative import time of the module itself, in milliseconds. The heavy third-party
+# packages (eth_account, instaloader, google.generativeai) are imported on first use, so
+# these budgets only have room for the standard library; going over one usually means a
+# heavy import moved back to module level.
+BUDGETS = {
+    "frontmatter": 40,
+    "sign_content": 100,
+    "contentlint": 90,
+    "codemod": 100,
+    "build_graph": 80,
+    "build_search": 90,
+    "insta_to_post": 120,
+}
+
+# Whole-process wall time for invocations that have nothing to do, in milliseconds.
+COMMANDS = {
+    "scripts --help": (["--help"], 150),
+    "scripts sign (no targets)": (["sign"], 250),
+    "scripts verify --help": (["verify", "--help"], 250),
+    "scripts insta --help": (["insta", "--help"], 300),
+}
+
+
+def parse_importtime(stderr, module):
+    """Cumulative microseconds for module from -X importtime output, or None."""
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = [part.strip() for part in line[len("import time:"):].split("|")]
+        if len(parts) == 3 and parts[2] == module and parts[1].isdigit():
+            return int(parts[1])
+    return None
+
+
+def import_ms(module, python=sys.executable):
+    """(milliseconds, None) for one import in a fresh interpreter, or (None, error)."""
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [str(SCRIPTS_DIR), os.environ.get("PYTHONPATH")])))
+    completed = subprocess.run([python, "-X", "importtime", "-c", f"import {module}"], env=env, cwd=PROJECT_ROOT,
+                               capture_output=True, text=True)
+    if completed.returncode != 0:
+        lines = completed.stderr.strip().splitlines()
+        return None, lines[-1] if lines else "failed"
+    us = parse_importtime(completed.stderr, module)
+    return (us / 1000, None) if us is not None else (None, "not reported")
+
+
+def command_ms(args, python=sys.executable):
+    started = time.perf_counter()
+    subprocess.run([python, str(SCRIPTS_DIR), *args], cwd=PROJECT_ROOT, capture_output=True)
+    return (time.perf_counter() - started) * 1000
+
+
+def measure(repeat=3):
+    """Return {"imports": [...], "commands": [...], "ok": bool}; each figure is the median of repeat runs."""
+    imports = []
+    for module, budget in BUDGETS.items():
+        samples, error = [], None
+        for _ in range(repeat):
+            ms, error = import_ms(module)
+            if ms is None:
+                break
+            samples.append(ms)
+        entry = {"module": module, "budget_ms": budget}
+        if samples:
+            entry["ms"] = round(statistics.median(samples), 1)
+            entry["ok"] = entry["ms"] <= budget
+        else:
+            entry["skipped"] = error or "not reported"
+        imports.append(entry)
+
+    commands = []
+    for name, (args, budget) in COMMANDS.items():
+        ms = statistics.median(command_ms(args) for _ in range(repeat))
+        commands.append({"command": name, "ms": round(ms, 1), "budget_ms": budget, "ok": ms <= budget})
+
+    ok = all(entry.get("ok", True) for entry in imports + commands)
+    return {"imports": imports, "commands": commands, "ok": ok}
+
+
+def print_report(report):
+    for entry in report["imports"]:
+        if "skipped" in entry:
+            print(f"import {entry['module']:18} skipped ({entry['skipped']})")
+        else:
+            print(f"import {entry['module']:18} {entry['ms']:7.1f} ms  (budget {entry['budget_ms']})"
+                  f"{'' if entry['ok'] else '  OVER BUDGET'}")
+    for entry in report["commands"]:
+        print(f"run    {entry['command']:30} {entry['ms']:7.1f} ms  (budget {entry['budget_ms']})"
+              f"{'' if entry['ok'] else '  OVER BUDGET'}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check the scripts' import time against budgets.")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per measurement (median is reported)")
+    parser.add_argument("--output", help="also write the report as JSON")
+    args = parser.parse_args(argv)
+
+    report = measure(args.repeat)
+    print_report(report)
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+    return 0 if report["ok"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,238 @@
+"""
+Time the content scripts on a synthetic corpus and save the results as JSON.
+
+Each (case, size) runs in a fresh process on its own copy of the corpus, so peak RSS
+is per case and cases that rewrite files (signing, cleaning, migrating) never see
+each other's output. Only the call being measured is timed; corpus generation,
+copying and imports are not.
+
+Usage:
+    python benchmarks/run.py                              # every case at 100, 1000, 10000 posts
+    python benchmarks/run.py --sizes 100,1000 --cases sign_post,migrate_file
+    python benchmarks/run.py --compare benchmarks/results/<earlier>.json
+
+Results go to benchmarks/results/<date>-<commit>.json; --compare prints the time
+ratio against an earlier file (>1.00 means slower now). The import-time budget check
+from importtime.py is included in the report (skip it with --no-importtime).
+
+Everything runs offline: nothing here talks to Instagram, Gemini or an Ethereum node
+(eth_account signs locally), and outgoing connections are refused in the case
+processes. The scripts' own dependencies (eth-account, instaloader,
+google-generativeai, python-dotenv) still have to be installed; a case whose module
+cannot be imported is reported as skipped.
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from multiprocessing import get_context
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+BENCH_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = BENCH_DIR.parent
+SCRIPTS_DIR = PROJECT_ROOT / "scripts"
+RESULTS_DIR = BENCH_DIR / "results"
+RESULTS_VERSION = 1
+DEFAULT_SIZES = (100, 1000, 10000)
+# A throwaway key (the eth-account documentation example); never used for real posts.
+BENCH_KEY = "0x4c0883a69102937d6231471b5dbb6204fe5129617082792ae468d01a3f362318"
+
+for path in (BENCH_DIR, SCRIPTS_DIR):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+import corpus  # noqa: E402
+import importtime  # noqa: E402
+
+
+# ------------------------------------------------------------
+# Cases: prepare(work_dir, size) -> zero-argument callable that does the timed work
+# ------------------------------------------------------------
+def prepare_sign_post(work, size):
+    import sign_content
+    # eth_account is imported on first use; load it here so a missing package skips the case.
+    sign_content.load_eth_account()
+    paths = sorted(work.glob("*.md"))
+    return lambda: [sign_content.sign_post(path, BENCH_KEY) for path in paths]
+
+
+def prepare_contentlint_scan(work, size):
+    import contentlint
+    paths = sorted(work.glob("*.md"))
+    return lambda: [contentlint.lint_file(path) for path in paths]
+
+
+def prepare_contentlint_clean(work, size):
+    import contentlint
+    paths = sorted(work.glob("*.md"))
+    return lambda: [contentlint.lint_file(path, fix=True) for path in paths]
+
+
+def prepare_migrate_file(work, size):
+    import migrate_to_shortcode
+    paths = sorted(work.glob("*.md"))
+    return lambda: [migrate_to_shortcode.migrate_file(path) for path in paths]
+
+
+def prepare_create_hugo_post(work, size):
+    import insta_to_post
+    out = work / "created"
+    out.mkdir()
+    insta_to_post.CONTENT_DIR = out
+    items = corpus.instagram_items(size)
+    return lambda: [insta_to_post.create_hugo_post(
+        item["title"], item["shortcode"], item["post_date"], item["tags"],
+        item["mentions"], item["summary"], item["caption"]) for item in items]
+
+
+def prepare_extract_shortcode(work, size):
+    import insta_to_post
+    urls = [item["url"] for item in corpus.instagram_items(size)]
+    return lambda: [insta_to_post.extract_shortcode(url) for url in urls]
+
+
+CASES = {
+    "sign_post": prepare_sign_post,
+    "contentlint_scan": prepare_contentlint_scan,
+    "contentlint_clean": prepare_contentlint_clean,
+    "migrate_file": prepare_migrate_file,
+    "create_hugo_post": prepare_create_hugo_post,
+    "extract_shortcode": prepare_extract_shortcode,
+}
+
+
+# ------------------------------------------------------------
+# Case process
+# ------------------------------------------------------------
+def peak_rss_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes.
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def _refuse_network(*args, **kwargs):
+    raise RuntimeError("network access is disabled while benchmarking")
+
+
+def run_case(name, size, corpus_dir):
+    """Runs in a fresh process. Returns the result dict for one (case, size)."""
+    socket.socket.connect = _refuse_network
+    socket.create_connection = _refuse_network
+    with tempfile.TemporaryDirectory(prefix="bench-") as tmp:
+        work = Path(tmp) / "posts"
+        shutil.copytree(corpus_dir, work)
+        try:
+            with open(os.devnull, "w", encoding="utf-8") as devnull, contextlib.redirect_stdout(devnull):
+                call = CASES[name](work, size)
+        except (ImportError, SystemExit) as e:
+            # The scripts exit with an install hint when a dependency is missing.
+            return {"case": name, "size": size, "skipped": f"cannot import: {e}"}
+        rss_before = peak_rss_mb()
+        with open(os.devnull, "w", encoding="utf-8") as devnull, contextlib.redirect_stdout(devnull):
+            started = time.perf_counter()
+            call()
+            seconds = time.perf_counter() - started
+    peak = peak_rss_mb()
+    return {
+        "case": name,
+        "size": size,
+        "seconds": round(seconds, 4),
+        "per_second": round(size / seconds, 1) if seconds else None,
+        "peak_rss_mb": peak,
+        "rss_growth_mb": round(peak - rss_before, 1) if peak is not None else None,
+    }
+
+
+# ------------------------------------------------------------
+# Driver
+# ------------------------------------------------------------
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=PROJECT_ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def compare(results, baseline_path):
+    baseline = json.loads(Path(baseline_path).read_text(encoding="utf-8"))
+    before = {(r["case"], r["size"]): r for r in baseline["results"] if "seconds" in r}
+    print(f"\nvs {baseline_path} ({baseline.get('commit')})")
+    for result in results:
+        old = before.get((result["case"], result["size"]))
+        if old and "seconds" in result and old["seconds"]:
+            print(f"  {result['case']:20} {result['size']:>6}  {result['seconds'] / old['seconds']:.2f}x")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the content scripts on a synthetic corpus.")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)), help="comma-separated post counts")
+    parser.add_argument("--cases", default=",".join(CASES), help="comma-separated case names")
+    parser.add_argument("--seed", type=int, default=0, help="corpus seed")
+    parser.add_argument("--output", help="result file (default: benchmarks/results/<date>-<commit>.json)")
+    parser.add_argument("--compare", help="earlier result file to compare against")
+    parser.add_argument("--no-importtime", action="store_true", help="skip the import-time budget check")
+    args = parser.parse_args(argv)
+
+    sizes = [int(size) for size in args.sizes.split(",") if size]
+    names = [name for name in args.cases.split(",") if name]
+    unknown = [name for name in names if name not in CASES]
+    if unknown:
+        parser.error(f"unknown case(s): {', '.join(unknown)} (choose from {', '.join(CASES)})")
+
+    commit = git_commit()
+    results = []
+    with tempfile.TemporaryDirectory(prefix="bench-corpus-") as tmp:
+        for size in sizes:
+            corpus_dir = Path(tmp) / str(size)
+            corpus.generate(corpus_dir, size, args.seed)
+            for name in names:
+                # One process per case so peak RSS and imports are not shared between cases.
+                with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as pool:
+                    result = pool.submit(run_case, name, size, corpus_dir).result()
+                results.append(result)
+                if "skipped" in result:
+                    print(f"{name:20} {size:>6}  skipped ({result['skipped']})")
+                else:
+                    print(f"{name:20} {size:>6}  {result['seconds']:8.3f}s  {result['per_second']:>10.1f}/s  "
+                          f"peak {result['peak_rss_mb']} MB")
+
+    report = {
+        "version": RESULTS_VERSION,
+        "commit": commit,
+        "created": datetime.now().astimezone().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": args.seed,
+        "results": results,
+    }
+    if not args.no_importtime:
+        report["importtime"] = importtime.measure()
+        importtime.print_report(report["importtime"])
+    output = Path(args.output) if args.output else RESULTS_DIR / f"{datetime.now():%Y%m%d-%H%M%S}-{commit}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+    print(f"Saved {output}")
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
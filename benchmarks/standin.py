@@ -0,0 +1,325 @@
+"""
+Local stand-in for Instagram and Gemini, for load-testing insta_to_post.py offline.
+
+One HTTP server on 127.0.0.1 answers both services:
+
+    GET  /instagram/p/<shortcode>   -> {"caption": ..., "date_local": ...}
+    POST /gemini/generate           {"prompt": ...} -> {"text": ..., "usage": {...}}
+
+Posts and responses come from a cassette recorded with `insta_to_post.py --record FILE`
+(see scripts/insta_cassette.py). Anything not in the cassette is synthesized: captions
+are generated deterministically from the shortcode, and Gemini answers with a valid
+summary object, or an array when the prompt is a batch prompt. Every request can be
+delayed, failed with a 503 or throttled with a 429 plus Retry-After, at configurable
+rates, so the retry and circuit-breaker paths get exercised.
+
+StandInSession is an ImportSession whose clients talk to the stand-in instead of
+instaloader / google-generativeai, so neither package is needed to run it.
+
+    python benchmarks/standin.py --port 8765 --cassette scripts/.state/cassette.jsonl --throttle-rate 0.05
+
+import_load.py starts the server in-process and drives links through it.
+"""
+
+import argparse
+import hashlib
+import json
+import random
+import re
+import sys
+import threading
+import time
+import urllib.request
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from types import SimpleNamespace
+
+BENCH_DIR = Path(__file__).resolve().parent
+SCRIPTS_DIR = BENCH_DIR.parent / "scripts"
+for path in (BENCH_DIR, SCRIPTS_DIR):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+import corpus  # noqa: E402
+from insta_cassette import Cassette  # noqa: E402
+
+# Shortcodes inside a batch prompt; the format example ("입력의 shortcode") never matches.
+BATCH_SHORTCODE_RE = re.compile(r'"shortcode": "([A-Za-z0-9_-]+)"')
+# Near-duplicate posts (--dup-rate) copy the text of one of this many source captions.
+DUP_SOURCES = 20
+INSTAGRAM_PATH_RE = re.compile(r'^/instagram/p/([A-Za-z0-9_-]+)/?$')
+
+
+# ------------------------------------------------------------
+# Synthetic data
+# ------------------------------------------------------------
+def synthetic_post(shortcode, dup_rate=0.0):
+    """(caption, date_local) for a shortcode that is not in the cassette; same code, same post.
+
+    A dup_rate share of posts are reposts: the text of one of DUP_SOURCES captions with
+    their own hashtags, which insta_to_post's near-duplicate check should catch.
+    """
+    rng = random.Random(shortcode)
+    text_rng = rng
+    if dup_rate and rng.random() < dup_rate:
+        text_rng = random.Random(f"dup-{rng.randrange(DUP_SOURCES)}")
+    caption = "\n\n".join(corpus.paragraph(text_rng, emoji_rate=0.3) for _ in range(text_rng.randint(1, 5)))
+    tags = rng.sample(corpus.TAGS, rng.randint(1, 4))
+    caption += "\n\n\n" + " ".join(f"#{tag}" for tag in tags)
+    date_local = datetime(2024, 1, 1) + timedelta(minutes=rng.randint(0, 500000))
+    return caption, date_local
+
+
+def synthetic_summary(seed, shortcode=None):
+    rng = random.Random(seed)
+    item = {
+        "title": f"{rng.choice(corpus.KOREAN_WORDS)} {hashlib.sha1(seed.encode('utf-8')).hexdigest()[:8]}",
+        "summary": corpus.korean_sentence(rng),
+        "tags": rng.sample(corpus.KOREAN_WORDS, 3),
+        "mentions": rng.sample(corpus.ENGLISH_WORDS, 2),
+        "category": rng.choice(("religion", "philosophy", "engineering", "writing")),
+    }
+    if shortcode is not None:
+        item = {"shortcode": shortcode, **item}
+    return item
+
+
+def synthetic_response(prompt):
+    codes = list(dict.fromkeys(BATCH_SHORTCODE_RE.findall(prompt)))
+    if codes:
+        parsed = [synthetic_summary(prompt + code, code) for code in codes]
+    else:
+        parsed = synthetic_summary(prompt)
+    text = "```json\n" + json.dumps(parsed, ensure_ascii=False, indent=2) + "\n```"
+    prompt_tokens, output_tokens = len(prompt) // 3, len(text) // 3
+    return {"text": text, "usage": {"prompt_tokens": prompt_tokens, "output_tokens": output_tokens,
+                                    "total_tokens": prompt_tokens + output_tokens}}
+
+
+# ------------------------------------------------------------
+# Server
+# ------------------------------------------------------------
+class StandIn:
+    """Threaded stand-in server with latency and fault injection; use as a context manager.
+
+    Latencies are in milliseconds per service: each response waits latency ± jitter, and
+    a slow_rate share of them waits slow_ms instead (the tail). error_rate answers 503,
+    throttle_rate answers 429 with Retry-After: retry_after seconds. dup_rate makes that
+    share of synthetic posts near-duplicates of each other.
+    """
+
+    def __init__(self, cassette=None, port=0, insta_latency=30.0, gemini_latency=400.0, jitter=0.3,
+                 slow_rate=0.01, slow_ms=2000.0, error_rate=0.0, throttle_rate=0.0, retry_after=1.0, seed=0,
+                 dup_rate=0.0):
+        self.cassette = Cassette(cassette) if cassette else None
+        self.latency = {"instagram": insta_latency, "gemini": gemini_latency}
+        self.jitter = jitter
+        self.slow_rate = slow_rate
+        self.slow_ms = slow_ms
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.dup_rate = dup_rate
+        self.stats = {service: {"requests": 0, "replayed": 0, "synthesized": 0, "throttled": 0, "errors": 0}
+                      for service in self.latency}
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), self._handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _count(self, service, key):
+        with self._lock:
+            self.stats[service][key] += 1
+
+    def fault(self, service):
+        """(delay seconds, status) for one request: status is 200, 429 or 503."""
+        with self._lock:
+            self.stats[service]["requests"] += 1
+            roll, spread = self._rng.random(), self._rng.uniform(-self.jitter, self.jitter)
+            slow = self._rng.random() < self.slow_rate
+        delay = (self.slow_ms if slow else self.latency[service] * (1 + spread)) / 1000
+        if roll < self.throttle_rate:
+            self._count(service, "throttled")
+            return delay, 429
+        if roll < self.throttle_rate + self.error_rate:
+            self._count(service, "errors")
+            return delay, 503
+        return delay, 200
+
+    def instagram(self, shortcode):
+        recorded = self.cassette.post(shortcode) if self.cassette else None
+        if recorded:
+            self._count("instagram", "replayed")
+            return {"caption": recorded["caption"], "date_local": recorded["date_local"]}
+        self._count("instagram", "synthesized")
+        caption, date_local = synthetic_post(shortcode, self.dup_rate)
+        return {"caption": caption, "date_local": date_local.isoformat()}
+
+    def gemini(self, prompt):
+        recorded = self.cassette.response(prompt) if self.cassette else None
+        if recorded:
+            self._count("gemini", "replayed")
+            return {"text": recorded["text"], "usage": recorded.get("usage", {})}
+        self._count("gemini", "synthesized")
+        return synthetic_response(prompt)
+
+    def _handler(self):
+        standin = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def reply(self, status, payload=None, headers=()):
+                body = json.dumps(payload if payload is not None else {"status": status},
+                                  ensure_ascii=False).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                for name, value in headers:
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def serve(self, service, answer):
+                delay, status = standin.fault(service)
+                time.sleep(delay)
+                if status == 429:
+                    self.reply(429, headers=[("Retry-After", f"{standin.retry_after:g}")])
+                elif status != 200:
+                    self.reply(status)
+                else:
+                    self.reply(200, answer())
+
+            def do_GET(self):
+                match = INSTAGRAM_PATH_RE.match(self.path)
+                if not match:
+                    self.reply(404)
+                    return
+                self.serve("instagram", lambda: standin.instagram(match.group(1)))
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+                if self.path != "/gemini/generate":
+                    self.reply(404)
+                    return
+                prompt = json.loads(body)["prompt"]
+                self.serve("gemini", lambda: standin.gemini(prompt))
+
+        return Handler
+
+    def serve_forever(self):
+        """Serve in the current thread until interrupted (the command-line mode)."""
+        try:
+            self._server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self._server.server_close()
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, name="standin", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+        if self.cassette is not None:
+            self.cassette.close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+# ------------------------------------------------------------
+# Client side
+# ------------------------------------------------------------
+def request_json(url, payload=None, timeout=30):
+    """GET (or POST payload as JSON) and decode the reply; HTTP errors raise urllib's HTTPError."""
+    data = json.dumps(payload, ensure_ascii=False).encode("utf-8") if payload is not None else None
+    request = urllib.request.Request(url, data=data, headers={"Content-Type": "application/json"})
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        return json.loads(response.read())
+
+
+class StandInModel:
+    """Enough of genai.GenerativeModel for insta_to_post: generate_content -> .text / .usage_metadata."""
+
+    def __init__(self, base_url):
+        self.url = f"{base_url}/gemini/generate"
+
+    def generate_content(self, prompt):
+        reply = request_json(self.url, {"prompt": prompt})
+        usage = reply.get("usage") or {}
+        return SimpleNamespace(text=reply["text"], usage_metadata=SimpleNamespace(
+            prompt_token_count=usage.get("prompt_tokens", 0),
+            candidates_token_count=usage.get("output_tokens", 0),
+            total_token_count=usage.get("total_tokens", 0),
+        ))
+
+
+def session_class():
+    """ImportSession subclass bound to a stand-in server (imports insta_to_post on first use)."""
+    import insta_to_post
+
+    class StandInSession(insta_to_post.ImportSession):
+        def __init__(self, base_url, **kwargs):
+            self.base_url = base_url.rstrip("/")
+            super().__init__("stand-in", username=None, **kwargs)
+
+        def _connect(self, api_key, username, session_file, pool_size):
+            self.loader = None
+            self.username = None
+            self.model = StandInModel(self.base_url)
+
+        def fetch_post(self, shortcode):
+            reply = request_json(f"{self.base_url}/instagram/p/{shortcode}")
+            return reply["caption"], datetime.fromisoformat(reply["date_local"])
+
+        def close(self):
+            self.cache.close()
+            if self.cassette is not None:
+                self.cassette.close()
+
+    return StandInSession
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve recorded or synthetic Instagram/Gemini responses locally.")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--cassette", type=Path, help="recording from insta_to_post.py --record")
+    parser.add_argument("--insta-latency", type=float, default=30.0, help="Instagram latency in ms")
+    parser.add_argument("--gemini-latency", type=float, default=400.0, help="Gemini latency in ms")
+    parser.add_argument("--jitter", type=float, default=0.3, help="latency spread as a fraction (0.3 = ±30%%)")
+    parser.add_argument("--slow-rate", type=float, default=0.01, help="share of responses delayed by --slow-ms")
+    parser.add_argument("--slow-ms", type=float, default=2000.0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of requests answered with 503")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="share of requests answered with 429")
+    parser.add_argument("--retry-after", type=float, default=1.0, help="Retry-After seconds on a 429")
+    parser.add_argument("--dup-rate", type=float, default=0.0, help="share of synthetic posts that are near-duplicates")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    standin = StandIn(args.cassette, args.port, args.insta_latency, args.gemini_latency, args.jitter,
+                      args.slow_rate, args.slow_ms, args.error_rate, args.throttle_rate, args.retry_after, args.seed,
+                      args.dup_rate)
+    print(f"Serving on {standin.url} (Ctrl-C to stop)")
+    standin.serve_forever()
+    print(json.dumps(standin.stats, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+One entry point for the site scripts: python scripts <command> [args...]
+
+Only the module behind the chosen command is imported, so `python scripts --help`,
+usage errors and commands with nothing to do never load eth_account, instaloader,
+google-generativeai, numpy or Pillow.
+
+    python scripts sign content/posts/jeju.md
+    python scripts verify --signer 0x...
+    python scripts lint scan --cache
+    python scripts codemod --dry-run -r ai-summary
+    python scripts graph && python scripts related && python scripts search
+    hugo --gc --minify && python scripts compress --report size-report.json
+    python scripts insta --resume
+
+Each command accepts the same arguments as the script it runs (see `<command> --help`).
+"""
+
+import importlib
+import sys
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+
+# command -> (module, argv prefix, one-line help)
+COMMANDS = {
+    "sign": ("sign_content", [], "sign posts with the site key"),
+    "verify": ("sign_content", ["verify"], "check content hashes and signatures offline"),
+    "lint": ("contentlint", [], "scan for or strip emojis (scan|fix)"),
+    "codemod": ("codemod", [], "apply rewrite rules to post bodies"),
+    "migrate": ("migrate_to_shortcode", None, "ai-summary-box divs -> ai_summary shortcode"),
+    "graph": ("build_graph", [], "build data/graph.json"),
+    "related": ("build_related", [], "build data/related.json"),
+    "search": ("build_search", [], "build the sharded index in static/search/"),
+    "images": ("optimize_images", [], "build WebP/AVIF variants for static/images"),
+    "compress": ("precompress", [], "gzip/brotli siblings and size budgets for public/"),
+    "insta": ("insta_to_post", [], "create posts from scripts/instagram_links.txt"),
+}
+
+
+def usage():
+    lines = ["usage: python scripts <command> [args...]", "", "commands:"]
+    lines += [f"  {name:9} {help_text}" for name, (_, _, help_text) in COMMANDS.items()]
+    lines += ["", "Run 'python scripts <command> --help' for a command's options."]
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] in ("-h", "--help"):
+        print(usage())
+        return 0 if argv else 2
+    command, args = argv[0], argv[1:]
+    if command not in COMMANDS:
+        print(usage(), file=sys.stderr)
+        print(f"\nunknown command: {command}", file=sys.stderr)
+        return 2
+
+    module_name, prefix, _ = COMMANDS[command]
+    if str(SCRIPTS_DIR) not in sys.path:
+        # The scripts import each other as top-level modules.
+        sys.path.insert(0, str(SCRIPTS_DIR))
+    module = importlib.import_module(module_name)
+    if prefix is None:
+        if args:
+            print(f"'{command}' takes no arguments", file=sys.stderr)
+            return 2
+        result = module.main()
+    else:
+        sys.argv = [f"scripts {command}", *args]
+        result = module.main(prefix + args)
+    return result if isinstance(result, int) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,307 @@
+"""
+Build data/graph.json for the knowledge-graph page (layouts/_default/network.html).
+
+Reads each page's front matter once, in a single linear pass, and writes a
+deduplicated node/link list that the template loads through site.Data.graph
+instead of assembling it with append loops at build time. Parsed pages are cached
+in scripts/.cache/graph.json by file digest, so unchanged posts are not re-parsed
+on the next run.
+
+Usage:
+    python scripts/build_graph.py              # string ids, {"nodes", "links"}
+    python scripts/build_graph.py --int-ids    # integer ids plus per-node adjacency arrays
+
+Node ids, names and URLs follow the Hugo rules the old template relied on
+(RelPermalink for posts, "tag-"/"cat-" + urlize for terms, humanize for term names).
+"""
+
+import argparse
+import hashlib
+import json
+import re
+import time
+import unicodedata
+from datetime import date, datetime, timezone
+from pathlib import Path
+from urllib.parse import quote
+
+import frontmatter
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+CONTENT_ROOT = PROJECT_ROOT / "content"
+GRAPH_FILE = PROJECT_ROOT / "data" / "graph.json"
+CACHE_FILE = PROJECT_ROOT / "scripts" / ".cache" / "graph.json"
+# Bump when the cached page record changes shape.
+CACHE_VERSION = 1
+
+SUMMARY_LENGTH = 120
+POST_VAL, TAG_VAL, CATEGORY_VAL = 5, 2, 20
+
+
+# ------------------------------------------------------------
+# Hugo-compatible helpers
+# ------------------------------------------------------------
+def sanitize_path(text):
+    """Hugo's MakePathSanitized: keep letters/digits/marks and a few symbols, a space run -> '-', lowercase."""
+    out = []
+    prepend_hyphen = was_hyphen = False
+    for i, ch in enumerate(text):
+        allowed = (ch in "./\\_#+~-@" or unicodedata.category(ch)[0] in "LM" or unicodedata.category(ch) == "Nd"
+                   or (ch == "%" and re.match(r"[0-9a-fA-F]{2}", text[i + 1:i + 3]) is not None))
+        if allowed:
+            was_hyphen = ch == "-"
+            if prepend_hyphen:
+                if not was_hyphen:
+                    out.append("-")
+                prepend_hyphen = False
+            out.append(ch)
+        elif out and not was_hyphen and ch.isspace():
+            prepend_hyphen = True
+    return "".join(out).lower()
+
+
+def urlize(text):
+    return quote(sanitize_path(str(text)), safe="/-._~#+@%")
+
+
+def humanize(text):
+    text = re.sub(r"[-_]+", " ", text).strip()
+    return text[:1].upper() + text[1:]
+
+
+def page_url(rel_path, meta):
+    """RelPermalink for content/<rel_path> with Hugo's default permalink rules."""
+    if meta.get("url"):
+        return str(meta["url"])
+    parts = list(rel_path.parent.parts)
+    parts.append(str(meta.get("slug") or rel_path.stem))
+    return "/" + urlize("/".join(parts)) + "/"
+
+
+def truncate(text, length=SUMMARY_LENGTH):
+    """Hugo's truncate: cut at the last word boundary before length and append an ellipsis."""
+    if len(text) <= length:
+        return text
+    cut = text[:length]
+    space = cut.rfind(" ")
+    if space > 0:
+        cut = cut[:space]
+    return cut.rstrip() + " …"
+
+
+STYLE_SCRIPT_RE = re.compile(r"<(style|script)\b.*?</\1>", re.DOTALL | re.IGNORECASE)
+SHORTCODE_RE = re.compile(r"\{\{[<%].*?[%>]\}\}", re.DOTALL)
+CODE_FENCE_RE = re.compile(r"^```.*?^```", re.DOTALL | re.MULTILINE)
+HTML_TAG_RE = re.compile(r"<[^>]+>")
+MD_IMAGE_RE = re.compile(r"!\[[^\]]*\]\([^)]*\)")
+MD_LINK_RE = re.compile(r"\[([^\]]*)\]\([^)]*\)")
+
+
+def plain_text(body):
+    """Rough plainify of a markdown body, standing in for Hugo's auto summary."""
+    text = STYLE_SCRIPT_RE.sub(" ", body)
+    text = CODE_FENCE_RE.sub(" ", text)
+    text = SHORTCODE_RE.sub(" ", text)
+    text = MD_IMAGE_RE.sub(" ", text)
+    text = MD_LINK_RE.sub(r"\1", text)
+    text = HTML_TAG_RE.sub(" ", text)
+    text = re.sub(r"^\s{0,3}(#+|>|[-*+]\s|\d+\.\s)", " ", text, flags=re.MULTILINE)
+    text = re.sub(r"[`_~]", "", text)
+    return " ".join(text.split())
+
+
+def clean_summary(text):
+    """Same clean-up graph-data.html applied to .Summary."""
+    text = HTML_TAG_RE.sub("", text)
+    text = re.sub(r"&[a-zA-Z]+;", "", text)
+    text = re.sub(r"&#\d+;", "", text)
+    text = re.sub(r"[*\[\]#\"']", "", text)
+    text = re.sub(r"(?i)instagram에서 보기", "", text)
+    return truncate(" ".join(text.split()))
+
+
+def as_list(value):
+    if not value:
+        return []
+    if isinstance(value, str):
+        return [value]
+    return [item for item in value if item]
+
+
+def as_datetime(value):
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, date):
+        return datetime(value.year, value.month, value.day)
+    if isinstance(value, str) and value:
+        try:
+            return datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    return None
+
+
+# ------------------------------------------------------------
+# Page records (cached by digest)
+# ------------------------------------------------------------
+def read_page(path, content_root=CONTENT_ROOT):
+    """Return the cacheable record for one content file, or None if it is not a regular page."""
+    fm = frontmatter.read(path)
+    if fm is None:
+        return None
+    meta = fm.meta
+    summary = meta.get("summary")
+    if not summary:
+        # Only pages without a front-matter summary need their body.
+        summary = plain_text(fm.read_body())[:SUMMARY_LENGTH * 2]
+    published = as_datetime(meta.get("date"))
+    return {
+        "url": page_url(path.relative_to(content_root), meta),
+        "title": str(meta.get("title", "")),
+        "date": published.isoformat() if published else None,
+        "draft": bool(meta.get("draft", False)),
+        "summary": clean_summary(str(summary)),
+        "tags": [str(tag) for tag in as_list(meta.get("tags"))],
+        "categories": [str(cat) for cat in as_list(meta.get("categories"))],
+    }
+
+
+def load_cache(cache_path):
+    try:
+        cache = json.loads(Path(cache_path).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if cache.get("version") != CACHE_VERSION:
+        return {}
+    return cache.get("files", {})
+
+
+def collect_pages(content_root=CONTENT_ROOT, cache_path=CACHE_FILE):
+    """Return ([page records], stats), re-reading only files whose digest changed."""
+    cached = load_cache(cache_path) if cache_path else {}
+    files = {}
+    pages = []
+    parsed = 0
+    for path in sorted(Path(content_root).rglob("*.md")):
+        if path.name.startswith("_index"):
+            continue
+        key = path.relative_to(content_root).as_posix()
+        digest = hashlib.sha1(path.read_bytes()).hexdigest()
+        entry = cached.get(key)
+        if not entry or entry.get("digest") != digest:
+            entry = {"digest": digest, "page": read_page(path, content_root)}
+            parsed += 1
+        files[key] = entry
+        if entry["page"]:
+            pages.append(entry["page"])
+
+    if cache_path and (parsed or files.keys() != cached.keys()):
+        Path(cache_path).parent.mkdir(parents=True, exist_ok=True)
+        frontmatter.write_atomic(cache_path, json.dumps({"version": CACHE_VERSION, "files": files}, ensure_ascii=False))
+    return pages, {"files": len(files), "parsed": parsed}
+
+
+def is_published(page, now):
+    """Hugo's RegularPages filter: no drafts, no future-dated pages (buildFuture is off)."""
+    if page["draft"]:
+        return False
+    published = as_datetime(page["date"])
+    if published is None:
+        return True
+    if published.tzinfo is None:
+        return published <= now.replace(tzinfo=None)
+    return published <= now
+
+
+# ------------------------------------------------------------
+# Graph
+# ------------------------------------------------------------
+def build_graph(pages, int_ids=False, now=None):
+    """Return the graph dict. Each node and each post->term link appears exactly once."""
+    now = now or datetime.now(timezone.utc).astimezone()
+    pages = [page for page in pages if is_published(page, now)]
+    # Newest first, like .Site.RegularPages.
+    pages.sort(key=lambda page: (page["date"] or "", page["title"]), reverse=True)
+
+    nodes = []
+    index = {}
+    terms = {"tag": {}, "category": {}}
+    edges = []
+
+    for page in pages:
+        if page["url"] in index:
+            continue
+        index[page["url"]] = len(nodes)
+        nodes.append({
+            "id": page["url"], "name": page["title"], "group": "post", "val": POST_VAL,
+            "summary": page["summary"], "date": (page["date"] or "0001-01-01")[:10],
+        })
+    for page in pages:
+        source = index[page["url"]]
+        targets = []
+        for group, prefix, values, val in (("tag", "tag-", page["tags"], TAG_VAL),
+                                           ("category", "cat-", page["categories"], CATEGORY_VAL)):
+            for value in values:
+                slug = urlize(value)
+                if not slug:
+                    continue
+                node_id = prefix + slug
+                if node_id not in index:
+                    terms[group][node_id] = slug
+                    index[node_id] = len(nodes)
+                    nodes.append({"id": node_id, "name": humanize(sanitize_path(value)), "group": group, "val": val})
+                target = index[node_id]
+                if target not in targets:
+                    targets.append(target)
+        edges.append((source, targets))
+
+    if not int_ids:
+        links = [{"source": nodes[source]["id"], "target": nodes[target]["id"]}
+                 for source, targets in edges for target in targets]
+        return {"nodes": nodes, "links": links}
+
+    # Integer ids: a node's id is its position; the string id survives as url (posts) or slug (terms).
+    adjacency = [[] for _ in nodes]
+    for source, targets in edges:
+        adjacency[source] = targets
+    for i, node in enumerate(nodes):
+        string_id = node["id"]
+        node["id"] = i
+        if node["group"] == "post":
+            node["url"] = string_id
+        else:
+            node["slug"] = terms[node["group"]][string_id]
+    return {"nodes": nodes, "adjacency": adjacency}
+
+
+def write_graph(graph, graph_path=GRAPH_FILE):
+    """Write graph.json compactly; skip the write when nothing changed so hugo server does not rebuild."""
+    text = json.dumps(graph, ensure_ascii=False, separators=(",", ":")) + "\n"
+    graph_path = Path(graph_path)
+    if graph_path.exists() and graph_path.read_text(encoding="utf-8") == text:
+        return False
+    graph_path.parent.mkdir(parents=True, exist_ok=True)
+    frontmatter.write_atomic(graph_path, text)
+    return True
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Precompute the knowledge graph into data/graph.json.")
+    parser.add_argument("--content", default=str(CONTENT_ROOT), help="content directory (default: content)")
+    parser.add_argument("--output", default=str(GRAPH_FILE), help="output file (default: data/graph.json)")
+    parser.add_argument("--int-ids", action="store_true", help="integer node ids and adjacency arrays instead of links")
+    parser.add_argument("--no-cache", action="store_true", help="re-parse every file and do not update the cache")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    pages, stats = collect_pages(Path(args.content), None if args.no_cache else CACHE_FILE)
+    graph = build_graph(pages, int_ids=args.int_ids)
+    changed = write_graph(graph, args.output)
+    edges = len(graph["links"]) if "links" in graph else sum(map(len, graph["adjacency"]))
+    print(f"Graph: {len(graph['nodes'])} nodes, {edges} links "
+          f"({stats['parsed']}/{stats['files']} files parsed, {time.perf_counter() - started:.3f}s)"
+          f"{'' if changed else ' - unchanged'}")
+
+
+if __name__ == "__main__":
+    main()
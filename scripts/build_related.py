@@ -0,0 +1,351 @@
+"""
+Build data/related.json: the top-k most similar posts for every post, by content.
+
+Hugo's [related] only looks at categories, tags and date, so AI-generated tags decide
+what is "related". This indexes the bodies instead:
+
+- tokens: Hangul character bigrams plus lowercased English/number words
+- vectors: sublinear TF-IDF over hashed tokens, L2-normalised, pruned to the
+  strongest terms per page
+- similarity: cosine, computed with NumPy over an inverted index (one bincount per page)
+
+The index lives in scripts/.cache/related.npz. On the next run only new or changed
+pages are vectorised and scored against the rest; their scores are merged into the
+other pages' lists, and only lists that pointed at a removed or changed page are
+recomputed. IDF is frozen at the last full build and refreshed by a full rebuild once
+the archive has grown by REBUILD_GROWTH (or with --full).
+
+Usage:
+    python scripts/build_related.py            # incremental
+    python scripts/build_related.py --full     # rebuild everything, refresh IDF
+
+Requires: pip install numpy
+"""
+
+import argparse
+import hashlib
+import json
+import re
+import sys
+import time
+import zlib
+from pathlib import Path
+
+try:
+    import numpy as np
+except ImportError:
+    print("Error: 'numpy' is required. Please run: pip install numpy")
+    sys.exit(1)
+
+import frontmatter
+from build_graph import CONTENT_ROOT, PROJECT_ROOT, plain_text
+
+RELATED_FILE = PROJECT_ROOT / "data" / "related.json"
+INDEX_FILE = PROJECT_ROOT / "scripts" / ".cache" / "related.npz"
+INDEX_VERSION = 1
+
+# Only the posts section is indexed, the same pages Hugo's [related] fallback ranks;
+# about/privacy/terms/network would otherwise show up as "related reading".
+SECTION = "posts"
+TOP_K = 5
+HASH_BITS = 20                  # 1M token buckets; collisions are negligible at blog scale
+MAX_TERMS = 128                 # strongest terms kept per page
+REBUILD_GROWTH = 0.2            # full rebuild once the archive grew 20% since the IDF snapshot
+
+HANGUL_RE = re.compile(r"[가-힣]+")
+WORD_RE = re.compile(r"[a-z0-9][a-z0-9+#.-]*[a-z0-9+#]|[a-z0-9]{2,}")
+STOPWORDS = frozenset("the and for are but not you with this that from have was were will can "
+                      "its into than then them they their there what when which who how".split())
+
+
+# ------------------------------------------------------------
+# Tokenizing and vectorizing
+# ------------------------------------------------------------
+def tokenize(text):
+    """Hangul runs -> character bigrams (a single syllable stays as is); other words lowercased."""
+    tokens = []
+    for run in HANGUL_RE.findall(text):
+        if len(run) == 1:
+            tokens.append(run)
+        else:
+            tokens.extend(run[i:i + 2] for i in range(len(run) - 1))
+    for word in WORD_RE.findall(text.lower()):
+        if len(word) > 1 and word not in STOPWORDS:
+            tokens.append(word)
+    return tokens
+
+
+def term_counts(tokens):
+    """Return (term ids, counts) with tokens hashed into 2**HASH_BITS buckets."""
+    if not tokens:
+        return np.empty(0, np.int64), np.empty(0, np.float32)
+    mask = (1 << HASH_BITS) - 1
+    ids = np.fromiter((zlib.crc32(token.encode("utf-8")) & mask for token in tokens), np.int64, len(tokens))
+    terms, counts = np.unique(ids, return_counts=True)
+    return terms, counts.astype(np.float32)
+
+
+def page_text(path):
+    fm = frontmatter.read(path)
+    if fm is None:
+        return None
+    meta = fm.meta
+    if meta.get("draft"):
+        return None
+    # The title counts a little more than one body sentence.
+    title = str(meta.get("title", ""))
+    return f"{title} {title} {plain_text(fm.read_body())}"
+
+
+def idf_vector(df, n_docs):
+    return (np.log((n_docs + 1) / (df + 1)) + 1).astype(np.float32)
+
+
+def weigh(terms, counts, idf):
+    """Sublinear TF-IDF, pruned to MAX_TERMS and L2-normalised."""
+    if not len(terms):
+        return terms.astype(np.int32), counts
+    weights = (1 + np.log(counts)) * idf[terms]
+    if len(terms) > MAX_TERMS:
+        keep = np.sort(np.argpartition(weights, -MAX_TERMS)[-MAX_TERMS:])
+        terms, weights = terms[keep], weights[keep]
+    norm = np.linalg.norm(weights)
+    return terms.astype(np.int32), (weights / norm if norm else weights).astype(np.float32)
+
+
+# ------------------------------------------------------------
+# Similarity over an inverted index
+# ------------------------------------------------------------
+class Postings:
+    """Term -> (page rows, weights) built from per-page sparse vectors."""
+
+    def __init__(self, vectors):
+        self.n = len(vectors)
+        lengths = np.fromiter((len(terms) for terms, _ in vectors), np.int64, self.n)
+        rows = np.repeat(np.arange(self.n, dtype=np.int32), lengths)
+        terms = np.concatenate([terms for terms, _ in vectors]) if self.n else np.empty(0, np.int32)
+        weights = np.concatenate([weights for _, weights in vectors]) if self.n else np.empty(0, np.float32)
+        order = np.argsort(terms, kind="stable")
+        self.terms, self.rows, self.weights = terms[order], rows[order], weights[order]
+
+    def scores(self, terms, weights):
+        """Cosine similarity of one vector against every indexed page."""
+        starts = np.searchsorted(self.terms, terms, side="left")
+        ends = np.searchsorted(self.terms, terms, side="right")
+        lengths = ends - starts
+        total = int(lengths.sum())
+        if not total:
+            return np.zeros(self.n, np.float32)
+        # Flat indices of every posting of every query term, without a Python loop.
+        offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(total)
+        contrib = self.weights[offsets] * np.repeat(weights, lengths)
+        return np.bincount(self.rows[offsets], weights=contrib, minlength=self.n).astype(np.float32)
+
+
+def top_k(scores, self_row, keys, k=TOP_K):
+    scores = scores.copy()
+    scores[self_row] = 0
+    candidates = np.flatnonzero(scores > 0)
+    if len(candidates) > k:
+        candidates = candidates[np.argpartition(scores[candidates], -k)[-k:]]
+    ranked = sorted(candidates, key=lambda row: (-scores[row], keys[row]))
+    return [(keys[row], float(scores[row])) for row in ranked]
+
+
+# ------------------------------------------------------------
+# Persistent index
+# ------------------------------------------------------------
+def load_index(path):
+    try:
+        data = np.load(path, allow_pickle=False)
+    except (OSError, ValueError):
+        return None
+    with data:
+        if int(data["version"]) != INDEX_VERSION or int(data["hash_bits"]) != HASH_BITS:
+            return None
+        # Each data[...] access re-reads the array from the archive, so read them once.
+        keys = [str(key) for key in data["keys"]]
+        indptr, terms, weights = data["indptr"], data["terms"], data["weights"]
+        rows, scores = data["neighbors"], data["scores"]
+        vectors = {key: (terms[indptr[i]:indptr[i + 1]], weights[indptr[i]:indptr[i + 1]]) for i, key in enumerate(keys)}
+        neighbors = {
+            key: [(keys[j], float(s)) for j, s in zip(rows[i], scores[i]) if j >= 0]
+            for i, key in enumerate(keys)
+        }
+        return {
+            "digests": dict(zip((str(k) for k in data["page_keys"]), (str(d) for d in data["page_digests"]))),
+            "vectors": vectors,
+            "neighbors": neighbors,
+            "df": data["df"],
+            "idf_docs": int(data["idf_docs"]),
+        }
+
+
+def save_index(path, index):
+    keys = sorted(index["vectors"])
+    position = {key: i for i, key in enumerate(keys)}
+    lengths = [len(index["vectors"][key][0]) for key in keys]
+    neighbors = np.full((len(keys), TOP_K), -1, np.int32)
+    scores = np.zeros((len(keys), TOP_K), np.float32)
+    for i, key in enumerate(keys):
+        for j, (other, score) in enumerate(index["neighbors"].get(key, [])[:TOP_K]):
+            neighbors[i, j] = position[other]
+            scores[i, j] = score
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp.npz")
+    np.savez_compressed(
+        tmp,
+        version=INDEX_VERSION,
+        hash_bits=HASH_BITS,
+        keys=np.array(keys, dtype=str),
+        # Digests cover every page, drafts included, so unchanged drafts are not re-read.
+        page_keys=np.array(sorted(index["digests"]), dtype=str),
+        page_digests=np.array([index["digests"][key] for key in sorted(index["digests"])], dtype=str),
+        indptr=np.concatenate([[0], np.cumsum(lengths)]).astype(np.int64),
+        terms=np.concatenate([index["vectors"][key][0] for key in keys]) if keys else np.empty(0, np.int32),
+        weights=np.concatenate([index["vectors"][key][1] for key in keys]) if keys else np.empty(0, np.float32),
+        neighbors=neighbors,
+        scores=scores,
+        df=index["df"],
+        idf_docs=index["idf_docs"],
+    )
+    tmp.replace(path)
+
+
+# ------------------------------------------------------------
+# Build
+# ------------------------------------------------------------
+def scan(content_root, section=SECTION):
+    """{content key: (path, digest)} for every page in content_root/section except _index files."""
+    pages = {}
+    for path in sorted((Path(content_root) / section).rglob("*.md")):
+        if not path.name.startswith("_index"):
+            pages[path.relative_to(content_root).as_posix()] = (path, hashlib.sha1(path.read_bytes()).hexdigest())
+    return pages
+
+
+def count_pages(pages, keys):
+    """{key: (terms, counts)} for the given keys; drafts and pages without front matter are left out."""
+    counts = {}
+    for key in keys:
+        text = page_text(pages[key][0])
+        if text is not None:
+            counts[key] = term_counts(tokenize(text))
+    return counts
+
+
+def full_build(pages):
+    counts = count_pages(pages, pages)
+    df = np.zeros(1 << HASH_BITS, np.int32)
+    for terms, _ in counts.values():
+        df[terms] += 1
+    idf = idf_vector(df, len(counts))
+    vectors = {key: weigh(terms, c, idf) for key, (terms, c) in counts.items()}
+    keys = sorted(vectors)
+    postings = Postings([vectors[key] for key in keys])
+    neighbors = {key: top_k(postings.scores(*vectors[key]), row, keys) for row, key in enumerate(keys)}
+    return {
+        "digests": {key: pages[key][1] for key in pages},
+        "vectors": vectors,
+        "neighbors": neighbors,
+        "df": df,
+        "idf_docs": len(counts),
+    }, len(pages)
+
+
+def update(index, pages):
+    """Apply added/changed/removed pages to a loaded index in place; return how many pages were re-read."""
+    old_digests = index["digests"]
+    changed = [key for key, (_, digest) in pages.items() if old_digests.get(key) != digest]
+    removed = [key for key in old_digests if key not in pages]
+    stale = set(changed) | set(removed)
+    if not stale:
+        return 0
+
+    vectors, neighbors = index["vectors"], index["neighbors"]
+    for key in stale:
+        vectors.pop(key, None)
+        neighbors.pop(key, None)
+    # Lists that pointed at a removed/changed page have to be recomputed from scratch.
+    affected = {key for key, items in neighbors.items() if any(other in stale for other, _ in items)}
+
+    idf = idf_vector(index["df"], index["idf_docs"])
+    for key, (terms, c) in count_pages(pages, changed).items():
+        vectors[key] = weigh(terms, c, idf)
+
+    keys = sorted(vectors)
+    row_of = {key: row for row, key in enumerate(keys)}
+    postings = Postings([vectors[key] for key in keys])
+
+    for key in affected:
+        neighbors[key] = top_k(postings.scores(*vectors[key]), row_of[key], keys)
+    for key in (key for key in changed if key in vectors):
+        scores = postings.scores(*vectors[key])
+        neighbors[key] = top_k(scores, row_of[key], keys)
+        # Similarity is symmetric: offer the new page to every list it now beats.
+        for row in np.flatnonzero(scores > 0):
+            other = keys[row]
+            if other == key or other in affected:
+                continue
+            items = [item for item in neighbors.get(other, []) if item[0] != key]
+            if len(items) < TOP_K or scores[row] > items[-1][1]:
+                items.append((key, float(scores[row])))
+                items.sort(key=lambda item: (-item[1], item[0]))
+                neighbors[other] = items[:TOP_K]
+
+    index["digests"] = {key: digest for key, (_, digest) in pages.items()}
+    return len(changed)
+
+
+def write_related(index, related_path=RELATED_FILE):
+    """Write {"posts": {content path: [related content paths]}}; skip the write if nothing changed."""
+    posts = {key: [other for other, _ in index["neighbors"].get(key, [])] for key in sorted(index["vectors"])}
+    text = json.dumps({"k": TOP_K, "posts": posts}, ensure_ascii=False, separators=(",", ":")) + "\n"
+    related_path = Path(related_path)
+    if related_path.exists() and related_path.read_text(encoding="utf-8") == text:
+        return False
+    related_path.parent.mkdir(parents=True, exist_ok=True)
+    frontmatter.write_atomic(related_path, text)
+    return True
+
+
+def build(content_root=CONTENT_ROOT, index_path=INDEX_FILE, related_path=RELATED_FILE, full=False):
+    started = time.perf_counter()
+    pages = scan(content_root)
+    index = None if full else load_index(index_path)
+    if index is not None and len(pages) > index["idf_docs"] * (1 + REBUILD_GROWTH):
+        index = None
+    if index is None:
+        index, reread = full_build(pages)
+        strategy = "full"
+    else:
+        reread = update(index, pages)
+        strategy = "incremental"
+    if reread or strategy == "full":
+        save_index(index_path, index)
+    changed = write_related(index, related_path)
+    return {
+        "strategy": strategy,
+        "pages": len(index["vectors"]),
+        "reread": reread,
+        "changed": changed,
+        "elapsed": round(time.perf_counter() - started, 3),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Precompute content-based related posts into data/related.json.")
+    parser.add_argument("--content", default=str(CONTENT_ROOT), help="content directory (default: content)")
+    parser.add_argument("--output", default=str(RELATED_FILE), help="output file (default: data/related.json)")
+    parser.add_argument("--index", default=str(INDEX_FILE), help="index file (default: scripts/.cache/related.npz)")
+    parser.add_argument("--full", action="store_true", help="ignore the saved index and refresh IDF")
+    args = parser.parse_args(argv)
+
+    stats = build(Path(args.content), Path(args.index), Path(args.output), full=args.full)
+    print(f"Related: {stats['pages']} pages, {stats['strategy']}, {stats['reread']} re-read "
+          f"({stats['elapsed']:.3f}s){'' if stats['changed'] else ' - unchanged'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,215 @@
+"""
+Build the sharded full-text search index under static/search/.
+
+Replaces the monolithic home JSON output: instead of one file holding every post, the
+browser (assets/js/search-index.js) fetches a small manifest, then only the shards
+holding the query's tokens, then only the doc chunks holding the top results.
+
+Layout:
+    static/search/manifest.json          tokenizer settings, shard boundaries, doc chunk size
+    static/search/shard-<n>.json         {token: postings} for one contiguous token range
+    static/search/docs-<n>.json          [url, title, date, summary] for doc ids n*DOC_CHUNK ...
+
+Tokens are Hangul character bigrams (a lone syllable is kept as is) plus lowercased
+English/number words, the same rules the browser applies to the query. Shards are
+ranges of the sorted token list cut at SHARD_BYTES, so shard size stays bounded as the
+archive grows and a query only ever touches a few of them.
+
+Postings are sorted doc ids, delta-encoded, with the low bit flagging a title/tag hit:
+    value = (doc_id - previous_doc_id) << 1 | in_title
+
+Every file is written as .json plus a precompressed .json.gz (and .json.br when the
+brotli module is installed).
+
+Usage:
+    python scripts/build_search.py
+"""
+
+import argparse
+import gzip
+import json
+import re
+import shutil
+import time
+import unicodedata
+from datetime import datetime, timezone
+from pathlib import Path
+
+import frontmatter
+from build_graph import (CONTENT_ROOT, PROJECT_ROOT, as_datetime, as_list, clean_summary, is_published,
+                         page_url, plain_text)
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+SEARCH_DIR = PROJECT_ROOT / "static" / "search"
+INDEX_VERSION = 1
+
+SHARD_BYTES = 32 * 1024         # uncompressed budget per shard
+DOC_CHUNK = 256                 # doc records per docs-<n>.json
+STOPWORDS = sorted("the and for are but not you with this that from have was were will can "
+                   "its into than then them they their there what when which who how".split())
+
+HANGUL_RE = re.compile(r"[가-힣]+")
+WORD_RE = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text, stopwords=frozenset(STOPWORDS)):
+    """Keep in sync with tokenize() in assets/js/search-index.js."""
+    text = unicodedata.normalize("NFC", text).lower()
+    tokens = set()
+    for run in HANGUL_RE.findall(text):
+        if len(run) == 1:
+            tokens.add(run)
+        else:
+            tokens.update(run[i:i + 2] for i in range(len(run) - 1))
+    for word in WORD_RE.findall(text):
+        if len(word) > 1 and word not in stopwords:
+            tokens.add(word)
+    return tokens
+
+
+# ------------------------------------------------------------
+# Collect
+# ------------------------------------------------------------
+def collect_docs(content_root=CONTENT_ROOT, now=None):
+    """Return published pages as dicts, newest first (doc id = position)."""
+    now = now or datetime.now(timezone.utc).astimezone()
+    docs = []
+    for path in sorted(Path(content_root).rglob("*.md")):
+        if path.name.startswith("_index"):
+            continue
+        fm = frontmatter.read(path)
+        if fm is None:
+            continue
+        meta = fm.meta
+        published = as_datetime(meta.get("date"))
+        page = {"draft": bool(meta.get("draft", False)), "date": published.isoformat() if published else None}
+        if not is_published(page, now):
+            continue
+        body = plain_text(fm.read_body())
+        labels = [str(label) for key in ("tags", "categories") for label in as_list(meta.get(key))]
+        docs.append({
+            "url": page_url(path.relative_to(content_root), meta),
+            "title": str(meta.get("title", "")),
+            "date": (page["date"] or "")[:10],
+            "summary": clean_summary(str(meta.get("summary") or meta.get("description") or body)),
+            "head": " ".join([str(meta.get("title", "")), *labels]),
+            "text": " ".join([str(meta.get("description", "")), str(meta.get("summary", "")), body]),
+        })
+    docs.sort(key=lambda doc: (doc["date"], doc["title"]), reverse=True)
+    return docs
+
+
+def invert(docs):
+    """{token: [(doc_id, in_title)]} with doc ids ascending."""
+    index = {}
+    for doc_id, doc in enumerate(docs):
+        head = tokenize(doc["head"])
+        for token in head | tokenize(doc["text"]):
+            index.setdefault(token, []).append((doc_id, token in head))
+    return index
+
+
+def encode_postings(postings):
+    encoded = []
+    previous = 0
+    for doc_id, in_title in postings:
+        encoded.append((doc_id - previous) << 1 | int(in_title))
+        previous = doc_id
+    return encoded
+
+
+# ------------------------------------------------------------
+# Write
+# ------------------------------------------------------------
+def dumps(value):
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+
+def write_variants(path, text):
+    """Write path, path.gz and (with brotli installed) path.br; return the raw size."""
+    data = text.encode("utf-8")
+    path.write_bytes(data)
+    # mtime=0 keeps the .gz bytes identical for identical input.
+    path.with_name(path.name + ".gz").write_bytes(gzip.compress(data, compresslevel=9, mtime=0))
+    if brotli is not None:
+        path.with_name(path.name + ".br").write_bytes(brotli.compress(data, quality=11))
+    return len(data)
+
+
+def shard(index, budget=SHARD_BYTES):
+    """Cut the sorted token list into contiguous ranges of at most ~budget bytes."""
+    shards = []
+    current, size = {}, 0
+    for token in sorted(index):
+        postings = encode_postings(index[token])
+        entry_size = len(dumps({token: postings}).encode("utf-8"))
+        if current and size + entry_size > budget:
+            shards.append(current)
+            current, size = {}, 0
+        current[token] = postings
+        size += entry_size
+    if current:
+        shards.append(current)
+    return shards
+
+
+def build(content_root=CONTENT_ROOT, out_dir=SEARCH_DIR):
+    started = time.perf_counter()
+    docs = collect_docs(content_root)
+    index = invert(docs)
+    shards = shard(index)
+
+    # Rebuild into a fresh directory so shards from a previous, larger index never linger.
+    out_dir = Path(out_dir)
+    tmp_dir = out_dir.with_name(out_dir.name + ".tmp")
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    tmp_dir.mkdir(parents=True)
+
+    raw = 0
+    boundaries = []
+    for n, tokens in enumerate(shards):
+        name = f"shard-{n}.json"
+        raw += write_variants(tmp_dir / name, dumps(tokens))
+        boundaries.append([next(iter(tokens)), name])
+    for n in range(0, len(docs), DOC_CHUNK):
+        chunk = [[doc["url"], doc["title"], doc["date"], doc["summary"]] for doc in docs[n:n + DOC_CHUNK]]
+        raw += write_variants(tmp_dir / f"docs-{n // DOC_CHUNK}.json", dumps(chunk))
+
+    manifest = {
+        "version": INDEX_VERSION,
+        "docs": len(docs),
+        "doc_chunk": DOC_CHUNK,
+        "tokens": len(index),
+        "stopwords": STOPWORDS,
+        "shards": boundaries,
+    }
+    raw += write_variants(tmp_dir / "manifest.json", dumps(manifest))
+
+    shutil.rmtree(out_dir, ignore_errors=True)
+    tmp_dir.replace(out_dir)
+    return {
+        "docs": len(docs),
+        "tokens": len(index),
+        "shards": len(shards),
+        "bytes": raw,
+        "elapsed": round(time.perf_counter() - started, 3),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build the sharded search index into static/search/.")
+    parser.add_argument("--content", default=str(CONTENT_ROOT), help="content directory (default: content)")
+    parser.add_argument("--output", default=str(SEARCH_DIR), help="output directory (default: static/search)")
+    args = parser.parse_args(argv)
+
+    stats = build(Path(args.content), Path(args.output))
+    print(f"Search index: {stats['docs']} docs, {stats['tokens']} tokens in {stats['shards']} shards "
+          f"({stats['bytes'] / 1024:.0f} KiB raw, {stats['elapsed']:.3f}s)")
+
+
+if __name__ == "__main__":
+    main()
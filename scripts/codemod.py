@@ -0,0 +1,293 @@
+"""
+Declarative codemods for post bodies: many rules, one regex pass, one write per file.
+
+Each rule is a regex plus a replacement (a template like re.sub's, or a function of
+the match). The selected rules are compiled into a single alternation, so a file is
+scanned once however many rules run, and it is only rewritten when something changed.
+Only the body is touched; the front matter bytes are copied as they are.
+
+Matching is leftmost-first across all rules; when two rules match at the same position
+the one listed first wins. Replaced text is not re-scanned, so rules do not chain.
+
+Usage:
+    python scripts/codemod.py --list
+    python scripts/codemod.py --all --dry-run                  # every rule, content/posts, unified diff
+    python scripts/codemod.py -r ai-summary -r youtube-iframe content/posts
+    python scripts/codemod.py -r strip-emoji --workers 8 content
+
+Rule patterns may use named groups, but the names must be unique across the rules that
+run together, and numbered backreferences (\\1 inside a pattern) are not supported.
+"""
+
+import argparse
+import difflib
+import json
+import re
+import sys
+import time
+from concurrent import futures  # ProcessPoolExecutor is imported on first use
+from functools import partial
+
+import frontmatter
+from contentlint import EMOJI_CLASS, iter_files, relpath
+
+DEFAULT_TARGETS = ["content/posts"]
+# Below this many files a process pool costs more to start than it saves.
+POOL_THRESHOLD = 256
+
+TEMPLATE_GROUP_RE = re.compile(r"\\(?:g<(\w+)>|(\d+))")
+PATTERN_BACKREF_RE = re.compile(r"(?<!\\)\\[1-9]")
+
+
+class Rule:
+    """One rewrite: pattern -> replacement, where replacement is a template or f(match)."""
+
+    def __init__(self, name, pattern, replacement, flags=0, description=""):
+        if PATTERN_BACKREF_RE.search(pattern):
+            raise ValueError(f"rule {name!r}: numbered backreferences are not supported, use (?P=name)")
+        self.name = name
+        self.pattern = pattern
+        self.replacement = replacement
+        self.flags = flags
+        self.description = description
+        self.groups = re.compile(pattern, flags).groups
+
+    def inline_pattern(self):
+        """The pattern with its flags scoped to it, so rules with different flags can share one regex."""
+        letters = "".join(letter for flag, letter in ((re.IGNORECASE, "i"), (re.MULTILINE, "m"),
+                                                      (re.DOTALL, "s"), (re.VERBOSE, "x")) if self.flags & flag)
+        return f"(?{letters}:{self.pattern})" if letters else f"(?:{self.pattern})"
+
+
+class RuleMatch:
+    """A view of the combined match with the rule's own group numbers."""
+
+    __slots__ = ("match", "offset")
+
+    def __init__(self, match, offset):
+        self.match = match
+        self.offset = offset
+
+    def group(self, *groups):
+        mapped = [g + self.offset if isinstance(g, int) else g for g in (groups or (0,))]
+        return self.match.group(*mapped)
+
+    def __getitem__(self, group):
+        return self.group(group)
+
+    def start(self, group=0):
+        return self.match.start(group + self.offset if isinstance(group, int) else group)
+
+    def end(self, group=0):
+        return self.match.end(group + self.offset if isinstance(group, int) else group)
+
+
+def compile_template(template):
+    """Turn a re.sub-style template ("\\1", "\\g<name>") into a function of a RuleMatch.
+
+    Literal parts stay strings; group references become 1-tuples.
+    """
+    parts = []
+    pos = 0
+    for match in TEMPLATE_GROUP_RE.finditer(template):
+        parts.append(template[pos:match.start()])
+        name, number = match.groups()
+        group = name or number
+        parts.append((int(group) if group.isdigit() else group,))
+        pos = match.end()
+    parts.append(template[pos:])
+    return lambda m: "".join(part if isinstance(part, str) else (m.group(part[0]) or "") for part in parts)
+
+
+class Codemod:
+    """Several rules compiled into one regex."""
+
+    def __init__(self, rules):
+        self.rules = list(rules)
+        if not self.rules:
+            raise ValueError("no rules selected")
+        alternatives = [f"(?P<_rule{i}>{rule.inline_pattern()})" for i, rule in enumerate(self.rules)]
+        try:
+            self.regex = re.compile("|".join(alternatives))
+        except re.error as e:
+            raise ValueError(f"rules cannot be combined: {e}") from e
+        # Group index of each rule's wrapper; the rule's own group n is wrapper + n.
+        self.offsets = [self.regex.groupindex[f"_rule{i}"] for i in range(len(self.rules))]
+        self.replacers = [compile_template(rule.replacement) if isinstance(rule.replacement, str)
+                          else rule.replacement for rule in self.rules]
+        self.by_group = {offset: i for i, offset in enumerate(self.offsets)}
+
+    def apply(self, text):
+        """Return (new_text, {rule name: count}) after a single pass over text."""
+        counts = {}
+
+        def replace(match):
+            # The wrapper closes after every group inside it, so it is the last group matched.
+            i = self.by_group[match.lastindex]
+            rule = self.rules[i]
+            counts[rule.name] = counts.get(rule.name, 0) + 1
+            return self.replacers[i](RuleMatch(match, self.offsets[i]))
+
+        return self.regex.sub(replace, text), counts
+
+
+# ------------------------------------------------------------
+# Built-in rules
+# ------------------------------------------------------------
+def _youtube(m):
+    return f"{{{{< youtube {m.group('yt_id')} >}}}}"
+
+
+def _youtube_link(m):
+    return f"{{{{< youtube {m.group('yt_link_id')} >}}}}"
+
+
+RULES = {rule.name: rule for rule in (
+    Rule("ai-summary",
+         r'<div class="ai-summary-box">\s*(.*?)\s*</div>',
+         lambda m: f"{{{{< ai_summary >}}}}\n{m.group(1).strip()}\n{{{{< /ai_summary >}}}}",
+         re.DOTALL,
+         'ai-summary-box <div> -> {{< ai_summary >}} shortcode (migrate_to_shortcode.py)'),
+    Rule("instagram-blockquote",
+         r'<blockquote class="instagram-media"[^>]*?data-instgrm-permalink="https://www\.instagram\.com/'
+         r'(?:p|reel)/(?P<ig_code>[\w-]+)/?[^"]*"[^>]*>.*?</blockquote>'
+         r'(?:\s*<script async src="//www\.instagram\.com/embed\.js"></script>)?',
+         r"{{< instagram \g<ig_code> >}}",
+         re.DOTALL,
+         "Instagram's pasted embed HTML -> {{< instagram CODE >}}"),
+    Rule("insta-photo-link",
+         r'^\[!\[[^\]]*\]\([^)]*\)\]\(https://www\.instagram\.com/p/(?P<ip_code>[\w-]+)/?[^)]*\)[ \t]*(?=\r?$)',
+         r"{{< insta-photo \g<ip_code> >}}",
+         re.MULTILINE,
+         "linked image pointing at an Instagram post -> {{< insta-photo CODE >}}"),
+    Rule("youtube-iframe",
+         r'<iframe[^>]*?src="https://(?:www\.)?youtube(?:-nocookie)?\.com/embed/(?P<yt_id>[\w-]{11})[^"]*"'
+         r'[^>]*>\s*</iframe>',
+         _youtube,
+         re.IGNORECASE,
+         "YouTube <iframe> -> {{< youtube ID >}}"),
+    Rule("youtube-link",
+         r'^<?https://(?:www\.youtube\.com/watch\?v=|youtu\.be/)(?P<yt_link_id>[\w-]{11})[^\s>]*>?[ \t]*(?=\r?$)',
+         _youtube_link,
+         re.MULTILINE,
+         "bare YouTube URL on its own line -> {{< youtube ID >}}"),
+    Rule("strip-emoji",
+         f"[{EMOJI_CLASS}]+ ?",
+         "",
+         0,
+         "remove emoji runs from the body, as contentlint.py fix does"),
+)}
+
+
+# ------------------------------------------------------------
+# Files
+# ------------------------------------------------------------
+def rewrite_file(path, codemod, dry_run=False):
+    """Apply codemod to the body of one file. Returns (counts, diff); writes only on a change."""
+    with open(path, encoding="utf-8", newline="") as f:
+        text = f.read()
+    parts = frontmatter.split(text)
+    body = parts[2] if parts else text
+    header = text[:len(text) - len(body)]
+    new_body, counts = codemod.apply(body)
+    if new_body == body:
+        return {}, None
+    new_text = header + new_body
+    diff = None
+    if dry_run:
+        name = relpath(path)
+        diff = "".join(difflib.unified_diff(text.splitlines(keepends=True), new_text.splitlines(keepends=True),
+                                            f"a/{name}", f"b/{name}"))
+    else:
+        frontmatter.write_atomic(path, new_text, newline="")
+    return counts, diff
+
+
+def _rewrite_one(rule_names, dry_run, path):
+    # Workers rebuild the codemod from rule names; rule functions need not be picklable.
+    try:
+        return rewrite_file(path, Codemod(RULES[name] for name in rule_names), dry_run), None
+    except (OSError, UnicodeDecodeError) as e:
+        return ({}, None), str(e)
+
+
+def run(rule_names, targets=DEFAULT_TARGETS, dry_run=False, workers=None, extensions=(".md",)):
+    """Apply the named rules to every file under targets and return a report dict."""
+    started = time.perf_counter()
+    unknown = [name for name in rule_names if name not in RULES]
+    if unknown:
+        raise ValueError(f"unknown rule(s): {', '.join(unknown)}")
+    paths = list(iter_files(targets, extensions))
+
+    if workers == 1 or len(paths) < POOL_THRESHOLD:
+        codemod = Codemod(RULES[name] for name in rule_names)
+        results = []
+        for path in paths:
+            try:
+                results.append((rewrite_file(path, codemod, dry_run), None))
+            except (OSError, UnicodeDecodeError) as e:
+                results.append((({}, None), str(e)))
+    else:
+        with futures.ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(partial(_rewrite_one, list(rule_names), dry_run), paths, chunksize=64))
+
+    files = {}
+    diffs = []
+    errors = {}
+    totals = {}
+    for path, ((counts, diff), error) in zip(paths, results):
+        if error:
+            errors[relpath(path)] = error
+            continue
+        if counts:
+            files[relpath(path)] = counts
+            for name, count in counts.items():
+                totals[name] = totals.get(name, 0) + count
+        if diff:
+            diffs.append(diff)
+    return {
+        "mode": "dry-run" if dry_run else "write",
+        "rules": list(rule_names),
+        "checked": len(paths),
+        "changed": len(files),
+        "totals": totals,
+        "files": files,
+        "errors": errors,
+        "diff": "".join(diffs),
+        "elapsed": round(time.perf_counter() - started, 4),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Apply declarative rewrite rules to post bodies in one pass.")
+    parser.add_argument("paths", nargs="*", default=DEFAULT_TARGETS, help="files or directories (default: content/posts)")
+    parser.add_argument("-r", "--rule", action="append", dest="rules", help="rule to apply (repeatable)")
+    parser.add_argument("--all", action="store_true", help="apply every rule, including strip-emoji")
+    parser.add_argument("--dry-run", action="store_true", help="print a unified diff instead of writing")
+    parser.add_argument("--workers", type=int, help="processes for large trees (default: CPU count)")
+    parser.add_argument("--list", action="store_true", help="list the available rules")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        for rule in RULES.values():
+            print(f"{rule.name:22} {rule.description}")
+        return 0
+    # Some rules are destructive (strip-emoji, youtube-link), so never pick them implicitly.
+    if not args.rules and not args.all:
+        parser.error("choose rules with -r NAME (see --list) or pass --all")
+    if args.rules and args.all:
+        parser.error("-r and --all are mutually exclusive")
+
+    try:
+        report = run(list(RULES) if args.all else args.rules, args.paths, dry_run=args.dry_run, workers=args.workers)
+    except (ValueError, FileNotFoundError) as e:
+        parser.error(str(e))
+    diff = report.pop("diff")
+    if diff:
+        sys.stdout.write(diff)
+    print(json.dumps(report, ensure_ascii=False, indent=2), file=sys.stderr if diff else sys.stdout)
+    return 1 if report["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,313 @@
+"""
+Content linter: find or strip emojis and pictographic symbols in one pass per file.
+
+Replaces the old scan_emojis.py / scan_emojis_v2.py / scan_emojis_v3.py scanners and
+clean_emojis.py. Paths are resolved against the repository root, so it behaves the
+same from any working directory, and results are printed as JSON.
+
+Usage:
+    python scripts/contentlint.py scan [paths...]     # default: content static
+    python scripts/contentlint.py fix  [paths...]
+
+`scan` exits with status 1 when anything is found, so it can gate CI.
+
+Incremental runs (so CI time does not grow with the archive):
+    --since REV    only lint files changed between REV and the working tree
+    --cache [FILE] remember the git blob id of every clean file and skip it next
+                   time while the blob is unchanged (default: scripts/.cache/contentlint.json)
+Without git or a usable cache the whole tree is linted, in parallel for large trees.
+"""
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+from concurrent import futures  # ProcessPoolExecutor is imported on first use
+from functools import partial
+from pathlib import Path
+
+import frontmatter
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_TARGETS = ["content", "static"]
+DEFAULT_EXTENSIONS = (".md", ".html")
+CACHE_FILE = PROJECT_ROOT / "scripts" / ".cache" / "contentlint.json"
+# Below this many files a process pool costs more to start than it saves.
+POOL_THRESHOLD = 256
+
+# Everything outside the BMP (emoji, pictographs, ...) plus Misc Symbols / Dingbats,
+# in a single class. ZWJ and VS16 are included so removing an emoji sequence does not
+# leave invisible joiners behind.
+EMOJI_CLASS = "\u200d\ufe0f\u2600-\u27bf\U00010000-\U0010ffff"
+EMOJI_RE = re.compile(f"[{EMOJI_CLASS}]")
+# In fix mode a run of emojis takes one following space with it ("Hello 😀 world" -> "Hello world").
+EMOJI_RUN_RE = re.compile(f"[{EMOJI_CLASS}]+ ?")
+
+
+def relpath(path):
+    path = Path(path).resolve()
+    try:
+        return path.relative_to(PROJECT_ROOT).as_posix()
+    except ValueError:
+        return path.as_posix()
+
+
+def target_path(target):
+    path = Path(target)
+    return path if path.is_absolute() else PROJECT_ROOT / path
+
+
+def check_targets(targets):
+    """Raise FileNotFoundError for a target that is neither a file nor a directory.
+
+    Otherwise a typo would lint nothing, report "0 checked" and pass.
+    """
+    missing = [str(target) for target in targets if not target_path(target).exists()]
+    if missing:
+        raise FileNotFoundError(f"no such file or directory: {', '.join(missing)}")
+
+
+def iter_files(targets, extensions=DEFAULT_EXTENSIONS):
+    """Yield files under the given repo-relative files/directories, filtered by extension."""
+    check_targets(targets)
+    for target in targets:
+        path = target_path(target)
+        if path.is_file():
+            yield path
+            continue
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            for name in sorted(files):
+                if name.endswith(extensions):
+                    yield Path(root) / name
+
+
+def scan_text(text):
+    """Return {"count", "codepoints", "lines"} for the emojis in text, or None if there are none."""
+    codepoints = set()
+    lines = []
+    count = 0
+    line = 1
+    pos = 0
+    for match in EMOJI_RE.finditer(text):
+        start = match.start()
+        line += text.count("\n", pos, start)
+        pos = start
+        count += 1
+        codepoints.add(ord(match.group()))
+        if not lines or lines[-1] != line:
+            lines.append(line)
+    if not count:
+        return None
+    return {
+        "count": count,
+        "codepoints": [f"U+{cp:04X}" for cp in sorted(codepoints)],
+        "lines": lines,
+    }
+
+
+def clean_text(text):
+    """Return (cleaned_text, removed_count)."""
+    removed = 0
+
+    def strip(match):
+        nonlocal removed
+        removed += len(match.group().rstrip(" "))
+        return ""
+
+    return EMOJI_RUN_RE.sub(strip, text), removed
+
+
+def lint_file(path, fix=False):
+    """Scan (and with fix=True, clean) one file. Returns the finding dict or None."""
+    with open(path, encoding="utf-8", newline="") as f:
+        text = f.read()
+    if fix:
+        cleaned, removed = clean_text(text)
+        if not removed:
+            return None
+        frontmatter.write_atomic(path, cleaned, newline="")
+        return {"removed": removed}
+    return scan_text(text)
+
+
+# ------------------------------------------------------------
+# Incremental file selection
+# ------------------------------------------------------------
+def git(*args):
+    """Run git in the repo root; return stdout, or None if git is unavailable or fails."""
+    try:
+        proc = subprocess.run(["git", *args], cwd=PROJECT_ROOT, capture_output=True)
+    except OSError:
+        return None
+    if proc.returncode != 0:
+        return None
+    return proc.stdout.decode("utf-8")
+
+
+def pathspecs(targets):
+    return [relpath(PROJECT_ROOT / target) for target in targets]
+
+
+def split_z(output):
+    return [entry for entry in output.split("\0") if entry]
+
+
+def changed_since(rev, targets, extensions):
+    """Files under targets changed between rev and the working tree (plus untracked), or None."""
+    specs = pathspecs(targets)
+    changed = git("diff", "--name-only", "-z", "--diff-filter=ACMR", rev, "--", *specs)
+    untracked = git("ls-files", "-z", "--others", "--exclude-standard", "--", *specs)
+    if changed is None or untracked is None:
+        return None
+    names = sorted(set(split_z(changed)) | set(split_z(untracked)))
+    return [PROJECT_ROOT / name for name in names
+            if name.endswith(extensions) and (PROJECT_ROOT / name).is_file()]
+
+
+def tracked_blobs(targets, extensions):
+    """{repo-relative path: blob id} from the git index (no file reads), or None without git."""
+    output = git("ls-files", "-z", "--stage", "--", *pathspecs(targets))
+    if output is None:
+        return None
+    blobs = {}
+    for entry in split_z(output):
+        meta, name = entry.split("\t", 1)
+        if name.endswith(extensions):
+            blobs[name] = meta.split()[1]
+    return blobs
+
+
+def dirty_files(targets, extensions):
+    """Files whose working copy differs from the index, or that git does not track yet."""
+    specs = pathspecs(targets)
+    modified = git("diff", "--name-only", "-z", "--", *specs) or ""
+    untracked = git("ls-files", "-z", "--others", "--exclude-standard", "--", *specs) or ""
+    return {name for name in split_z(modified) + split_z(untracked) if name.endswith(extensions)}
+
+
+def load_cache(cache_path):
+    try:
+        cache = json.loads(Path(cache_path).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    # A different character class means every earlier "clean" verdict is void.
+    if cache.get("pattern") != EMOJI_CLASS:
+        return None
+    return cache.get("files", {})
+
+
+def save_cache(cache_path, files):
+    cache_path = Path(cache_path)
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    frontmatter.write_atomic(cache_path, json.dumps({"pattern": EMOJI_CLASS, "files": dict(sorted(files.items()))}, indent=1))
+
+
+# ------------------------------------------------------------
+# Driver
+# ------------------------------------------------------------
+def _lint_one(fix, path):
+    try:
+        return lint_file(path, fix), None
+    except (OSError, UnicodeDecodeError) as e:
+        return None, str(e)
+
+
+def lint(targets, fix=False, extensions=DEFAULT_EXTENSIONS, since=None, cache_path=None, workers=None):
+    """Lint the selected files and return the JSON report.
+
+    since limits the run to files changed after that git revision; cache_path skips
+    files whose git blob was clean last time. Otherwise every file is linted.
+    """
+    started = time.perf_counter()
+    check_targets(targets)
+    paths = None
+    strategy = "full"
+    blobs = cached = dirty = None
+
+    if since:
+        paths = changed_since(since, targets, extensions)
+        strategy = "since"
+    elif cache_path:
+        blobs = tracked_blobs(targets, extensions)
+        cached = load_cache(cache_path) if blobs is not None else None
+        if cached is not None:
+            dirty = dirty_files(targets, extensions)
+            names = sorted(name for name, blob in blobs.items() if cached.get(name) != blob)
+            names = sorted(set(names) | dirty)
+            paths = [PROJECT_ROOT / name for name in names if (PROJECT_ROOT / name).is_file()]
+            strategy = "cache"
+    if paths is None:
+        paths = list(iter_files(targets, extensions))
+        strategy = "full"
+
+    if workers == 1 or len(paths) < POOL_THRESHOLD:
+        results = [_lint_one(fix, path) for path in paths]
+    else:
+        with futures.ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(partial(_lint_one, fix), paths, chunksize=64))
+
+    files = {}
+    errors = {}
+    for path, (finding, error) in zip(paths, results):
+        if error:
+            errors[relpath(path)] = error
+        elif finding:
+            files[relpath(path)] = finding
+
+    if cache_path and blobs is not None:
+        # Only clean, committed files are remembered; anything with findings is
+        # re-linted every run so fix mode keeps stripping it from the deploy checkout.
+        dirty = dirty if dirty is not None else dirty_files(targets, extensions)
+        linted = {relpath(path) for path in paths}
+        new_cache = {name: blob for name, blob in (cached or {}).items() if name in blobs}
+        for name in linted:
+            if name in blobs and name not in dirty and name not in files and name not in errors:
+                new_cache[name] = blobs[name]
+            else:
+                new_cache.pop(name, None)
+        save_cache(cache_path, new_cache)
+
+    total = len(blobs) if blobs is not None else len(paths)
+    return {
+        "mode": "fix" if fix else "scan",
+        "strategy": strategy,
+        "checked": len(paths),
+        "skipped": max(0, total - len(paths)) if strategy != "full" else 0,
+        "files": files,
+        "errors": errors,
+        "elapsed": round(time.perf_counter() - started, 4),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Find or remove emojis in site content.")
+    parser.add_argument("mode", choices=["scan", "fix"])
+    parser.add_argument("paths", nargs="*", default=DEFAULT_TARGETS,
+                        help="repo-relative files or directories (default: content static)")
+    parser.add_argument("--ext", action="append", help="file extension to include (default: .md, .html)")
+    parser.add_argument("--since", metavar="REV", help="only lint files changed since this git revision")
+    parser.add_argument("--cache", nargs="?", const=CACHE_FILE, metavar="FILE",
+                        help="skip files whose git blob was clean last run (default file: scripts/.cache/contentlint.json)")
+    parser.add_argument("--workers", type=int, help="processes for large full scans (default: CPU count)")
+    args = parser.parse_args(argv)
+
+    # Force UTF-8 for stdout (Korean paths on Windows consoles)
+    sys.stdout.reconfigure(encoding="utf-8")
+    extensions = tuple(args.ext) if args.ext else DEFAULT_EXTENSIONS
+    try:
+        report = lint(args.paths, fix=args.mode == "fix", extensions=extensions,
+                      since=args.since, cache_path=args.cache, workers=args.workers)
+    except FileNotFoundError as e:
+        parser.error(str(e))
+    json.dump(report, sys.stdout, indent=1, ensure_ascii=False)
+    sys.stdout.write("\n")
+    if args.mode == "scan" and report["files"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,257 @@
+"""
+Shared front-matter helpers for the scripts in this directory.
+
+Hugo posts start with a TOML (+++) or YAML (---) header. Most tools only need that
+header, so read() stops at the closing delimiter and records where the body starts;
+the body is only read when asked for. Metadata is parsed on first access, and a
+single table such as [params.verification] can be replaced without touching the
+body bytes.
+
+    fm = frontmatter.read("content/posts/jeju.md")
+    fm.meta["title"]                      # parsed lazily (tomllib/tomli or PyYAML)
+    fm.read_body()                        # seeks to fm.body_offset
+
+    for path, meta, body_offset in frontmatter.iter_dir("content/posts"):
+        ...
+
+    frontmatter.rewrite_table(path, "params.verification", {"content_hash": "..."})
+"""
+
+import json
+import os
+import re
+import tempfile
+from collections.abc import Mapping
+from datetime import date, datetime
+from pathlib import Path
+
+DELIMITERS = {"+++": "toml", "---": "yaml"}
+
+TOML_RE = re.compile(r'^\+\+\+\r?\n(.*?)\r?\n\+\+\+\r?\n(.*)$', re.DOTALL)
+YAML_RE = re.compile(r'^---\r?\n(.*?)\r?\n---\r?\n(.*)$', re.DOTALL)
+
+
+# ------------------------------------------------------------
+# Parsing
+# ------------------------------------------------------------
+def _load_toml(raw):
+    try:
+        import tomllib
+    except ImportError:  # Python < 3.11
+        try:
+            import tomli as tomllib
+        except ImportError:
+            raise ImportError("Parsing TOML front matter needs Python 3.11+ or: pip install tomli")
+    return tomllib.loads(raw)
+
+
+def _load_yaml(raw):
+    try:
+        import yaml
+    except ImportError:
+        raise ImportError("Parsing YAML front matter needs: pip install pyyaml")
+    return yaml.safe_load(raw) or {}
+
+
+def parse(fm_type, raw):
+    """Parse a raw header into a dict."""
+    return _load_toml(raw) if fm_type == "toml" else _load_yaml(raw)
+
+
+class LazyMeta(Mapping):
+    """Read-only mapping that parses the raw header the first time it is used."""
+
+    def __init__(self, fm_type, raw):
+        self.fm_type = fm_type
+        self.raw = raw
+        self._data = None
+
+    @property
+    def data(self):
+        if self._data is None:
+            self._data = parse(self.fm_type, self.raw)
+        return self._data
+
+    def __getitem__(self, key):
+        return self.data[key]
+
+    def __iter__(self):
+        return iter(self.data)
+
+    def __len__(self):
+        return len(self.data)
+
+
+class FrontMatter:
+    """Header of one file: format, raw text and the byte offset where the body begins."""
+
+    def __init__(self, path, fm_type, raw, body_offset):
+        self.path = Path(path)
+        self.fm_type = fm_type
+        self.raw = raw
+        self.body_offset = body_offset
+        self.meta = LazyMeta(fm_type, raw)
+
+    def read_body(self):
+        with open(self.path, "rb") as f:
+            f.seek(self.body_offset)
+            return f.read().decode("utf-8")
+
+
+def read(path):
+    """Read only the header of path. Returns a FrontMatter, or None if there is none."""
+    with open(path, "rb") as f:
+        first = f.readline()
+        delimiter = first.rstrip(b"\r\n").decode("utf-8", "replace")
+        fm_type = DELIMITERS.get(delimiter)
+        if fm_type is None:
+            return None
+        lines = []
+        for line in f:
+            if line.rstrip(b"\r\n") == first.rstrip(b"\r\n"):
+                # Like split(), raw excludes the newline before the closing delimiter.
+                raw = b"".join(lines).decode("utf-8")
+                if raw.endswith("\n"):
+                    raw = raw[:-2] if raw.endswith("\r\n") else raw[:-1]
+                return FrontMatter(path, fm_type, raw, f.tell())
+            lines.append(line)
+    return None
+
+
+def split(text):
+    """Split full file text into (fm_type, raw, body), or None if there is no header."""
+    match = TOML_RE.search(text)
+    if match:
+        return "toml", match.group(1), match.group(2)
+    match = YAML_RE.search(text)
+    if match:
+        return "yaml", match.group(1), match.group(2)
+    return None
+
+
+def iter_dir(root, pattern="**/*.md"):
+    """Yield (path, meta, body_offset) for every file under root with a header; meta is lazy."""
+    for path in sorted(Path(root).glob(pattern)):
+        if not path.is_file():
+            continue
+        fm = read(path)
+        if fm is not None:
+            yield path, fm.meta, fm.body_offset
+
+
+# ------------------------------------------------------------
+# Single-table access without a TOML/YAML library
+# ------------------------------------------------------------
+def _toml_table_re(table):
+    # From the [table] header up to the next table header or the end of the header text.
+    return re.compile(r'\[' + re.escape(table) + r'\].*?(\n\[|$)', re.DOTALL)
+
+
+def _yaml_table_re(table):
+    parts = table.split(".")
+    pattern = "^"
+    for depth, part in enumerate(parts):
+        pattern += "  " * depth + re.escape(part) + r":\n"
+    return re.compile(pattern + r'(?:' + "  " * len(parts) + r'.*(?:\n|$))*', re.MULTILINE)
+
+
+def read_table(fm_type, raw, table):
+    """Return the simple `key = "string"` / `key: "string"` pairs of one table."""
+    if fm_type == "toml":
+        match = _toml_table_re(table).search(raw)
+        text = match.group(0) if match else ""
+    else:
+        match = _yaml_table_re(table).search(raw)
+        text = match.group(0) if match else ""
+    return dict(re.findall(r'^\s*([A-Za-z0-9_-]+)\s*[=:]\s*"([^"]*)"', text, re.MULTILINE))
+
+
+def replace_table(fm_type, raw, table, values):
+    """Return raw with `table` removed and re-appended at the end holding `values`."""
+    if fm_type == "toml":
+        raw = _toml_table_re(table).sub(r'\1', raw)
+        block = f"[{table}]\n" + "".join(f"  {key} = {dumps_toml_value(value)}\n" for key, value in values.items())
+    else:
+        raw = _yaml_table_re(table).sub("", raw)
+        parts = table.split(".")
+        block = "".join("  " * depth + f"{part}:\n" for depth, part in enumerate(parts))
+        indent = "  " * len(parts)
+        block += "".join(f"{indent}{key}: {json.dumps(value, ensure_ascii=False)}\n" for key, value in values.items())
+    return raw.rstrip("\n") + "\n" + block
+
+
+def join(fm_type, raw, body):
+    """Inverse of split()."""
+    delimiter = "+++" if fm_type == "toml" else "---"
+    return f"{delimiter}\n{raw}\n{delimiter}\n{body}"
+
+
+def rewrite_table(path, table, values):
+    """Replace one table in path's header in place; the body bytes are copied unchanged."""
+    fm = read(path)
+    if fm is None:
+        raise ValueError(f"No front matter in {path}")
+    delimiter = "+++" if fm.fm_type == "toml" else "---"
+    header = f"{delimiter}\n{replace_table(fm.fm_type, fm.raw, table, values)}\n{delimiter}\n".encode("utf-8")
+    with open(path, "rb") as f:
+        f.seek(fm.body_offset)
+        body = f.read()
+    write_atomic(path, header + body)
+
+
+# ------------------------------------------------------------
+# Writing
+# ------------------------------------------------------------
+def dumps_toml_value(value):
+    """Serialize a str/bool/int/float/date/datetime/list value as TOML."""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (int, float)):
+        return repr(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (list, tuple)):
+        return "[" + ", ".join(dumps_toml_value(item) for item in value) + "]"
+    # JSON string escapes are valid TOML basic-string escapes, except DEL must be escaped too.
+    return json.dumps(str(value), ensure_ascii=False).replace("\x7f", "\\u007f")
+
+
+def dumps_toml(meta):
+    """Serialize a flat mapping as TOML front matter lines (insertion order kept)."""
+    return "".join(f"{key} = {dumps_toml_value(value)}\n" for key, value in meta.items())
+
+
+def _default_mode():
+    # os.umask can only be read by setting it; do it once, before any worker threads.
+    umask = os.umask(0)
+    os.umask(umask)
+    return 0o666 & ~umask
+
+
+DEFAULT_MODE = _default_mode()
+
+
+def write_atomic(path, data, newline=None):
+    """Write str or bytes via a temp file in the same directory and os.replace it into place.
+
+    mkstemp creates the temp file as 0600, so it gets the replaced file's mode (or the
+    umask default for a new file) before it takes that file's place.
+    """
+    path = Path(path)
+    try:
+        mode = path.stat().st_mode & 0o7777
+    except FileNotFoundError:
+        mode = DEFAULT_MODE
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        os.chmod(tmp, mode)
+        if isinstance(data, bytes):
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+        else:
+            with os.fdopen(fd, "w", encoding="utf-8", newline=newline) as f:
+                f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
@@ -0,0 +1,158 @@
+"""
+insta_to_post.py 영구 캐시
+==========================
+
+Instagram 조회 결과와 Gemini 요약 결과를 SQLite 파일(scripts/.cache/insta.sqlite3)에
+저장합니다. 실패 후 재실행하거나 템플릿만 고쳐 다시 생성할 때 입력이 같으면
+네트워크 호출 없이 캐시에서 바로 가져옵니다.
+
+- posts:     shortcode → (caption, date_local)
+- summaries: sha256(prompt + GEMINI_MODEL) → 파싱된 JSON 결과
+
+각 테이블은 TTL이 지난 항목과, 최대 항목 수를 넘는 오래 안 쓴 항목부터 정리됩니다.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+CACHE_DIR = Path(__file__).parent / ".cache"
+CACHE_FILE = CACHE_DIR / "insta.sqlite3"
+
+# 캡션은 거의 바뀌지 않고, 요약은 프롬프트가 같으면 결과를 재사용해도 된다.
+POST_TTL = 90 * 24 * 3600
+SUMMARY_TTL = 180 * 24 * 3600
+MAX_ENTRIES = 20000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS posts (
+    shortcode  TEXT PRIMARY KEY,
+    caption    TEXT NOT NULL,
+    date_local TEXT NOT NULL,
+    created    REAL NOT NULL,
+    accessed   REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS summaries (
+    key      TEXT PRIMARY KEY,
+    result   TEXT NOT NULL,
+    created  REAL NOT NULL,
+    accessed REAL NOT NULL
+);
+"""
+
+
+def summary_key(prompt: str, model: str) -> str:
+    """프롬프트와 모델 이름으로 만든 요약 캐시 키"""
+    return hashlib.sha256((prompt + model).encode('utf-8')).hexdigest()
+
+
+class ImportCache:
+    """스레드 안전 SQLite 캐시
+
+    read=False면 조회를 건너뛰고(--refresh), write=False면 저장도 하지 않는다.
+    둘 다 False면(--no-cache) 파일을 열지 않는다.
+    """
+
+    def __init__(
+        self,
+        path: Path = CACHE_FILE,
+        read: bool = True,
+        write: bool = True,
+        post_ttl: float = POST_TTL,
+        summary_ttl: float = SUMMARY_TTL,
+        max_entries: int = MAX_ENTRIES,
+    ):
+        self.read = read
+        self.write = write
+        self.ttl = {'posts': post_ttl, 'summaries': summary_ttl}
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._db = None
+        if read or write:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(str(path), check_same_thread=False, isolation_level=None)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.executescript(SCHEMA)
+            self.prune()
+
+    # --------------------------------------------------------
+    # 조회 / 저장
+    # --------------------------------------------------------
+    def _get(self, table: str, key_column: str, key: str, columns: str) -> Optional[tuple]:
+        if not (self.read and self._db):
+            return None
+        now = time.time()
+        with self._lock:
+            row = self._db.execute(
+                f"SELECT {columns} FROM {table} WHERE {key_column} = ? AND created >= ?",
+                (key, now - self.ttl[table]),
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self._db.execute(f"UPDATE {table} SET accessed = ? WHERE {key_column} = ?", (now, key))
+            self.hits += 1
+            return row
+
+    def _put(self, table: str, values: tuple) -> None:
+        if not (self.write and self._db):
+            return
+        now = time.time()
+        placeholders = ', '.join('?' * (len(values) + 2))
+        with self._lock:
+            self._db.execute(
+                f"INSERT OR REPLACE INTO {table} VALUES ({placeholders})",
+                (*values, now, now),
+            )
+
+    def get_post(self, shortcode: str) -> Optional[tuple]:
+        """캐시된 (caption, date_local) 또는 None"""
+        row = self._get('posts', 'shortcode', shortcode, 'caption, date_local')
+        if row is None:
+            return None
+        return row[0], datetime.fromisoformat(row[1])
+
+    def put_post(self, shortcode: str, caption: str, date_local: datetime) -> None:
+        self._put('posts', (shortcode, caption, date_local.isoformat()))
+
+    def get_summary(self, key: str) -> Optional[dict]:
+        """캐시된 요약 결과 또는 None"""
+        row = self._get('summaries', 'key', key, 'result')
+        return json.loads(row[0]) if row else None
+
+    def put_summary(self, key: str, result: dict) -> None:
+        self._put('summaries', (key, json.dumps(result, ensure_ascii=False)))
+
+    # --------------------------------------------------------
+    # 정리
+    # --------------------------------------------------------
+    def prune(self) -> int:
+        """TTL이 지난 항목과 최대 개수를 넘는 LRU 항목 삭제, 삭제 수 반환"""
+        if not (self.write and self._db):
+            return 0
+        now = time.time()
+        removed = 0
+        with self._lock:
+            for table, ttl in self.ttl.items():
+                removed += self._db.execute(
+                    f"DELETE FROM {table} WHERE created < ?", (now - ttl,)
+                ).rowcount
+                removed += self._db.execute(
+                    f"DELETE FROM {table} WHERE rowid IN ("
+                    f"SELECT rowid FROM {table} ORDER BY accessed DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,),
+                ).rowcount
+        return removed
+
+    def close(self) -> None:
+        if self._db:
+            with self._lock:
+                self._db.close()
+            self._db = None
@@ -0,0 +1,80 @@
+"""
+insta_to_post.py 녹화 파일 (record / replay)
+============================================
+
+`insta_to_post.py --record FILE`로 실행하면 실제 Instagram 조회 결과와 Gemini 응답
+원문을 JSON Lines로 남깁니다. benchmarks/standin.py의 로컬 대역 서버가 이 파일을
+그대로 재생하므로, 실제 트래픽 없이 같은 입력으로 파이프라인을 부하 테스트할 수
+있습니다.
+
+    {"kind": "post", "shortcode": "...", "caption": "...", "date_local": "2024-01-01T09:00:00"}
+    {"kind": "gemini", "prompt_sha256": "...", "text": "...", "usage": {"prompt_tokens": 812, ...}}
+
+Gemini 응답은 프롬프트 sha256으로 찾습니다 (프롬프트 원문은 저장하지 않음).
+캡션이 그대로 들어가므로 공개 저장소에 커밋하지 마세요.
+"""
+
+import hashlib
+import json
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+POST = "post"
+GEMINI = "gemini"
+
+
+def prompt_key(prompt: str) -> str:
+    return hashlib.sha256(prompt.encode('utf-8')).hexdigest()
+
+
+class Cassette:
+    """녹화 파일 하나 (기존 내용을 읽어 두고 새 기록은 끝에 추가, 스레드 안전)"""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.posts = {}
+        self.responses = {}
+        self._lock = threading.Lock()
+        self._file = None
+        if self.path.exists():
+            for line in self.path.read_text(encoding='utf-8').splitlines():
+                try:
+                    self._index(json.loads(line))
+                except (ValueError, KeyError):
+                    continue
+
+    def _index(self, record: dict) -> None:
+        if record['kind'] == POST:
+            self.posts[record['shortcode']] = record
+        elif record['kind'] == GEMINI:
+            self.responses[record['prompt_sha256']] = record
+
+    def _append(self, record: dict) -> None:
+        with self._lock:
+            self._index(record)
+            if self._file is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._file = open(self.path, 'a', encoding='utf-8')
+            self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+            self._file.flush()
+
+    def record_post(self, shortcode: str, caption: str, date_local: datetime) -> None:
+        self._append({'kind': POST, 'shortcode': shortcode, 'caption': caption,
+                      'date_local': date_local.isoformat()})
+
+    def record_response(self, prompt: str, text: str, usage: dict) -> None:
+        self._append({'kind': GEMINI, 'prompt_sha256': prompt_key(prompt), 'text': text, 'usage': usage})
+
+    def post(self, shortcode: str) -> Optional[dict]:
+        return self.posts.get(shortcode)
+
+    def response(self, prompt: str) -> Optional[dict]:
+        return self.responses.get(prompt_key(prompt))
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
@@ -0,0 +1,223 @@
+"""
+insta_to_post.py 중복 방지 색인
+===============================
+
+content/posts 아래 게시물에 이미 들어 있는 {{< instagram SHORTCODE >}}
+({{< insta-photo SHORTCODE >}} 포함)를 모아 둔 색인입니다. 링크를 처리하기 전에
+색인에 있는 shortcode를 걸러내므로, 같은 링크를 다시 돌려도 Instagram 조회나
+Gemini 요청이 일어나지 않습니다. 제목은 AI가 정하므로 파일 이름만으로는 같은
+게시물을 다시 가져오는 것을 막을 수 없습니다.
+
+같은 색인에 게시물 본문마다 64비트 SimHash도 저장합니다. 재게시되었거나 조금만
+고친 캡션은 shortcode가 달라도 본문 SimHash와 해밍 거리가 가까우므로, 요약 요청
+전에 거의 같은 게시물로 표시하거나 기존 요약을 재사용할 수 있습니다.
+
+scripts/.cache/shortcodes.json에 파일별 (mtime, 크기, shortcode 목록, SimHash)를
+저장하고, 다음 실행에서는 mtime이나 크기가 바뀐 파일만 다시 읽습니다.
+"""
+
+import hashlib
+import json
+import re
+from collections import Counter
+from pathlib import Path
+from typing import Optional
+
+import frontmatter
+
+SCRIPT_DIR = Path(__file__).parent
+CONTENT_DIR = SCRIPT_DIR.parent / "content" / "posts"
+INDEX_FILE = SCRIPT_DIR / ".cache" / "shortcodes.json"
+INDEX_VERSION = 2
+
+SHORTCODE_RE = re.compile(r'\{\{<\s*(?:instagram|insta-photo)\s+"?([A-Za-z0-9_-]+)"?\s*>\}\}')
+AI_SUMMARY_RE = re.compile(r'\{\{<\s*ai_summary\s*>\}\}(.*?)\{\{<\s*/ai_summary\s*>\}\}', re.DOTALL)
+ANY_SHORTCODE_RE = re.compile(r'\{\{[<%].*?[%>]\}\}', re.DOTALL)
+HASHTAG_RE = re.compile(r'#\S+')
+
+# SimHash 설정: 4글자 shingle, 64비트, 해밍 거리 3 이하를 거의 같은 글로 본다.
+SHINGLE = 4
+MIN_SHINGLES = 16  # 이보다 짧은 글은 지문이 우연히 겹치기 쉬워 색인하지 않음
+MAX_DISTANCE = 3
+# 비둘기집 원리: 거리가 3 이하면 16비트 블록 4개 중 적어도 하나는 완전히 같다.
+BLOCKS = MAX_DISTANCE + 1
+BLOCK_BITS = 64 // BLOCKS
+BLOCK_MASK = (1 << BLOCK_BITS) - 1
+
+# 64개 비트 카운터를 LANE비트 칸으로 한 정수에 나란히 담아, shingle마다 64번 도는 대신
+# 바이트 8개에 대한 표 조회와 큰 정수 덧셈 8번으로 센다 (칸 하나에 shingle 1600만 개까지).
+LANE = 24
+LANE_MASK = (1 << LANE) - 1
+_SPREAD = [[sum(1 << ((position * 8 + bit) * LANE) for bit in range(8) if byte >> bit & 1)
+            for byte in range(256)] for position in range(8)]
+
+
+# ============================================================
+# SimHash
+# ============================================================
+def normalize_text(text: str) -> str:
+    """캡션과 게시물 본문을 같은 기준으로 정리 (ai_summary 블록, shortcode, 해시태그 제거)"""
+    text = AI_SUMMARY_RE.sub(' ', text)
+    text = ANY_SHORTCODE_RE.sub(' ', text)
+    text = HASHTAG_RE.sub(' ', text)
+    return ' '.join(text.lower().split())
+
+
+def simhash(text: str) -> Optional[int]:
+    """정리한 글의 64비트 SimHash (너무 짧으면 None)"""
+    text = normalize_text(text)
+    if len(text) < SHINGLE + MIN_SHINGLES:
+        return None
+    s0, s1, s2, s3, s4, s5, s6, s7 = _SPREAD
+    ones = 0  # 비트별로 1인 shingle 수 (가중치 포함)
+    total = 0
+    for shingle, count in Counter(text[i:i + SHINGLE] for i in range(len(text) - SHINGLE + 1)).items():
+        # digest를 big-endian 정수로 읽으므로 마지막 바이트가 하위 비트
+        d = hashlib.blake2b(shingle.encode('utf-8'), digest_size=8).digest()
+        ones += count * (s0[d[7]] + s1[d[6]] + s2[d[5]] + s3[d[4]] + s4[d[3]] + s5[d[2]] + s6[d[1]] + s7[d[0]])
+        total += count
+    # 1인 쪽 가중치가 0인 쪽보다 큰 비트만 1
+    return sum(1 << bit for bit in range(64) if 2 * (ones >> (bit * LANE) & LANE_MASK) > total)
+
+
+def hamming(a: int, b: int) -> int:
+    return bin(a ^ b).count('1')
+
+
+class SimHashIndex:
+    """블록별 해시 테이블로 해밍 거리 MAX_DISTANCE 이하 지문을 찾는 색인
+
+    지문마다 16비트 블록 4개를 키로 등록하고, 조회할 때는 블록이 하나라도 같은
+    후보만 거리를 계산하므로 색인이 커져도 비교 횟수는 거의 늘지 않는다.
+    """
+
+    def __init__(self):
+        self.tables = [{} for _ in range(BLOCKS)]
+
+    def add(self, fingerprint: int, key: str) -> None:
+        for block, table in enumerate(self.tables):
+            table.setdefault(fingerprint >> (block * BLOCK_BITS) & BLOCK_MASK, []).append((fingerprint, key))
+
+    def find(self, fingerprint: int, max_distance: int = MAX_DISTANCE) -> Optional[tuple]:
+        """가장 가까운 (key, 거리), 거리 max_distance 이하가 없으면 None"""
+        best = None
+        for block, table in enumerate(self.tables):
+            for candidate, key in table.get(fingerprint >> (block * BLOCK_BITS) & BLOCK_MASK, ()):
+                distance = hamming(fingerprint, candidate)
+                if distance <= max_distance and (best is None or distance < best[1]):
+                    best = (key, distance)
+        return best
+
+
+# ============================================================
+# 게시물 색인
+# ============================================================
+class ShortcodeIndex:
+    """shortcode → 그 shortcode를 embed한 게시물 경로 (content 디렉터리 기준) + 본문 SimHash 색인"""
+
+    def __init__(self, content_dir: Path = CONTENT_DIR, path: Optional[Path] = INDEX_FILE):
+        self.content_dir = Path(content_dir)
+        self.path = path
+        self.files = {}
+        self.shortcodes = {}
+        self.bodies = SimHashIndex()
+        self.scanned = 0
+        self._dirty = False
+
+    @classmethod
+    def build(cls, content_dir: Path = CONTENT_DIR, path: Optional[Path] = INDEX_FILE) -> "ShortcodeIndex":
+        """저장된 색인을 불러와 바뀐 파일만 다시 읽은 색인 (실행당 한 번)"""
+        index = cls(content_dir, path)
+        index.refresh()
+        return index
+
+    def _load(self) -> dict:
+        if not self.path:
+            return {}
+        try:
+            data = json.loads(self.path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return {}
+        if data.get('version') != INDEX_VERSION or data.get('content_dir') != self.content_dir.as_posix():
+            return {}
+        return data.get('files', {})
+
+    def refresh(self) -> None:
+        saved = self._load()
+        files = {}
+        for md_path in sorted(self.content_dir.rglob('*.md')):
+            key = md_path.relative_to(self.content_dir).as_posix()
+            stat = md_path.stat()
+            entry = saved.get(key)
+            if not entry or entry['mtime'] != stat.st_mtime_ns or entry['size'] != stat.st_size:
+                entry = self._scan(md_path, stat)
+            files[key] = entry
+        self._dirty = files != saved
+        self.files = files
+        self.shortcodes = {}
+        self.bodies = SimHashIndex()
+        for key, entry in files.items():
+            self._register(key, entry)
+
+    def _register(self, key: str, entry: dict) -> None:
+        for shortcode in entry['shortcodes']:
+            self.shortcodes.setdefault(shortcode, key)
+        if entry['simhash'] is not None:
+            self.bodies.add(entry['simhash'], key)
+
+    def _scan(self, md_path: Path, stat) -> dict:
+        self.scanned += 1
+        text = md_path.read_text(encoding='utf-8', errors='replace')
+        shortcodes = list(dict.fromkeys(SHORTCODE_RE.findall(text)))
+        parts = frontmatter.split(text)
+        body = parts[2] if parts else text
+        return {'mtime': stat.st_mtime_ns, 'size': stat.st_size, 'shortcodes': shortcodes, 'simhash': simhash(body)}
+
+    def get(self, shortcode: str) -> Optional[str]:
+        """이미 게시된 shortcode면 그 게시물 경로"""
+        return self.shortcodes.get(shortcode)
+
+    def __contains__(self, shortcode: str) -> bool:
+        return shortcode in self.shortcodes
+
+    def __len__(self) -> int:
+        return len(self.shortcodes)
+
+    def add(self, md_path: Path) -> None:
+        """새로 만든 게시물을 색인에 반영"""
+        md_path = Path(md_path)
+        key = md_path.relative_to(self.content_dir).as_posix()
+        entry = self._scan(md_path, md_path.stat())
+        self.files[key] = entry
+        self._register(key, entry)
+        self._dirty = True
+
+    def near_duplicate(self, fingerprint: Optional[int]) -> Optional[tuple]:
+        """본문이 거의 같은 기존 게시물 (경로, 해밍 거리)"""
+        if fingerprint is None:
+            return None
+        return self.bodies.find(fingerprint)
+
+    def summary_of(self, key: str) -> dict:
+        """기존 게시물의 front matter와 ai_summary 블록을 요약 결과 형태로 (재사용용, 검증 전)"""
+        fm = frontmatter.read(self.content_dir / key)
+        if fm is None:
+            return {}
+        meta = fm.meta
+        match = AI_SUMMARY_RE.search(fm.read_body())
+        categories = meta.get('categories') or ['writing']
+        return {
+            'title': meta.get('title'),
+            'summary': match.group(1).strip() if match else '',
+            'tags': list(meta.get('tags') or []),
+            'mentions': list(meta.get('mentions') or []),
+            'category': categories[0] if isinstance(categories, list) else categories,
+        }
+
+    def save(self) -> None:
+        if not (self.path and self._dirty):
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        data = {'version': INDEX_VERSION, 'content_dir': self.content_dir.as_posix(), 'files': self.files}
+        frontmatter.write_atomic(self.path, json.dumps(data, ensure_ascii=False))
+        self._dirty = False
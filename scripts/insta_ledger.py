@@ -0,0 +1,132 @@
+"""
+insta_to_post.py 진행 기록 (append-only 저널)
+=============================================
+
+링크마다 단계가 끝나는 즉시 한 줄(JSON)을 scripts/.state/ledger.jsonl에 추가하고
+fsync합니다. 중간에 죽어도 마지막으로 기록된 단계부터 이어서 처리할 수 있습니다.
+
+상태:
+- fetched:    Instagram 조회 완료 (caption, date_local 포함)
+- summarized: AI 요약 완료 (result 포함)
+- written:    게시물 파일 생성 완료 (path 포함)
+- skipped:    일부러 건너뜀 (reason, match 포함; 예: 거의 같은 캡션) — 실패가 아니므로 재시도 대상 아님
+- failed:     실패 (stage, error 포함)
+
+같은 shortcode의 기록이 여러 줄이면 마지막 줄이 현재 상태입니다.
+"""
+
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+STATE_DIR = Path(__file__).parent / ".state"
+LEDGER_FILE = STATE_DIR / "ledger.jsonl"
+
+FETCHED = "fetched"
+SUMMARIZED = "summarized"
+WRITTEN = "written"
+SKIPPED = "skipped"
+FAILED = "failed"
+
+
+class Ledger:
+    """shortcode별 최신 상태를 메모리에 들고 있는 append-only JSONL 저널"""
+
+    def __init__(self, path: Path = LEDGER_FILE):
+        self.path = path
+        self.records = {}
+        self._lines = 0
+        self._lock = threading.Lock()
+        self._load()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(path, 'a', encoding='utf-8')
+
+    def _load(self) -> None:
+        if not self.path.exists():
+            return
+        data = self.path.read_bytes()
+        end = data.rfind(b'\n') + 1
+        if end < len(data):
+            # 기록 도중 죽어서 잘린 마지막 줄: 다음 기록이 이어 붙지 않도록 잘라낸다
+            with open(self.path, 'r+b') as f:
+                f.truncate(end)
+        for line in data[:end].decode('utf-8').splitlines():
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            self.records[record['shortcode']] = record
+            self._lines += 1
+
+    def get(self, shortcode: str) -> Optional[dict]:
+        return self.records.get(shortcode)
+
+    def state(self, shortcode: str) -> Optional[str]:
+        record = self.records.get(shortcode)
+        return record['state'] if record else None
+
+    def record(self, shortcode: str, state: str, **fields) -> dict:
+        """상태 한 줄을 추가하고 디스크에 내려쓴 뒤 반환"""
+        record = {
+            'shortcode': shortcode,
+            'state': state,
+            'at': datetime.now().isoformat(timespec='seconds'),
+            **fields,
+        }
+        line = json.dumps(record, ensure_ascii=False, default=str)
+        with self._lock:
+            self._file.write(line + '\n')
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self.records[shortcode] = record
+            self._lines += 1
+        return record
+
+    def count(self, state: str) -> int:
+        return sum(1 for record in self.records.values() if record['state'] == state)
+
+    def compact(self) -> None:
+        """shortcode별 최신 기록만 남기도록 저널을 원자적으로 다시 씀"""
+        with self._lock:
+            if self._lines <= len(self.records):
+                return
+            tmp = self.path.with_suffix('.tmp')
+            with open(tmp, 'w', encoding='utf-8') as f:
+                for record in self.records.values():
+                    f.write(json.dumps(record, ensure_ascii=False, default=str) + '\n')
+                f.flush()
+                os.fsync(f.fileno())
+            self._file.close()
+            os.replace(tmp, self.path)
+            self._file = open(self.path, 'a', encoding='utf-8')
+            self._lines = len(self.records)
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class StageTimer:
+    """링크별로 직전 단계 완료 시점부터의 경과 시간을 잰다"""
+
+    def __init__(self):
+        self._marks = {}
+
+    def start(self, shortcode: str) -> None:
+        self._marks[shortcode] = time.monotonic()
+
+    def lap(self, shortcode: str) -> float:
+        now = time.monotonic()
+        elapsed = now - self._marks.get(shortcode, now)
+        self._marks[shortcode] = now
+        return round(elapsed, 3)
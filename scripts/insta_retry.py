@@ -0,0 +1,321 @@
+"""
+insta_to_post.py 재시도 / 서킷 브레이커
+=======================================
+
+Instagram과 Gemini 호출을 감싸는 공통 복원력 계층입니다.
+
+- 오류 분류: throttled(429, 할당량 초과) / transient(연결 끊김, 5xx, 시간 초과) /
+  fatal(404, 비공개 계정, 잘못된 요청 등 다시 보내도 같은 결과)
+- 재시도: fatal이 아니면 지수 백오프 + jitter로 다시 시도하고, 서버가 알려 준 대기
+  시간(Retry-After 헤더, Gemini RetryInfo, "retry in 41s" 메시지)이 있으면 그만큼 기다림
+- 속도 조절: 429를 받으면 서비스의 토큰 버킷 속도를 절반으로 줄이고, 성공할 때마다
+  조금씩 원래 속도로 되돌림 (AIMD)
+- 서킷 브레이커: 연속 실패가 쌓이거나 서버가 대기 시간을 알려 주면 서비스 전체를
+  잠시 멈추고(open), 대기가 끝나면 요청 하나로만 시험(half-open)한 뒤 재개
+
+    service = Service("gemini")
+    response = service.call(model.generate_content, prompt, span=span)
+
+재시도를 다 쓰고도 실패하면 원래 예외를 감싼 RetryError를 던집니다.
+재시도 횟수는 span의 retries 속성으로, 멈춘 시간은 paused_ms 속성으로 남습니다.
+"""
+
+import random
+import re
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+# 오류 분류
+THROTTLED = "throttled"
+TRANSIENT = "transient"
+FATAL = "fatal"
+
+# 재시도 기본값
+RETRIES = 4            # 첫 요청 이후 최대 재시도 횟수
+BASE_DELAY = 2.0       # 첫 재시도 대기 (초), 시도마다 두 배
+MAX_DELAY = 120.0      # 백오프 상한; 서버가 이보다 오래 기다리라고 하면 재시도하지 않음
+FAILURE_THRESHOLD = 5  # 연속 실패가 이만큼 쌓이면 서비스를 멈춤
+COOLDOWN = 30.0        # 멈추는 시간 (초), 시험 요청이 실패할 때마다 두 배
+MAX_COOLDOWN = 600.0
+
+# 예외 클래스 이름 → 분류 (instaloader / google.api_core / requests를 import하지 않고 판별)
+ERROR_CLASSES = {
+    "TooManyRequestsException": THROTTLED,
+    "ResourceExhausted": THROTTLED,
+    "TooManyRequests": THROTTLED,
+    "ConnectionException": TRANSIENT,
+    "ServiceUnavailable": TRANSIENT,
+    "InternalServerError": TRANSIENT,
+    "DeadlineExceeded": TRANSIENT,
+    "GatewayTimeout": TRANSIENT,
+    "BadGateway": TRANSIENT,
+    "Aborted": TRANSIENT,
+    "ChunkedEncodingError": TRANSIENT,
+    "ConnectionError": TRANSIENT,  # requests.ConnectionError는 내장 ConnectionError가 아님
+    "Timeout": TRANSIENT,
+    "URLError": TRANSIENT,  # urllib 연결 실패 (HTTPError는 상태 코드로 먼저 분류)
+    "QueryReturnedNotFoundException": FATAL,
+    "QueryReturnedForbiddenException": FATAL,
+    "QueryReturnedBadRequestException": FATAL,
+    "LoginRequiredException": FATAL,
+    "PrivateProfileNotFollowedException": FATAL,
+    "BadCredentialsException": FATAL,
+    "InvalidArgument": FATAL,
+    "PermissionDenied": FATAL,
+    "Unauthenticated": FATAL,
+    "NotFound": FATAL,
+    "BlockedPromptException": FATAL,
+    "StopCandidateException": FATAL,
+}
+
+# instaloader는 429를 ConnectionException 메시지로만 알려 주는 경우가 있다
+THROTTLED_MESSAGE_RE = re.compile(r'\b429\b|too many requests|please wait a few minutes|rate.?limit|quota', re.I)
+RETRY_IN_RE = re.compile(r'retry (?:in|after) (\d+(?:\.\d+)?)\s*s', re.I)
+
+
+# ============================================================
+# 오류 분류 / 서버 대기 시간
+# ============================================================
+def status_code(exc: BaseException) -> Optional[int]:
+    """예외에 담긴 HTTP 상태 코드 (google.api_core/urllib의 code, requests의 response.status_code)"""
+    code = getattr(exc, 'code', None)
+    if isinstance(code, int):
+        return code
+    response = getattr(exc, 'response', None)
+    code = getattr(response, 'status_code', None)
+    return code if isinstance(code, int) else None
+
+
+def classify(exc: BaseException) -> str:
+    """throttled / transient / fatal 중 하나 (모르는 예외는 fatal: 같은 요청을 반복하지 않음)
+
+    상태 코드 → 예외 클래스 순으로 판별하고, 메시지는 상태 코드 없이 transient로
+    분류된 연결 오류(instaloader ConnectionException 등)에서만 봅니다. 그래서
+    "quota"가 언급된 403 PermissionDenied는 재시도하지 않고 바로 실패합니다.
+    """
+    code = status_code(exc)
+    if code is not None:
+        if code == 429:
+            return THROTTLED
+        if code >= 500 or code == 408:
+            return TRANSIENT
+        return FATAL
+    kind = next((ERROR_CLASSES[cls.__name__] for cls in type(exc).__mro__ if cls.__name__ in ERROR_CLASSES), None)
+    if kind is None:
+        kind = TRANSIENT if isinstance(exc, (TimeoutError, ConnectionError)) else FATAL
+    if kind == TRANSIENT and THROTTLED_MESSAGE_RE.search(str(exc)):
+        return THROTTLED
+    return kind
+
+
+def retry_after(exc: BaseException) -> Optional[float]:
+    """서버가 알려 준 대기 시간 (초), 없으면 None"""
+    # urllib HTTPError는 exc.headers, requests는 exc.response.headers
+    headers = getattr(exc, 'headers', None) or getattr(getattr(exc, 'response', None), 'headers', None) or {}
+    value = headers.get('Retry-After') if hasattr(headers, 'get') else None
+    if value:
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            try:
+                when = parsedate_to_datetime(value)
+                return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+            except (TypeError, ValueError):
+                pass
+    for detail in getattr(exc, 'details', None) or ():
+        delay = getattr(detail, 'retry_delay', None)
+        if delay is not None:
+            return getattr(delay, 'seconds', 0) + getattr(delay, 'nanos', 0) / 1e9
+    match = RETRY_IN_RE.search(str(exc))
+    return float(match.group(1)) if match else None
+
+
+class RetryError(Exception):
+    """재시도를 다 쓰고도 실패 (원래 예외는 __cause__)"""
+
+    def __init__(self, service: str, kind: str, attempts: int, exc: BaseException):
+        super().__init__(f"{service}: {attempts}회 시도 후 실패 ({kind}): {exc}")
+        self.service = service
+        self.kind = kind
+        self.attempts = attempts
+
+
+# ============================================================
+# 서킷 브레이커
+# ============================================================
+class CircuitBreaker:
+    """연속 실패가 쌓이면 서비스 호출을 잠시 멈추는 스레드 안전 서킷 브레이커
+
+    closed: 정상 / open: open_until까지 모든 호출 대기 / half-open: 시험 요청 하나만 통과
+    """
+
+    def __init__(self, name: str, threshold: int = FAILURE_THRESHOLD,
+                 cooldown: float = COOLDOWN, max_cooldown: float = MAX_COOLDOWN):
+        self.name = name
+        self.threshold = threshold
+        self.base_cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.state = "closed"
+        self.failures = 0
+        self.opened = 0
+        self._cooldown = cooldown
+        self._open_until = 0.0
+        self._probing = False
+        self._cond = threading.Condition()
+
+    def wait(self) -> float:
+        """호출해도 될 때까지 대기, 기다린 시간(초) 반환"""
+        started = time.monotonic()
+        with self._cond:
+            while True:
+                if self.state == "closed":
+                    break
+                if self.state == "open":
+                    remaining = self._open_until - time.monotonic()
+                    if remaining <= 0:
+                        self.state = "half-open"
+                        self._probing = threading.get_ident()
+                        print(f"🔌 {self.name} 시험 요청으로 재개 확인")
+                        break
+                    self._cond.wait(remaining)
+                elif not self._probing:
+                    self._probing = threading.get_ident()
+                    break
+                else:
+                    self._cond.wait()
+        return time.monotonic() - started
+
+    def release_probe(self) -> None:
+        """시험 요청이 성공/실패 기록 없이 끝났을 때 (KeyboardInterrupt 등) 다른 워커에게 넘김"""
+        with self._cond:
+            if self._probing == threading.get_ident():
+                self._probing = False
+                self._cond.notify_all()
+
+    def record_success(self) -> None:
+        with self._cond:
+            self.failures = 0
+            if self.state != "closed":
+                print(f"✅ {self.name} 재개")
+                self.state = "closed"
+                self._cooldown = self.base_cooldown
+                self._probing = False
+                self._cond.notify_all()
+
+    def record_failure(self, hint: Optional[float] = None) -> None:
+        """재시도할 만한 실패 기록 (hint: 서버가 알려 준 대기 시간)"""
+        with self._cond:
+            self.failures += 1
+            if hint:
+                # 서버가 기다리라고 했으면 다른 워커도 함께 그만큼 멈춘다
+                self._open(min(hint, self.max_cooldown))
+            elif self.state == "half-open":
+                self._cooldown = min(self.max_cooldown, self._cooldown * 2)
+                self._open(self._cooldown)
+            elif self.failures >= self.threshold:
+                self._open(self._cooldown)
+
+    def _open(self, duration: float) -> None:
+        until = time.monotonic() + duration
+        if self.state != "open":
+            self.opened += 1
+            print(f"🛑 {self.name} {duration:.1f}초 동안 일시 중지 (연속 실패 {self.failures}회)")
+        self.state = "open"
+        self._open_until = max(self._open_until, until)
+        self._probing = False
+        self._cond.notify_all()
+
+
+# ============================================================
+# 서비스
+# ============================================================
+class Service:
+    """외부 서비스 하나에 대한 재시도 정책 + 서킷 브레이커 (+ 연결된 토큰 버킷)
+
+    limiter가 연결되어 있으면 (배치 처리의 Stage) 모든 시도마다 토큰을 쓰고,
+    429를 받으면 limiter.slow_down(), 성공하면 limiter.speed_up()을 호출한다.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        retries: int = RETRIES,
+        base_delay: float = BASE_DELAY,
+        max_delay: float = MAX_DELAY,
+        breaker: Optional[CircuitBreaker] = None,
+        rng: Optional[random.Random] = None,
+    ):
+        self.name = name
+        self.retries = retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.breaker = breaker or CircuitBreaker(name)
+        self.limiter = None
+        self.rng = rng or random.Random()
+        self.stats = {"calls": 0, "retries": 0, THROTTLED: 0, TRANSIENT: 0, "paused_s": 0.0}
+        self._lock = threading.Lock()
+
+    def delay(self, attempt: int, hint: Optional[float] = None) -> float:
+        """attempt번째 재시도 전 대기 시간 (서버 대기 시간 + jitter, 없으면 equal-jitter 지수 백오프)"""
+        if hint is not None:
+            return hint + self.rng.uniform(0, self.base_delay)
+        ceiling = min(self.max_delay, self.base_delay * 2 ** attempt)
+        return self.rng.uniform(ceiling / 2, ceiling)
+
+    def _count(self, key: str, amount=1) -> None:
+        with self._lock:
+            self.stats[key] += amount
+
+    def call(self, fn, *args, span=None, **kwargs):
+        """fn(*args, **kwargs)를 재시도 정책에 따라 호출"""
+        self._count("calls")
+        attempt = 0
+        while True:
+            paused = self.breaker.wait()
+            if paused:
+                self._count("paused_s", paused)
+                if span is not None:
+                    span.incr("paused_ms", round(paused * 1000))
+            try:
+                if self.limiter is not None:
+                    self.limiter.acquire()
+                result = fn(*args, **kwargs)
+            except Exception as e:
+                kind = classify(e)
+                if kind == FATAL:
+                    # 서비스는 응답했다 (없는 게시물, 잘못된 요청 등)
+                    self.breaker.record_success()
+                    raise
+                hint = retry_after(e)
+                self._count(kind)
+                self.breaker.record_failure(hint)
+                if kind == THROTTLED and self.limiter is not None and self.limiter.slow_down():
+                    print(f"🐢 {self.name} 속도를 {self.limiter.rate:.3g} req/s로 낮춤")
+                if attempt >= self.retries or (hint is not None and hint > self.max_delay):
+                    raise RetryError(self.name, kind, attempt + 1, e) from e
+                wait = self.delay(attempt, hint)
+                attempt += 1
+                self._count("retries")
+                if span is not None:
+                    span.incr("retries")
+                    span.set(retry_kind=kind)
+                print(f"⏳ {self.name} {kind} ({type(e).__name__}), {wait:.1f}초 후 재시도 {attempt}/{self.retries}")
+                time.sleep(wait)
+                continue
+            except BaseException:
+                # 시험 요청을 쥔 채로 빠지면 다른 워커가 half-open에서 영원히 기다린다
+                self.breaker.release_probe()
+                raise
+            self.breaker.record_success()
+            if self.limiter is not None:
+                self.limiter.speed_up()
+            return result
+
+    def format_stats(self) -> str:
+        s = self.stats
+        return (f"{self.name}: 요청 {s['calls']}건, 재시도 {s['retries']}회 "
+                f"(429 {s[THROTTLED]}회, 일시 오류 {s[TRANSIENT]}회), "
+                f"일시 중지 {self.breaker.opened}회 / 대기 {s['paused_s']:.1f}초")
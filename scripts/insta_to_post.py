@@ -10,6 +10,28 @@ Instagram 링크를 파일에서 읽어 Hugo 게시물을 자동 생성합니다
 2. scripts/instagram_links.txt 파일에 Instagram 링크를 한 줄씩 작성
 3. python scripts/insta_to_post.py 실행
 
+배치 옵션:
+    --login USER  `instaloader --login USER`로 저장한 세션 재사용 (INSTAGRAM_USERNAME)
+    --resume      진행 기록(scripts/.state/ledger.jsonl)을 보고 끝난 링크는 건너뛰고 이어서 처리
+    --no-cache    scripts/.cache 캐시를 읽지도 쓰지도 않음
+    --refresh     캐시를 무시하고 새로 받아 캐시를 갱신
+    --batch-size N  Gemini 요청 하나에 게시물 N개를 묶어 요약 (기본 8, 1이면 단건)
+    --workers N   서비스별 동시 요청 수 (기본: Instagram 2, Gemini 4)
+    --rps R       서비스별 초당 요청 수 상한 (기본: Instagram 0.5, Gemini 0.25)
+    --insta-workers / --insta-rps / --gemini-workers / --gemini-rps 로 개별 지정
+    --retries N   Instagram/Gemini 요청당 최대 재시도 횟수 (기본 4, 0이면 재시도 안 함)
+    --near-dup P  거의 같은 캡션(SimHash)이 이미 있을 때: skip(기본, 건너뜀) / reuse(기존 요약 재사용) / off
+    --record FILE Instagram 조회 결과와 Gemini 응답 원문을 녹화 (benchmarks/standin.py로 재생)
+    --trace FILE  단계별 span을 저장할 JSON Lines 파일 (기본: scripts/.state/traces/<실행 시각>.jsonl)
+
+Instagram 조회와 Gemini 요약은 서로 다른 워커 풀에서 파이프라인으로 실행되므로
+전체 소요 시간은 두 단계의 합이 아니라 더 느린 단계에 맞춰집니다.
+content/posts에 이미 embed된 shortcode는 네트워크 요청 전에 건너뛰고, 캡션이 기존 게시물이나
+이번 실행의 다른 캡션과 거의 같으면 요약 요청 전에 걸러냅니다 (insta_index.py).
+429·연결 오류는 서버가 알려 준 대기 시간이나 지수 백오프만큼 기다렸다가 재시도하고,
+실패가 이어지면 서비스 전체를 잠시 멈춥니다 (insta_retry.py).
+실행이 끝나면 단계별 p50/p95/p99 표를 출력합니다 (insta_trace.py).
+
 필요 패키지:
 pip install instaloader google-generativeai python-dotenv
 
@@ -17,24 +39,19 @@ pip install instaloader google-generativeai python-dotenv
 content/posts/제목.md (단일 파일, 폴더 없음)
 """
 
+import argparse
+import json
 import os
 import re
 import sys
-from datetime import datetime
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Optional
 
-try:
-    import instaloader
-except ImportError:
-    print("❌ instaloader 패키지가 필요합니다: pip install instaloader")
-    sys.exit(1)
-
-try:
-    import google.generativeai as genai
-except ImportError:
-    print("❌ google-generativeai 패키지가 필요합니다: pip install google-generativeai")
-    sys.exit(1)
+import frontmatter
 
 try:
     from dotenv import load_dotenv
@@ -42,6 +59,37 @@ except ImportError:
     print("❌ python-dotenv 패키지가 필요합니다: pip install python-dotenv")
     sys.exit(1)
 
+from insta_cache import ImportCache, summary_key
+from insta_cassette import Cassette
+from insta_index import ShortcodeIndex, SimHashIndex, simhash
+from insta_ledger import FAILED, FETCHED, SKIPPED, SUMMARIZED, WRITTEN, Ledger, StageTimer
+from insta_retry import RETRIES, RetryError, Service
+from insta_trace import Tracer
+
+# instaloader와 google-generativeai는 불러오는 데만 수 초가 걸리므로, --help나
+# 링크 파일이 비어 있는 실행에서는 불러오지 않고 ImportSession을 만들 때 불러온다.
+instaloader = None
+genai = None
+
+
+def load_clients() -> None:
+    """instaloader / google-generativeai 지연 import (없으면 설치 안내 후 종료)"""
+    global instaloader, genai
+    if instaloader is None:
+        try:
+            import instaloader as module
+        except ImportError:
+            print("❌ instaloader 패키지가 필요합니다: pip install instaloader")
+            sys.exit(1)
+        instaloader = module
+    if genai is None:
+        try:
+            import google.generativeai as module
+        except ImportError:
+            print("❌ google-generativeai 패키지가 필요합니다: pip install google-generativeai")
+            sys.exit(1)
+        genai = module
+
 # ============================================================
 # 설정
 # ============================================================
@@ -50,6 +98,8 @@ PROJECT_ROOT = SCRIPT_DIR.parent
 CONTENT_DIR = PROJECT_ROOT / "content" / "posts"
 LINKS_FILE = SCRIPT_DIR / "instagram_links.txt"
 ENV_FILE = SCRIPT_DIR / ".env"
+# 게시물 date는 항상 한국 시간(+09:00)으로 기록
+KST = timezone(timedelta(hours=9))
 
 # .env 파일 로드
 load_dotenv(ENV_FILE)
@@ -57,6 +107,132 @@ load_dotenv(ENV_FILE)
 # Gemini 모델 설정
 GEMINI_MODEL = "gemini-2.0-flash"
 
+# Instagram 로그인 세션 (선택)
+# `instaloader --login USER`로 저장한 세션 파일을 재사용하면 비로그인 조회보다 429가 훨씬 적다.
+INSTAGRAM_USERNAME = os.environ.get('INSTAGRAM_USERNAME')
+INSTAGRAM_SESSION_FILE = os.environ.get('INSTAGRAM_SESSION_FILE')
+
+# 배치 처리 기본값 (서비스별 동시 요청 수 / 초당 요청 수)
+# Instagram은 비로그인 조회에 민감하게 429를 돌려주므로 보수적으로 잡는다.
+INSTAGRAM_WORKERS = 2
+INSTAGRAM_RPS = 0.5
+GEMINI_WORKERS = 4
+GEMINI_RPS = 0.25  # 무료 등급 15 RPM
+GEMINI_BATCH_SIZE = 8  # 한 번의 요약 요청에 묶을 게시물 수 (1이면 단건 요청)
+NEAR_DUP_POLICIES = ("skip", "reuse", "off")  # 거의 같은 캡션 처리 방식 (기본: skip)
+
+
+# ============================================================
+# 실행 세션
+# ============================================================
+class ImportSession:
+    """한 번의 실행 동안 재사용하는 외부 서비스 클라이언트 묶음
+
+    Instaloader 컨텍스트(HTTP 커넥션 풀, 로그인 쿠키 포함)와 Gemini 모델을
+    실행 시작 시 한 번만 만들고 모든 단계에 전달한다. 게시물마다 새로 만들면
+    매번 Instagram 핸드셰이크가 다시 일어나 429의 주된 원인이 된다.
+    서비스별 재시도 정책과 서킷 브레이커(instagram, gemini)도 실행 동안 공유한다.
+
+    외부 서비스와 닿는 곳은 _connect()와 fetch_post(), self.model.generate_content
+    뿐이므로, 부하 테스트(benchmarks/standin.py)는 이 둘을 바꾼 하위 클래스로
+    로컬 대역 서버를 쓴다. cassette가 있으면 조회/응답 원문을 녹화한다.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        username: Optional[str] = INSTAGRAM_USERNAME,
+        session_file: Optional[str] = INSTAGRAM_SESSION_FILE,
+        pool_size: int = INSTAGRAM_WORKERS,
+        cache: Optional[ImportCache] = None,
+        tracer: Optional[Tracer] = None,
+        retries: int = RETRIES,
+        cassette: Optional[Cassette] = None,
+    ):
+        self.cache = cache or ImportCache(read=False, write=False)
+        self.tracer = tracer or Tracer()
+        self.cassette = cassette
+        self.instagram = Service("instagram", retries=retries)
+        self.gemini = Service("gemini", retries=retries)
+        self._duplicates = None
+        self._connect(api_key, username, session_file, pool_size)
+
+    def _connect(self, api_key: str, username: Optional[str], session_file: Optional[str], pool_size: int) -> None:
+        """Instaloader / Gemini 클라이언트 생성"""
+        load_clients()
+        # 최소한의 요청만 하도록 설정 (재시도는 instaloader 대신 self.instagram이 담당)
+        self.loader = instaloader.Instaloader(
+            max_connection_attempts=1,
+            download_pictures=False,
+            download_videos=False,
+            download_video_thumbnails=False,
+            download_geotags=False,
+            download_comments=False,
+            save_metadata=False,
+            compress_json=False,
+        )
+        self.username = None
+        if username:
+            try:
+                self.loader.load_session_from_file(username, session_file)
+                self.username = username
+            except FileNotFoundError:
+                print(f"⚠️ Instagram 세션 파일 없음, 비로그인으로 진행: {session_file or username}")
+        self._resize_pool(pool_size)
+
+        genai.configure(api_key=api_key)
+        self.model = genai.GenerativeModel(GEMINI_MODEL)
+
+    @property
+    def context(self):
+        return self.loader.context
+
+    def near_duplicates(self, index: Optional[ShortcodeIndex], policy: str) -> "NearDuplicates":
+        """실행 동안 공유하는 캡션 중복 검사기 (앞서 본 캡션을 링크마다 잊지 않도록)"""
+        current = self._duplicates
+        if current is None or current.index is not index or current.policy != policy:
+            current = self._duplicates = NearDuplicates(index, policy)
+        return current
+
+    def _resize_pool(self, pool_size: int) -> None:
+        """워커 수만큼 커넥션을 유지하도록 requests 커넥션 풀 크기 조정"""
+        http = getattr(self.loader.context, '_session', None)
+        if http is None:
+            return
+        from requests.adapters import HTTPAdapter
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(1, pool_size))
+        http.mount('https://', adapter)
+
+    def fetch_post(self, shortcode: str) -> tuple:
+        """Instagram에서 (caption, date_local) 조회 (캐시/재시도 없이 요청 한 번)"""
+        post = instaloader.Post.from_shortcode(self.context, shortcode)
+        return post.caption or "", post.date_local
+
+    def record_post(self, shortcode: str, caption: str, post_date: datetime) -> None:
+        if self.cassette is not None:
+            self.cassette.record_post(shortcode, caption, post_date)
+
+    def record_response(self, prompt: str, response) -> None:
+        if self.cassette is None:
+            return
+        try:
+            text = response.text
+        except ValueError:  # 차단된 응답 등 본문이 없는 경우
+            return
+        self.cassette.record_response(prompt, text, usage_tokens(response))
+
+    def close(self) -> None:
+        self.loader.close()
+        self.cache.close()
+        if self.cassette is not None:
+            self.cassette.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
 
 # ============================================================
 # Instagram 데이터 추출
@@ -74,23 +250,23 @@ def extract_shortcode(url: str) -> Optional[str]:
     return None
 
 
+def fetch_instagram_post(shortcode: str, session: ImportSession) -> tuple:
+    """Instagram에서 캡션과 게시일 조회 (caption, date_local)"""
+    with session.tracer.span("instagram.fetch", shortcode=shortcode) as span:
+        cached = session.cache.get_post(shortcode)
+        if cached:
+            span.set(cache_hit=True)
+            return cached
+        caption, post_date = session.instagram.call(session.fetch_post, shortcode, span=span)
+        session.record_post(shortcode, caption, post_date)
+        session.cache.put_post(shortcode, caption, post_date)
+        return caption, post_date
+
+
 # ============================================================
 # AI 요약 생성
 # ============================================================
-def generate_ai_summary(caption: str, api_key: str) -> dict:
-    """Gemini API로 AI 요약, 태그, mentions 생성"""
-    genai.configure(api_key=api_key)
-    model = genai.GenerativeModel(GEMINI_MODEL)
-    
-    prompt = f"""당신은 철학적 블로그 "The Logos"의 편집자입니다.
-다음 Instagram 게시물을 분석하여 블로그 게시물 메타데이터를 생성해주세요.
-
-## 게시물 원문:
-\"\"\"
-{caption}
-\"\"\"
-
-## 좋은 예시 (참고):
+SUMMARY_GUIDE = """## 좋은 예시 (참고):
 - 제목: "썰물" (간결하고 핵심 주제를 나타냄)
 - 요약: "힘의 정의는 변화를 일으키는 원인이다. 생명은 엔트로피를 역행해 질서를 만든다."
 - 태그: ["바다", "썰물", "질서", "생명", "엔트로피"]
@@ -101,7 +277,22 @@ def generate_ai_summary(caption: str, api_key: str) -> dict:
 2. **summary**: 글의 철학적 메시지를 1-3문장으로 요약 (단순 축약이 아닌 핵심 통찰)
 3. **tags**: 글의 주요 개념/키워드 3-5개 (한국어, 해시태그 기호 없이)
 4. **mentions**: 관련 학술 용어나 개념 3-5개 (영어)
-5. **category**: religion, philosophy, engineering, writing 중 하나
+5. **category**: religion, philosophy, engineering, writing 중 하나"""
+
+SUMMARY_CATEGORIES = {"religion", "philosophy", "engineering", "writing"}
+
+
+def build_summary_prompt(caption: str) -> str:
+    """요약 요청 프롬프트 (캐시 키의 기준이 되므로 결정적이어야 함)"""
+    return f"""당신은 철학적 블로그 "The Logos"의 편집자입니다.
+다음 Instagram 게시물을 분석하여 블로그 게시물 메타데이터를 생성해주세요.
+
+## 게시물 원문:
+\"\"\"
+{caption}
+\"\"\"
+
+{SUMMARY_GUIDE}
 
 ## 응답 형식 (JSON만):
 {{
@@ -112,21 +303,136 @@ def generate_ai_summary(caption: str, api_key: str) -> dict:
     "category": "category_name"
 }}"""
 
+
+def build_batch_prompt(items: list) -> str:
+    """여러 게시물을 한 번에 요약하는 프롬프트 (items: [(shortcode, caption), ...])
+
+    고정 지침/예시 블록은 한 번만 보내고 게시물만 배열로 나열한다.
+    """
+    posts = json.dumps(
+        [{"shortcode": shortcode, "caption": caption} for shortcode, caption in items],
+        ensure_ascii=False,
+        indent=1,
+    )
+    return f"""당신은 철학적 블로그 "The Logos"의 편집자입니다.
+다음 Instagram 게시물 {len(items)}개를 각각 따로 분석하여 게시물마다 블로그 게시물 메타데이터를 생성해주세요.
+
+## 게시물 원문 (JSON 배열, shortcode로 구분):
+{posts}
+
+{SUMMARY_GUIDE}
+
+## 응답 형식 (JSON 배열만, 입력 게시물마다 하나씩, shortcode는 입력과 동일하게):
+[
+    {{
+        "shortcode": "입력의 shortcode",
+        "title": "철학적 제목",
+        "summary": "핵심 메시지 요약",
+        "tags": ["태그1", "태그2", "태그3"],
+        "mentions": ["Concept1", "Concept2"],
+        "category": "category_name"
+    }}
+]"""
+
+
+def parse_model_json(text: str):
+    """모델 응답에서 코드 펜스를 벗기고 JSON 파싱"""
+    text = text.strip()
+    if text.startswith("```"):
+        text = re.sub(r'^```json?\s*', '', text)
+        text = re.sub(r'\s*```$', '', text)
+    return json.loads(text)
+
+
+def usage_tokens(response) -> dict:
+    """응답의 usage_metadata에서 토큰 수 추출 (없으면 빈 dict)"""
+    usage = getattr(response, 'usage_metadata', None)
+    if usage is None:
+        return {}
+    return {
+        'prompt_tokens': getattr(usage, 'prompt_token_count', 0) or 0,
+        'output_tokens': getattr(usage, 'candidates_token_count', 0) or 0,
+        'total_tokens': getattr(usage, 'total_token_count', 0) or 0,
+    }
+
+
+def parse_response(response, session: ImportSession, validate=None):
+    """응답 JSON 파싱 + validate 검증 (gemini.parse span으로 기록, 검증에 실패하면 None)"""
+    with session.tracer.span("gemini.parse") as span:
+        text = response.text
+        span.set(fenced=text.lstrip().startswith("```"), chars=len(text), valid=False)
+        parsed = parse_model_json(text)
+        if validate is not None:
+            parsed = validate(parsed)
+        span.set(valid=parsed is not None)
+        return parsed
+
+
+def validate_summary(item) -> Optional[dict]:
+    """title/summary/tags/mentions/category 스키마 검증, 통과하면 정리된 dict 반환"""
+    if not isinstance(item, dict):
+        return None
+    title = item.get('title')
+    summary = item.get('summary')
+    tags = item.get('tags')
+    mentions = item.get('mentions')
+    category = item.get('category')
+    if not isinstance(title, str) or not isinstance(summary, str):
+        return None
+    if not isinstance(tags, list) or not all(isinstance(t, str) for t in tags):
+        return None
+    if not isinstance(mentions, list) or not all(isinstance(m, str) for m in mentions):
+        return None
+    if category not in SUMMARY_CATEGORIES:
+        return None
+    title = re.sub(r'#', '', title).strip()
+    if not title:
+        return None
+    return {
+        'title': title,
+        'summary': summary.strip(),
+        'tags': tags,
+        'mentions': mentions,
+        'category': category,
+    }
+
+
+def cached_ai_summary(caption: str, session: ImportSession) -> Optional[dict]:
+    """같은 프롬프트·모델로 만든 요약이 캐시에 있으면 반환"""
+    return session.cache.get_summary(summary_key(build_summary_prompt(caption), GEMINI_MODEL))
+
+
+def generate_ai_summary(caption: str, session: ImportSession, shortcode: Optional[str] = None) -> dict:
+    """Gemini API로 AI 요약, 태그, mentions 생성"""
+    with session.tracer.span("gemini.summary", shortcode=shortcode) as span:
+        return _generate_ai_summary(caption, session, span)
+
+
+def _generate_ai_summary(caption: str, session: ImportSession, span) -> dict:
+    prompt = build_summary_prompt(caption)
+    key = summary_key(prompt, GEMINI_MODEL)
+    cached = session.cache.get_summary(key)
+    if cached:
+        span.set(cache_hit=True)
+        return cached
+
     try:
-        response = model.generate_content(prompt)
-        text = response.text.strip()
-        
-        import json
-        if text.startswith("```"):
-            text = re.sub(r'^```json?\s*', '', text)
-            text = re.sub(r'\s*```$', '', text)
-        
-        result = json.loads(text)
-        result['title'] = re.sub(r'#', '', result['title']).strip()
+        response = session.gemini.call(session.model.generate_content, prompt, span=span)
+        session.record_response(prompt, response)
+        span.set(**usage_tokens(response))
+        result = parse_response(response, session, validate_summary)
+        if result is None:
+            raise ValueError("응답이 요약 스키마와 맞지 않음")
+        # 실패 시 기본값은 캐시하지 않는다 (다음 실행에서 다시 시도)
+        session.cache.put_summary(key, result)
         return result
-        
+
+    except RetryError:
+        # 429/일시 오류가 계속되면 기본값으로 채우지 않고 실패로 남긴다 (--resume으로 재시도)
+        raise
     except Exception as e:
         print(f"⚠️ AI 요약 생성 실패, 기본값 사용: {e}")
+        span.set(fallback=type(e).__name__)
         clean_first = re.sub(r'#\S+', '', caption.split('\n')[0]).strip()[:20] if caption else "기록"
         return {
             'title': clean_first or "기록",
@@ -137,6 +443,51 @@ def generate_ai_summary(caption: str, api_key: str) -> dict:
         }
 
 
+def generate_ai_summary_batch(items: list, session: ImportSession) -> dict:
+    """여러 게시물을 한 번의 Gemini 요청으로 요약 (items: [(shortcode, caption), ...])
+
+    스키마 검증을 통과한 항목만 {shortcode: 결과}로 반환한다. 응답에서 빠졌거나
+    검증에 실패한 항목은 호출자가 generate_ai_summary로 단건 재요청한다.
+    결과는 단건 프롬프트 기준 키로 캐시하므로 두 방식이 캐시를 공유한다.
+    """
+    with session.tracer.span("gemini.batch", items=len(items)) as span:
+        results = _generate_ai_summary_batch(items, session, span)
+        span.set(returned=len(results))
+        return results
+
+
+def _generate_ai_summary_batch(items: list, session: ImportSession, span) -> dict:
+    captions = dict(items)
+    results = {}
+    prompt = build_batch_prompt(items)
+    try:
+        response = session.gemini.call(session.model.generate_content, prompt, span=span)
+        session.record_response(prompt, response)
+        span.set(**usage_tokens(response))
+        parsed = parse_response(response, session, lambda value: value if isinstance(value, list) else None)
+        if parsed is None:
+            raise ValueError("응답이 JSON 배열이 아님")
+    except RetryError:
+        # 서비스가 계속 거절하는 동안 단건 요청으로 나누면 요청 수만 늘어난다
+        raise
+    except Exception as e:
+        print(f"⚠️ 배치 AI 요약 실패 ({len(items)}건), 단건 요청으로 전환: {e}")
+        span.set(fallback=type(e).__name__)
+        return results
+
+    for element in parsed:
+        shortcode = element.get('shortcode') if isinstance(element, dict) else None
+        if shortcode not in captions or shortcode in results:
+            continue
+        result = validate_summary(element)
+        if result is None:
+            continue
+        results[shortcode] = result
+        key = summary_key(build_summary_prompt(captions[shortcode]), GEMINI_MODEL)
+        session.cache.put_summary(key, result)
+    return results
+
+
 # ============================================================
 # Hugo 게시물 생성
 # ============================================================
@@ -148,11 +499,9 @@ def create_hugo_post(
     mentions: list,
     summary: str,
     caption: str,
+    file_stem: Optional[str] = None,
 ) -> Path:
-    """Hugo 마크다운 게시물 생성 (Instagram embed 사용)"""
-    
-    tags_str = ', '.join(f'"{tag}"' for tag in tags)
-    mentions_str = ', '.join(f'"{m}"' for m in mentions)
+    """Hugo 마크다운 게시물 생성 (Instagram embed 사용, 파일명은 file_stem이 없으면 제목)"""
     
     # 해시태그 제거한 캡션
     clean_caption = re.sub(r'#\S+', '', caption).strip()
@@ -160,14 +509,17 @@ def create_hugo_post(
     clean_caption = re.sub(r'\n{3,}', '\n\n', clean_caption)
     
     # Instagram 게시물은 항상 writing 카테고리
+    # 제목/태그에 따옴표나 역슬래시가 있어도 TOML이 깨지지 않도록 공용 직렬화 사용
+    front_matter = frontmatter.dumps_toml({
+        'title': title,
+        'date': post_date.replace(tzinfo=KST, microsecond=0),
+        'draft': False,
+        'categories': ['writing'],
+        'tags': tags,
+        'mentions': mentions,
+    })
     content = f'''+++
-title = "{title}"
-date = {post_date.strftime("%Y-%m-%dT%H:%M:%S+09:00")}
-draft = false
-categories = ["writing"]
-tags = [{tags_str}]
-mentions = [{mentions_str}]
-+++
+{front_matter}+++
 {{{{< instagram {shortcode} >}}}}
 
 {{{{< ai_summary >}}}}
@@ -178,7 +530,7 @@ mentions = [{mentions_str}]
 '''
     
     # 파일명 생성 (특수문자 제거)
-    safe_title = re.sub(r'[<>:"/\\|?*]', '', title)
+    safe_title = re.sub(r'[<>:"/\\|?*]', '', file_stem or title)
     md_path = CONTENT_DIR / f"{safe_title}.md"
     
     # 중복 확인
@@ -190,73 +542,472 @@ mentions = [{mentions_str}]
     return md_path
 
 
+# ============================================================
+# 거의 같은 캡션 검사
+# ============================================================
+class NearDuplicates:
+    """요약 요청 전 캡션 중복 검사 (기존 게시물 본문 + 이번 실행에서 먼저 본 캡션)
+
+    policy가 skip이면 거의 같은 캡션을 건너뛰고, reuse면 짝이 되는 게시물/캡션의
+    요약을 재사용한다 (재사용할 요약이 없으면 평소처럼 요약 요청).
+    """
+
+    def __init__(self, index: Optional[ShortcodeIndex], policy: str = "skip"):
+        self.index = index
+        self.policy = policy
+        self.seen = SimHashIndex()
+        self.results = {}
+        self._lock = threading.Lock()
+
+    def check(self, shortcode: str, caption: str, session: ImportSession) -> Optional[tuple]:
+        """거의 같은 글이 있으면 (설명, 재사용할 요약 또는 None)"""
+        if self.policy == "off":
+            return None
+        with session.tracer.span("near_duplicate", shortcode=shortcode) as span:
+            fingerprint = simhash(caption)
+            if fingerprint is None:
+                return None
+            found = self.index.near_duplicate(fingerprint) if self.index is not None else None
+            if found:
+                key, distance = found
+                span.set(match=key, distance=distance)
+                return f"게시물 {key} (해밍 거리 {distance})", self._existing_summary(key)
+            with self._lock:
+                found = self.seen.find(fingerprint)
+                if not found:
+                    self.seen.add(fingerprint, shortcode)
+                    return None
+                other, distance = found
+                reused = self.results.get(other) if self.policy == "reuse" else None
+            span.set(match=other, distance=distance)
+            return f"[{other}] (해밍 거리 {distance})", reused
+
+    def _existing_summary(self, key: str) -> Optional[dict]:
+        if self.policy != "reuse":
+            return None
+        try:
+            return validate_summary(self.index.summary_of(key))
+        except (ImportError, ValueError) as e:
+            print(f"⚠️ 기존 게시물 요약을 읽지 못함 ({key}): {e}")
+            return None
+
+    def remember(self, shortcode: str, ai_result: dict) -> None:
+        with self._lock:
+            self.results[shortcode] = ai_result
+
+
 # ============================================================
 # 메인 로직
 # ============================================================
-def process_instagram_link(url: str, api_key: str) -> bool:
+def traced_shortcode(url: str, session: ImportSession) -> Optional[str]:
+    """extract_shortcode + extract_shortcode span"""
+    with session.tracer.span("extract_shortcode") as span:
+        shortcode = extract_shortcode(url)
+        span.set(shortcode=shortcode)
+        return shortcode
+
+
+def traced_write(session: ImportSession, shortcode: str, post_date: datetime, caption: str, ai_result: dict,
+                 reused: bool = False):
+    """create_hugo_post + write span (이미 있는 파일이면 skipped=True)
+
+    reused면 요약을 가져온 게시물과 제목이 같으므로 파일명 뒤에 shortcode를 붙인다.
+    """
+    with session.tracer.span("write", shortcode=shortcode) as span:
+        md_path = create_hugo_post(
+            title=ai_result['title'],
+            shortcode=shortcode,
+            post_date=post_date,
+            tags=ai_result['tags'],
+            mentions=ai_result['mentions'],
+            summary=ai_result['summary'],
+            caption=caption,
+            file_stem=f"{ai_result['title']}-{shortcode}" if reused else None,
+        )
+        span.set(skipped=md_path is None, reused=reused)
+        return md_path
+
+
+def process_instagram_link(
+    url: str,
+    session: ImportSession,
+    index: Optional[ShortcodeIndex] = None,
+    near_dup: str = "skip",
+) -> bool:
     """단일 Instagram 링크 처리"""
     
     print(f"\n{'='*50}")
     print(f"📷 처리 중: {url}")
     
     # 1. Shortcode 추출
-    shortcode = extract_shortcode(url)
+    shortcode = traced_shortcode(url, session)
     if not shortcode:
         print(f"❌ 유효하지 않은 Instagram URL: {url}")
         return False
     
     print(f"   Shortcode: {shortcode}")
+    if index is not None and shortcode in index:
+        print(f"⏭️ 이미 게시됨: {index.get(shortcode)}")
+        return False
     
     # 2. Instagram에서 캡션과 날짜 가져오기
-    # 최소한의 요청만 하도록 설정
-    L = instaloader.Instaloader(
-        download_pictures=False,
-        download_videos=False,
-        download_video_thumbnails=False,
-        download_geotags=False,
-        download_comments=False,
-        save_metadata=False,
-        compress_json=False,
-    )
     try:
-        post = instaloader.Post.from_shortcode(L.context, shortcode)
-        caption = post.caption or ""
-        post_date = post.date_local
+        caption, post_date = fetch_instagram_post(shortcode, session)
         print(f"   📅 게시일: {post_date.strftime('%Y-%m-%d')}")
     except Exception as e:
         print(f"❌ 포스트 정보 가져오기 실패: {e}")
         return False
     
-    # 3. AI 요약 생성
-    print("   🤖 AI 요약 생성 중...")
-    ai_result = generate_ai_summary(caption, api_key)
+    # 3. AI 요약 생성 (거의 같은 캡션이 이미 있으면 건너뛰거나 기존 요약 재사용)
+    duplicates = session.near_duplicates(index, near_dup)
+    duplicate = duplicates.check(shortcode, caption, session)
+    reused = bool(duplicate and duplicate[1])
+    if reused:
+        print(f"   ♻️ {duplicate[0]}와 거의 같은 캡션, 요약 재사용")
+        ai_result = duplicate[1]
+    elif duplicate and near_dup == "skip":
+        print(f"⏭️ {duplicate[0]}와 거의 같은 캡션, 건너뜀")
+        return False
+    else:
+        print("   🤖 AI 요약 생성 중...")
+        try:
+            ai_result = generate_ai_summary(caption, session, shortcode)
+        except RetryError as e:
+            print(f"❌ AI 요약 생성 실패: {e}")
+            return False
+    duplicates.remember(shortcode, ai_result)
     title = ai_result['title']
     print(f"   📝 제목: {title}")
     
     # 4. Hugo 게시물 생성
-    md_path = create_hugo_post(
-        title=title,
-        shortcode=shortcode,
-        post_date=post_date,
-        tags=ai_result['tags'],
-        mentions=ai_result['mentions'],
-        summary=ai_result['summary'],
-        caption=caption,
-    )
+    md_path = traced_write(session, shortcode, post_date, caption, ai_result, reused)
     
     if md_path:
         print(f"   ✅ 완료: {md_path.relative_to(PROJECT_ROOT)}")
+        if index is not None:
+            index.add(md_path)
         return True
     return False
 
 
-def main():
+# ============================================================
+# 배치 처리 엔진
+# ============================================================
+class TokenBucket:
+    """초당 rate개씩 토큰이 채워지는 스레드 안전 토큰 버킷 (rate <= 0이면 무제한)
+
+    429를 받으면 slow_down()으로 속도를 절반까지 줄이고(최저 max_rate/16),
+    성공할 때마다 speed_up()으로 max_rate의 5%씩 되돌린다.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.max_rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """토큰 하나를 얻을 때까지 대기"""
+        if self.rate <= 0:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                delay = (1 - self._tokens) / self.rate
+            time.sleep(delay)
+
+    def slow_down(self) -> bool:
+        """속도를 절반으로 (이미 최저 속도거나 무제한이면 False)"""
+        with self._lock:
+            floor = self.max_rate / 16
+            if self.max_rate <= 0 or self.rate <= floor:
+                return False
+            self.rate = max(floor, self.rate / 2)
+            return True
+
+    def speed_up(self) -> None:
+        with self._lock:
+            if self.rate < self.max_rate:
+                self.rate = min(self.max_rate, self.rate + self.max_rate * 0.05)
+
+
+class Stage:
+    """외부 서비스 하나에 대한 호출 단계 (전용 워커 풀 + 토큰 버킷)
+
+    service가 주어지면 토큰 버킷을 service에 연결해 실제 요청(재시도 포함)마다
+    토큰을 쓰게 하고, 캐시 적중처럼 요청이 없는 호출은 속도 제한을 받지 않는다.
+    """
+
+    def __init__(self, name: str, workers: int, rps: float, service: Optional[Service] = None):
+        self.name = name
+        self.bucket = TokenBucket(rps)
+        self.service = service
+        if service is not None:
+            service.limiter = self.bucket
+        self._executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix=name)
+
+    def submit(self, fn, *args, **kwargs):
+        def run():
+            if self.service is None:
+                self.bucket.acquire()
+            return fn(*args, **kwargs)
+        return self._executor.submit(run)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        if self.service is not None:
+            self.service.limiter = None
+
+
+def completed(value) -> Future:
+    """이미 끝난 Future (캐시 적중 시 워커 풀과 속도 제한을 건너뛰는 데 사용)"""
+    future = Future()
+    future.set_result(value)
+    return future
+
+
+def run_batch(
+    links: list,
+    session: ImportSession,
+    insta_workers: int = INSTAGRAM_WORKERS,
+    insta_rps: float = INSTAGRAM_RPS,
+    gemini_workers: int = GEMINI_WORKERS,
+    gemini_rps: float = GEMINI_RPS,
+    batch_size: int = GEMINI_BATCH_SIZE,
+    ledger: Optional[Ledger] = None,
+    resume: bool = False,
+    index: Optional[ShortcodeIndex] = None,
+    near_dup: str = "skip",
+) -> list:
+    """Instagram 조회 → Gemini 요약 → 파일 생성을 파이프라인으로 실행
+
+    조회가 끝난 링크는 곧바로 요약 단계로 넘어가므로 두 서비스가 동시에 일한다.
+    batch_size가 2 이상이면 조회된 게시물을 모아 한 번의 요청으로 요약하고,
+    배치 응답에서 빠지거나 검증에 실패한 게시물만 단건 요청으로 다시 보낸다.
+    파일 생성은 제목 중복 검사가 경쟁하지 않도록 메인 스레드에서만 수행한다.
+    캐시에 있는 항목은 토큰을 쓰지 않고 바로 다음 단계로 넘어간다.
+    ledger가 있으면 단계가 끝날 때마다 기록하고, resume이면 마지막으로 기록된
+    단계 다음부터 이어서 처리한다 (written은 건너뜀).
+    index가 있으면 이미 게시된 shortcode는 조회 전에 건너뛰고, 새 게시물은 색인에 추가한다.
+    링크 목록 안에서 같은 shortcode가 반복되면 처음 것만 처리한다.
+    요약 전에 캡션 SimHash로 거의 같은 게시물/캡션을 찾아 near_dup 방식대로 처리한다.
+    성공한 링크(원문 URL) 목록을 반환한다.
+    """
+    succeeded = []
+    seen = set()
+    duplicates = session.near_duplicates(index, near_dup)
+    timer = StageTimer()
+
+    def log(shortcode, state, **fields):
+        if ledger:
+            ledger.record(shortcode, state, elapsed=timer.lap(shortcode), **fields)
+
+    with Stage("instagram", insta_workers, insta_rps, session.instagram) as fetch_stage, \
+            Stage("gemini", gemini_workers, gemini_rps, session.gemini) as summary_stage:
+        pending = {}
+        buffer = []  # 배치 요약 대기 중인 (url, shortcode, caption, post_date)
+
+        def summarize_one(entry):
+            url, shortcode, caption, post_date = entry
+            cached = cached_ai_summary(caption, session)
+            if cached:
+                future = completed(cached)
+            else:
+                future = summary_stage.submit(generate_ai_summary, caption, session, shortcode)
+            pending[future] = ("summary", entry)
+
+        def flush():
+            batch = buffer[:]
+            buffer.clear()
+            if len(batch) == 1:
+                summarize_one(batch[0])
+                return
+            items = [(shortcode, caption) for _, shortcode, caption, _ in batch]
+            future = summary_stage.submit(generate_ai_summary_batch, items, session)
+            pending[future] = ("batch", batch)
+
+        def summarized(entry, ai_result, reused=False):
+            url, shortcode, caption, post_date = entry
+            log(shortcode, SUMMARIZED, url=url, caption=caption,
+                date_local=post_date.isoformat(), result=ai_result, reused=reused)
+            duplicates.remember(shortcode, ai_result)
+            write(entry, ai_result, reused)
+
+        def write(entry, ai_result, reused=False):
+            url, shortcode, caption, post_date = entry
+            md_path = traced_write(session, shortcode, post_date, caption, ai_result, reused)
+            if md_path:
+                print(f"✅ [{shortcode}] {md_path.relative_to(PROJECT_ROOT)}")
+                log(shortcode, WRITTEN, url=url, path=md_path.relative_to(PROJECT_ROOT).as_posix())
+                succeeded.append(url)
+                if index is not None:
+                    index.add(md_path)
+            else:
+                log(shortcode, FAILED, url=url, stage="write", error="이미 존재하는 파일")
+
+        def queue_summary(entry):
+            url, shortcode, caption, _ = entry
+            duplicate = duplicates.check(shortcode, caption, session)
+            if duplicate and duplicate[1]:
+                print(f"♻️ [{shortcode}] {duplicate[0]}와 거의 같은 캡션, 요약 재사용")
+                summarized(entry, duplicate[1], reused=True)
+                return
+            if duplicate and near_dup == "skip":
+                print(f"⏭️ [{shortcode}] {duplicate[0]}와 거의 같은 캡션, 건너뜀")
+                log(shortcode, SKIPPED, url=url, reason="near-duplicate", match=duplicate[0])
+                return
+            cached = cached_ai_summary(caption, session)
+            if cached:
+                summarized(entry, cached)
+            elif batch_size > 1:
+                buffer.append(entry)
+                if len(buffer) >= batch_size:
+                    flush()
+            else:
+                summarize_one(entry)
+
+        for url in links:
+            shortcode = traced_shortcode(url, session)
+            if not shortcode:
+                print(f"❌ 유효하지 않은 Instagram URL: {url}")
+                continue
+            if shortcode in seen:
+                print(f"⏭️ [{shortcode}] 링크 파일에 중복된 링크: {url}")
+                continue
+            seen.add(shortcode)
+            if index is not None and shortcode in index:
+                print(f"⏭️ [{shortcode}] 이미 게시됨: {index.get(shortcode)}")
+                continue
+            timer.start(shortcode)
+
+            record = ledger.get(shortcode) if (ledger and resume) else None
+            if record and record['state'] == WRITTEN:
+                print(f"⏭️ [{shortcode}] 이미 완료됨: {record.get('path')}")
+                continue
+            if record and record['state'] == SKIPPED and near_dup == "skip":
+                print(f"⏭️ [{shortcode}] 지난 실행에서 건너뜀: {record.get('match')}와 거의 같은 캡션")
+                continue
+            if record and record['state'] in (FETCHED, SUMMARIZED):
+                entry = (url, shortcode, record['caption'], datetime.fromisoformat(record['date_local']))
+                if record['state'] == SUMMARIZED:
+                    write(entry, record['result'], record.get('reused', False))
+                else:
+                    queue_summary(entry)
+                continue
+
+            cached = session.cache.get_post(shortcode)
+            if cached:
+                future = completed(cached)
+            else:
+                future = fetch_stage.submit(fetch_instagram_post, shortcode, session)
+            pending[future] = ("fetch", (url, shortcode))
+
+        while pending or buffer:
+            # 더 들어올 조회 결과가 없으면 남은 배치를 바로 보낸다
+            if buffer and not any(step == "fetch" for step, _ in pending.values()):
+                flush()
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                step, payload = pending.pop(future)
+
+                if step == "fetch":
+                    url, shortcode = payload
+                    try:
+                        caption, post_date = future.result()
+                    except Exception as e:
+                        print(f"❌ [{shortcode}] 포스트 정보 가져오기 실패: {e}")
+                        log(shortcode, FAILED, url=url, stage="fetch", error=str(e))
+                        continue
+                    print(f"📷 [{shortcode}] 게시일: {post_date.strftime('%Y-%m-%d')}, AI 요약 대기")
+                    log(shortcode, FETCHED, url=url, caption=caption, date_local=post_date.isoformat())
+                    queue_summary((url, shortcode, caption, post_date))
+
+                elif step == "batch":
+                    try:
+                        results = future.result()
+                    except RetryError as e:
+                        print(f"❌ 배치 AI 요약 실패 ({len(payload)}건): {e}")
+                        for url, shortcode, _, _ in payload:
+                            log(shortcode, FAILED, url=url, stage="summary", error=str(e))
+                        continue
+                    for entry in payload:
+                        if entry[1] in results:
+                            summarized(entry, results[entry[1]])
+                        else:
+                            summarize_one(entry)
+
+                else:
+                    try:
+                        ai_result = future.result()
+                    except RetryError as e:
+                        print(f"❌ [{payload[1]}] AI 요약 실패: {e}")
+                        log(payload[1], FAILED, url=payload[0], stage="summary", error=str(e))
+                        continue
+                    summarized(payload, ai_result)
+    return succeeded
+
+
+def parse_args(argv: Optional[list] = None) -> argparse.Namespace:
+    """명령행 인자 파싱"""
+    parser = argparse.ArgumentParser(description="Instagram 링크로 Hugo 게시물 생성")
+    parser.add_argument("--workers", type=int, help="서비스별 동시 요청 수 (두 서비스 공통)")
+    parser.add_argument("--rps", type=float, help="서비스별 초당 요청 수 상한 (두 서비스 공통, 0이면 무제한)")
+    parser.add_argument("--insta-workers", type=int, help=f"Instagram 동시 요청 수 (기본 {INSTAGRAM_WORKERS})")
+    parser.add_argument("--insta-rps", type=float, help=f"Instagram 초당 요청 수 (기본 {INSTAGRAM_RPS})")
+    parser.add_argument("--gemini-workers", type=int, help=f"Gemini 동시 요청 수 (기본 {GEMINI_WORKERS})")
+    parser.add_argument("--gemini-rps", type=float, help=f"Gemini 초당 요청 수 (기본 {GEMINI_RPS})")
+    cache = parser.add_mutually_exclusive_group()
+    cache.add_argument("--no-cache", action="store_true", help="scripts/.cache 캐시를 사용하지 않음")
+    cache.add_argument("--refresh", action="store_true", help="캐시를 읽지 않고 새로 받아 갱신")
+    parser.add_argument("--batch-size", type=int, default=GEMINI_BATCH_SIZE,
+                        help=f"Gemini 요청 하나에 묶을 게시물 수 (기본 {GEMINI_BATCH_SIZE}, 1이면 단건)")
+    parser.add_argument("--resume", action="store_true",
+                        help="scripts/.state/ledger.jsonl 기록을 보고 끝난 단계는 건너뛰고 이어서 처리")
+    parser.add_argument("--login", default=INSTAGRAM_USERNAME, help="저장된 Instagram 세션을 불러올 사용자명")
+    parser.add_argument("--session-file", default=INSTAGRAM_SESSION_FILE, help="Instagram 세션 파일 경로")
+    parser.add_argument("--retries", type=int, default=RETRIES,
+                        help=f"요청당 최대 재시도 횟수 (기본 {RETRIES}, 0이면 재시도 안 함)")
+    parser.add_argument("--near-dup", choices=NEAR_DUP_POLICIES, default="skip",
+                        help="거의 같은 캡션 처리: skip(건너뜀, 기본) / reuse(기존 요약 재사용) / off")
+    parser.add_argument("--record", type=Path,
+                        help="Instagram 조회 결과와 Gemini 응답 원문을 녹화할 JSON Lines 파일 (부하 테스트 재생용)")
+    parser.add_argument("--trace", type=Path,
+                        help="단계별 span JSON Lines 저장 경로 (기본: scripts/.state/traces/<실행 시각>.jsonl)")
+    args = parser.parse_args(argv)
+
+    # 개별 지정 > 공통 지정 > 기본값
+    def pick(specific, common, default):
+        if specific is not None:
+            return specific
+        return common if common is not None else default
+
+    args.insta_workers = pick(args.insta_workers, args.workers, INSTAGRAM_WORKERS)
+    args.insta_rps = pick(args.insta_rps, args.rps, INSTAGRAM_RPS)
+    args.gemini_workers = pick(args.gemini_workers, args.workers, GEMINI_WORKERS)
+    args.gemini_rps = pick(args.gemini_rps, args.rps, GEMINI_RPS)
+    return args
+
+
+def main(argv: Optional[list] = None):
     """메인 함수"""
+    args = parse_args(argv)
     
     print("="*60)
     print("📸 Instagram to Hugo Post Generator")
     print(f"   모델: {GEMINI_MODEL}")
     print("   방식: Instagram Embed (이미지 다운로드 없음)")
+    print(f"   Instagram: 워커 {args.insta_workers}, {args.insta_rps} req/s")
+    print(f"   Gemini: 워커 {args.gemini_workers}, {args.gemini_rps} req/s")
     print("="*60)
     
     # API 키 확인
@@ -287,28 +1038,78 @@ def main():
     
     print(f"\n📋 처리할 링크: {len(links)}개")
     
-    # 각 링크 처리
-    success = 0
-    for url in links:
-        if process_instagram_link(url, api_key):
-            success += 1
+    # 이미 게시된 shortcode 색인 (바뀐 게시물만 다시 읽음)
+    index = ShortcodeIndex.build(CONTENT_DIR)
+    already = sum(1 for url in links if (extract_shortcode(url) or '') in index)
+    print(f"   🗂️ 게시된 shortcode {len(index)}개 (다시 읽은 파일 {index.scanned}개)")
+    if already:
+        print(f"   ⏭️ 이미 게시된 링크 {already}개는 조회하지 않고 건너뜀")
+    if already == len(links):
+        index.save()
+        print("\n✅ 새로 처리할 링크가 없습니다.")
+        return
+    
+    # 진행 기록 (단계마다 즉시 디스크에 기록)
+    ledger = Ledger()
+    if args.resume:
+        ledger.compact()
+    else:
+        done_before = sum(1 for url in links
+                          if ledger.state(extract_shortcode(url) or '') == WRITTEN and extract_shortcode(url) not in index)
+        if done_before:
+            print(f"   ⚠️ 이전 실행에서 생성했지만 지금은 없는 게시물의 링크 {done_before}개 — 건너뛰려면 --resume")
+    
+    # 배치 처리 (클라이언트는 실행당 한 번만 생성)
+    started = time.monotonic()
+    tracer = Tracer()
+    with ledger, ImportSession(
+        api_key,
+        username=args.login,
+        session_file=args.session_file,
+        pool_size=args.insta_workers,
+        cache=ImportCache(read=not (args.no_cache or args.refresh), write=not args.no_cache),
+        tracer=tracer,
+        retries=args.retries,
+        cassette=Cassette(args.record) if args.record else None,
+    ) as session:
+        if session.username:
+            print(f"   🔑 Instagram 세션: {session.username}")
+        succeeded = run_batch(
+            links,
+            session,
+            insta_workers=args.insta_workers,
+            insta_rps=args.insta_rps,
+            gemini_workers=args.gemini_workers,
+            gemini_rps=args.gemini_rps,
+            batch_size=args.batch_size,
+            ledger=ledger,
+            resume=args.resume,
+            index=index,
+            near_dup=args.near_dup,
+        )
+        if session.cache.hits:
+            print(f"   💾 캐시 적중: {session.cache.hits}건")
+        for service in (session.instagram, session.gemini):
+            if service.stats["retries"] or service.breaker.opened:
+                print(f"   🔁 {service.format_stats()}")
+    
+    index.save()
     
     print(f"\n{'='*60}")
-    print(f"✅ 완료: {success}/{len(links)} 게시물 생성")
+    print(f"✅ 완료: {len(succeeded)}/{len(links)} 게시물 생성 ({time.monotonic() - started:.1f}초)")
     
-    # 처리된 링크 주석 처리
-    if success > 0:
-        new_content = []
-        processed_count = 0
-        for line in LINKS_FILE.read_text(encoding='utf-8').splitlines():
-            stripped = line.strip()
-            if stripped in links and processed_count < success:
-                new_content.append(f"# [처리됨] {stripped}")
-                processed_count += 1
-            else:
-                new_content.append(line)
-        LINKS_FILE.write_text('\n'.join(new_content), encoding='utf-8')
-        print("   처리된 링크는 주석 처리되었습니다.")
+    failed = [url for url in links if ledger.state(extract_shortcode(url) or '') == FAILED]
+    skipped = [url for url in links if ledger.state(extract_shortcode(url) or '') == SKIPPED]
+    if skipped:
+        print(f"   ⏭️ 거의 같은 캡션이라 건너뜀 {len(skipped)}개 — 게시하려면 --near-dup reuse 또는 off")
+    if failed:
+        print(f"   ❌ 실패 {len(failed)}개 — 다시 실행할 때 --resume으로 실패한 링크만 재시도")
+    print(f"   진행 기록: {ledger.path.relative_to(PROJECT_ROOT)}")
+
+    trace_path = tracer.export_jsonl(args.trace)
+    print(f"\n⏱️ 단계별 소요 시간 (ms)")
+    print(tracer.format_table())
+    print(f"   트레이스: {trace_path}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,145 @@
+"""
+insta_to_post.py 단계별 트레이싱
+================================
+
+단계마다 span 하나를 기록합니다 (시작 시각, 소요 시간, 성공/실패, 속성).
+실행이 끝나면 모든 span을 JSON Lines로 내보내고 단계별 p50/p95/p99 표를 출력해
+시간이 Instagram 조회, Gemini 호출, JSON 파싱/기본값 대체, 파일 쓰기 중 어디에
+쓰이는지 볼 수 있습니다.
+
+    with tracer.span("gemini.summary", shortcode=code) as span:
+        ...
+        span.set(prompt_tokens=812, fallback="ValueError")
+        span.incr("retries")
+
+단계 이름:
+- extract_shortcode  URL에서 shortcode 추출
+- instagram.fetch    Post.from_shortcode 조회 (cache_hit, retries, paused_ms)
+- near_duplicate     캡션 SimHash 중복 검사 (match, distance)
+- gemini.summary     단건 요약 (cache_hit, *_tokens, retries, paused_ms, fallback)
+- gemini.batch       배치 요약 (items, returned, *_tokens, retries, paused_ms, fallback)
+- gemini.parse       응답 JSON 파싱 + 스키마 검증 (fenced, chars, valid: 단건은 요약 스키마, 배치는 JSON 배열)
+- write              create_hugo_post (skipped)
+"""
+
+import json
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+TRACE_DIR = Path(__file__).parent / ".state" / "traces"
+
+# 표에서 합계를 보여 줄 숫자 속성
+SUMMED_ATTRS = ("retries", "prompt_tokens", "output_tokens", "total_tokens")
+
+
+class Span:
+    """진행 중인 span 하나 (속성은 끝나기 전까지 자유롭게 추가)"""
+
+    __slots__ = ("name", "attrs", "started", "_start")
+
+    def __init__(self, name: str, attrs: dict):
+        self.name = name
+        self.attrs = attrs
+        self.started = time.time()
+        self._start = time.perf_counter()
+
+    def set(self, **attrs) -> None:
+        self.attrs.update(attrs)
+
+    def incr(self, key: str, amount: int = 1) -> None:
+        self.attrs[key] = self.attrs.get(key, 0) + amount
+
+
+class Tracer:
+    """span을 메모리에 모으는 스레드 안전 트레이서"""
+
+    def __init__(self):
+        self.spans = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def span(self, name: str, **attrs):
+        span = Span(name, attrs)
+        status, error = "ok", None
+        try:
+            yield span
+        except BaseException as e:
+            status, error = "error", f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            record = {
+                "name": name,
+                "start": round(span.started, 6),
+                "ms": round((time.perf_counter() - span._start) * 1000, 3),
+                "status": status,
+                "thread": threading.current_thread().name,
+                **span.attrs,
+            }
+            if error:
+                record["error"] = error
+            with self._lock:
+                self.spans.append(record)
+
+    def export_jsonl(self, path: Optional[Path] = None) -> Path:
+        """모든 span을 JSON Lines로 저장 (기본: scripts/.state/traces/<실행 시각>.jsonl)"""
+        if path is None:
+            path = TRACE_DIR / f"{datetime.now():%Y%m%d-%H%M%S}.jsonl"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            spans = list(self.spans)
+        with open(path, "w", encoding="utf-8") as f:
+            for record in spans:
+                f.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+        return path
+
+    def summary(self) -> dict:
+        """단계별 {count, errors, p50, p95, p99, max, total_ms, 합산 속성}"""
+        with self._lock:
+            spans = list(self.spans)
+        stages = {}
+        for record in spans:
+            stages.setdefault(record["name"], []).append(record)
+        result = {}
+        for name, records in stages.items():
+            durations = sorted(record["ms"] for record in records)
+            stats = {
+                "count": len(records),
+                "errors": sum(1 for record in records if record["status"] == "error"),
+                "p50": percentile(durations, 50),
+                "p95": percentile(durations, 95),
+                "p99": percentile(durations, 99),
+                "max": durations[-1],
+                "total_ms": round(sum(durations), 3),
+                "cache_hits": sum(1 for record in records if record.get("cache_hit")),
+                "fallbacks": sum(1 for record in records if record.get("fallback")),
+            }
+            for key in SUMMED_ATTRS:
+                stats[key] = sum(record.get(key, 0) for record in records)
+            result[name] = stats
+        return result
+
+    def format_table(self) -> str:
+        """단계별 백분위 표 (ms)"""
+        summary = self.summary()
+        if not summary:
+            return "(기록된 span 없음)"
+        header = f"{'stage':<18}{'n':>6}{'err':>5}{'p50':>10}{'p95':>10}{'p99':>10}{'total':>11}" \
+                 f"{'cache':>7}{'fallbk':>7}{'retry':>7}{'tokens':>9}"
+        lines = [header, "-" * len(header)]
+        for name, s in sorted(summary.items(), key=lambda item: -item[1]["total_ms"]):
+            lines.append(f"{name:<18}{s['count']:>6}{s['errors']:>5}{s['p50']:>10.1f}{s['p95']:>10.1f}"
+                         f"{s['p99']:>10.1f}{s['total_ms']:>11.1f}{s['cache_hits']:>7}{s['fallbacks']:>7}"
+                         f"{s['retries']:>7}{s['total_tokens']:>9}")
+        return "\n".join(lines)
+
+
+def percentile(sorted_values: list, pct: float) -> float:
+    """nearest-rank 백분위 (sorted_values는 오름차순)"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, -(-len(sorted_values) * pct // 100))
+    return sorted_values[int(rank) - 1]
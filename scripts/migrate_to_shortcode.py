@@ -1,32 +1,22 @@
-import os
-import re
 from pathlib import Path
 
-CONTENT_DIR = Path(r"c:\Users\wwht1\TheLogos\content\posts")
+import codemod
+
+CONTENT_DIR = Path(__file__).resolve().parent.parent / "content" / "posts"
+
+# The ai-summary-box rule now lives in codemod.RULES; `python scripts/codemod.py -r ai-summary`
+# does the same site-wide, with --dry-run and a process pool.
+AI_SUMMARY = codemod.Codemod([codemod.RULES["ai-summary"]])
 
 def migrate_file(filepath):
-    text = filepath.read_text(encoding='utf-8')
-    
-    # Regex to find the div block
-    # Pattern looks for <div class="ai-summary-box"> ... </div>
-    # handling multiline content.
-    pattern = r'<div class="ai-summary-box">\s*(.*?)\s*</div>'
-    
-    match = re.search(pattern, text, re.DOTALL)
-    if match:
-        inner_content = match.group(1).strip()
-        # Create new shortcode replacement
-        replacement = f'{{{{< ai_summary >}}}}\n{inner_content}\n{{{{< /ai_summary >}}}}'
-        
-        new_text = re.sub(pattern, replacement, text, flags=re.DOTALL)
-        
-        if new_text != text:
-            filepath.write_text(new_text, encoding='utf-8')
-            try:
-                print(f"Migrated: {filepath.name}")
-            except UnicodeEncodeError:
-                print(f"Migrated: {filepath.name.encode('utf-8', errors='replace')}")
-            return True
+    # Only the body is searched and rewritten; the front matter bytes are copied as-is.
+    counts, _ = codemod.rewrite_file(filepath, AI_SUMMARY)
+    if counts:
+        try:
+            print(f"Migrated: {filepath.name}")
+        except UnicodeEncodeError:
+            print(f"Migrated: {filepath.name.encode('utf-8', errors='replace')}")
+        return True
     return False
 
 def main():
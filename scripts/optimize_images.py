@@ -0,0 +1,213 @@
+"""
+Build responsive WebP/AVIF variants for every raster image under static/images.
+
+Files in static/ bypass Hugo's image processing, so the smartimg shortcode could only
+resize page-bundle resources and everything else was served full-size. This writes
+variants at the smartimg widths (480/800/1200, never upscaled) into
+static/images/_variants/ and records them in data/images.json, which the
+responsive-image partial looks up by the original /images/... URL.
+
+Sources are processed in a process pool. A content-hash cache
+(scripts/.cache/images.json) skips sources whose bytes and settings are unchanged and
+whose variants still exist, so a CI run with a restored cache only encodes new images.
+
+Usage:
+    python scripts/optimize_images.py
+    python scripts/optimize_images.py --workers 4 --force
+
+Requires: pip install pillow   (AVIF needs Pillow 11.3+ or pillow-avif-plugin; without it
+only WebP is produced)
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+try:
+    from PIL import Image, features
+except ImportError:
+    print("Error: 'pillow' is required. Please run: pip install pillow")
+    sys.exit(1)
+
+try:
+    import pillow_avif  # noqa: F401  (registers the AVIF plugin on older Pillow)
+except ImportError:
+    pass
+
+import frontmatter
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+STATIC_ROOT = PROJECT_ROOT / "static"
+IMAGES_DIR = STATIC_ROOT / "images"
+VARIANTS_DIR = IMAGES_DIR / "_variants"
+MANIFEST_FILE = PROJECT_ROOT / "data" / "images.json"
+CACHE_FILE = PROJECT_ROOT / "scripts" / ".cache" / "images.json"
+
+# Same widths and qualities as layouts/shortcodes/smartimg.html.
+WIDTHS = (480, 800, 1200)
+QUALITY = {480: 75, 800: 80, 1200: 80}
+AVIF_QUALITY_OFFSET = -20   # AVIF at q60 looks like WebP at q80
+SOURCE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".gif", ".webp")
+# Below this many images a process pool costs more to start than it saves.
+POOL_THRESHOLD = 4
+
+
+def available_formats():
+    formats = ["webp"]
+    if features.check("avif") or "AVIF" in Image.registered_extensions().values():
+        formats.insert(0, "avif")
+    return formats
+
+
+def settings_key(formats):
+    return hashlib.sha256(json.dumps([WIDTHS, QUALITY, AVIF_QUALITY_OFFSET, formats]).encode()).hexdigest()[:12]
+
+
+def site_url(path):
+    return "/" + path.relative_to(STATIC_ROOT).as_posix()
+
+
+def iter_sources(root=IMAGES_DIR):
+    for dirpath, dirnames, filenames in os.walk(root):
+        # Generated variants live in _variants/; never treat them as sources.
+        dirnames[:] = sorted(d for d in dirnames if not d.startswith("_"))
+        for name in sorted(filenames):
+            if name.lower().endswith(SOURCE_EXTENSIONS):
+                yield Path(dirpath) / name
+
+
+# ------------------------------------------------------------
+# Encoding (runs in worker processes)
+# ------------------------------------------------------------
+def target_widths(width):
+    """smartimg widths that do not upscale, plus the source width when it falls short of the largest."""
+    widths = [w for w in WIDTHS if w < width]
+    if width <= WIDTHS[-1]:
+        widths.append(width)
+    return widths
+
+
+def encode(job):
+    """Write every variant of one source; return its manifest entry."""
+    source, digest, formats = job
+    stem = source.relative_to(IMAGES_DIR).with_suffix("").as_posix().replace("/", "-")
+    with Image.open(source) as image:
+        image.load()
+        width, height = image.size
+        has_alpha = image.mode in ("RGBA", "LA", "PA") or "transparency" in image.info
+        image = image.convert("RGBA" if has_alpha else "RGB")
+        variants = {fmt: [] for fmt in formats}
+        for target in target_widths(width):
+            resized = image if target == width else image.resize(
+                (target, round(height * target / width)), Image.LANCZOS)
+            for fmt in formats:
+                name = f"{stem}.{digest[:8]}.{target}.{fmt}"
+                quality = QUALITY.get(target, 80) + (AVIF_QUALITY_OFFSET if fmt == "avif" else 0)
+                options = {"quality": quality}
+                if fmt == "webp":
+                    options["method"] = 6
+                resized.save(VARIANTS_DIR / name, fmt.upper(), **options)
+                variants[fmt].append([target, site_url(VARIANTS_DIR / name)])
+    return {"width": width, "height": height, "variants": variants}
+
+
+# ------------------------------------------------------------
+# Cache and manifest
+# ------------------------------------------------------------
+def load_json(path, default):
+    try:
+        return json.loads(Path(path).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return default
+
+
+def outputs_exist(entry):
+    return all((STATIC_ROOT / url.lstrip("/")).exists()
+               for variants in entry["variants"].values() for _, url in variants)
+
+
+def optimize(workers=None, force=False, cache_path=CACHE_FILE, manifest_path=MANIFEST_FILE):
+    started = time.perf_counter()
+    formats = available_formats()
+    settings = settings_key(formats)
+    cache = {} if force else load_json(cache_path, {})
+    VARIANTS_DIR.mkdir(parents=True, exist_ok=True)
+
+    manifest = {}
+    jobs = []
+    for source in iter_sources():
+        url = site_url(source)
+        digest = hashlib.sha256(source.read_bytes()).hexdigest()
+        cached = cache.get(url)
+        if (cached and cached["sha256"] == digest and cached["settings"] == settings
+                and outputs_exist(cached["entry"])):
+            manifest[url] = cached["entry"]
+            continue
+        jobs.append((source, digest, formats))
+
+    if workers == 1 or len(jobs) < POOL_THRESHOLD:
+        entries = [encode(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            entries = list(pool.map(encode, jobs))
+
+    for (source, digest, _), entry in zip(jobs, entries):
+        url = site_url(source)
+        manifest[url] = entry
+        cache[url] = {"sha256": digest, "settings": settings, "entry": entry}
+        print(f"Optimized {url} -> {', '.join(formats)} at {[w for w, _ in entry['variants'][formats[-1]]]}")
+
+    # Drop variants no source refers to any more (old hashes, deleted images).
+    live = {url.rsplit("/", 1)[-1] for entry in manifest.values()
+            for variants in entry["variants"].values() for _, url in variants}
+    removed = 0
+    for path in VARIANTS_DIR.iterdir():
+        if path.name not in live:
+            path.unlink()
+            removed += 1
+    cache = {url: value for url, value in cache.items() if url in manifest}
+
+    Path(cache_path).parent.mkdir(parents=True, exist_ok=True)
+    frontmatter.write_atomic(cache_path, json.dumps(cache, indent=1, sort_keys=True))
+    text = json.dumps(dict(sorted(manifest.items())), separators=(",", ":")) + "\n"
+    manifest_path = Path(manifest_path)
+    if not manifest_path.exists() or manifest_path.read_text(encoding="utf-8") != text:
+        manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        frontmatter.write_atomic(manifest_path, text)
+
+    source_bytes = sum((STATIC_ROOT / url.lstrip("/")).stat().st_size for url in manifest)
+    variant_bytes = {fmt: sum((STATIC_ROOT / url.lstrip("/")).stat().st_size
+                              for entry in manifest.values() for w, url in entry["variants"].get(fmt, []))
+                     for fmt in formats}
+    return {
+        "sources": len(manifest),
+        "encoded": len(jobs),
+        "skipped": len(manifest) - len(jobs),
+        "removed": removed,
+        "formats": formats,
+        "source_bytes": source_bytes,
+        "variant_bytes": variant_bytes,
+        "elapsed": round(time.perf_counter() - started, 3),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build WebP/AVIF variants for static/images.")
+    parser.add_argument("--workers", type=int, help="processes (default: CPU count)")
+    parser.add_argument("--force", action="store_true", help="ignore the cache and re-encode everything")
+    args = parser.parse_args(argv)
+
+    stats = optimize(workers=args.workers, force=args.force)
+    sizes = ", ".join(f"{fmt} {size / 1024:.0f} KiB" for fmt, size in stats["variant_bytes"].items())
+    print(f"Images: {stats['sources']} sources ({stats['source_bytes'] / 1024:.0f} KiB), "
+          f"{stats['encoded']} encoded, {stats['skipped']} cached, {stats['removed']} stale variants removed; "
+          f"variants: {sizes} ({stats['elapsed']:.2f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,249 @@
+"""
+Precompress the built site and check output sizes against budgets.
+
+Runs after `hugo --gc --minify`. Every text asset in public/ (HTML, feeds, JSON, JS,
+CSS, SVG, ...) of at least MIN_BYTES gets a .gz sibling, and a .br sibling when the
+brotli module is installed, for servers that serve precompressed files as they are
+(nginx gzip_static / brotli_static, Caddy precompressed, most CDNs' origin mode).
+A sibling is only written when it actually saves space.
+
+Compression runs in a process pool. Compressed bytes are cached by the sha256 of the
+input under scripts/.cache/precompress/, so on a rebuild (or a CI run with the cache
+restored) only files whose bytes changed are compressed again; everything else is
+copied from the cache. Cache entries no file refers to any more are dropped.
+
+The size report groups outputs by type (feed, graph, search, html, ...) with raw, gzip
+and brotli totals and the largest file. BUDGETS caps the full-content feeds
+(`[services.rss] limit = -1`, `params.rss.full = true`) and the network page that
+inlines data/graph.json; going over any budget exits with status 1.
+
+Usage:
+    python scripts/precompress.py
+    python scripts/precompress.py --report size-report.json
+    python scripts/precompress.py --no-budgets --workers 4
+
+Optional: pip install brotli   (without it only .gz siblings are written)
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+import frontmatter
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+PUBLIC_DIR = PROJECT_ROOT / "public"
+CACHE_DIR = PROJECT_ROOT / "scripts" / ".cache" / "precompress"
+
+TEXT_EXTENSIONS = (".html", ".xml", ".json", ".js", ".mjs", ".css", ".svg", ".txt", ".map",
+                   ".webmanifest", ".ico")
+MIN_BYTES = 512          # smaller responses fit in a packet either way
+MIN_SAVING = 0.05        # keep a sibling only if it is at least 5% smaller
+# Below this many files a process pool costs more to start than it saves.
+POOL_THRESHOLD = 32
+
+KiB = 1024
+MiB = 1024 * KiB
+# Per output type: largest single file (raw and gzip) and the type's raw total.
+BUDGETS = {
+    "feed": {"file": 8 * MiB, "file_gzip": 2 * MiB, "total": 64 * MiB},
+    "graph": {"file": 1536 * KiB, "file_gzip": 384 * KiB},
+}
+
+
+def compress_gzip(data):
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+
+def compress_brotli(data):
+    return brotli.compress(data, quality=11)
+
+
+COMPRESSORS = {"gz": compress_gzip, "br": compress_brotli}
+
+
+def output_type(rel):
+    """Report group for a path relative to public/."""
+    posix = rel.as_posix()
+    if rel.name == "index.xml" or rel.suffix in (".rss", ".atom"):
+        return "feed"
+    if rel.name.startswith("sitemap") and rel.suffix == ".xml":
+        return "sitemap"
+    if posix == "network/index.html":
+        return "graph"
+    if rel.parts[0] == "search":
+        return "search"
+    return rel.suffix.lstrip(".") or "other"
+
+
+def iter_assets(root):
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        for name in sorted(filenames):
+            if name.lower().endswith(TEXT_EXTENSIONS):
+                yield Path(dirpath) / name
+
+
+# ------------------------------------------------------------
+# Compression (runs in worker processes)
+# ------------------------------------------------------------
+def compress_file(job):
+    """Write the siblings of one file; return (digest, raw size, {fmt: served size}, compressed count)."""
+    path, formats = job
+    data = path.read_bytes()
+    digest = hashlib.sha256(data).hexdigest()
+    sizes, compressed = {}, 0
+    for fmt in formats:
+        blob = CACHE_DIR / f"{digest}.{fmt}"
+        if blob.exists():
+            packed = blob.read_bytes()
+        else:
+            packed = COMPRESSORS[fmt](data)
+            if len(packed) > len(data) * (1 - MIN_SAVING):
+                packed = b""  # cached as empty: not worth a sibling
+            frontmatter.write_atomic(blob, packed)
+            compressed += 1
+        sibling = path.with_name(f"{path.name}.{fmt}")
+        if packed:
+            sibling.write_bytes(packed)
+            sizes[fmt] = len(packed)
+        else:
+            if sibling.exists():
+                sibling.unlink()
+            sizes[fmt] = len(data)
+    return digest, len(data), sizes, compressed
+
+
+# ------------------------------------------------------------
+# Driver
+# ------------------------------------------------------------
+def precompress(public=PUBLIC_DIR, workers=None, use_brotli=True, force=False):
+    started = time.perf_counter()
+    public = Path(public)
+    formats = ["gz"] + (["br"] if use_brotli and brotli is not None else [])
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    if force:
+        for blob in CACHE_DIR.iterdir():
+            blob.unlink()
+
+    files, small = [], []
+    for path in iter_assets(public):
+        (files if path.stat().st_size >= MIN_BYTES else small).append(path)
+    # Siblings left behind by a file that was deleted or shrank below MIN_BYTES.
+    for sibling in public.rglob("*.[gb][zr]"):
+        base = sibling.with_suffix("")
+        if sibling.suffix in (".gz", ".br") and base.name.lower().endswith(TEXT_EXTENSIONS) \
+                and (not base.exists() or base.stat().st_size < MIN_BYTES):
+            sibling.unlink()
+    jobs = [(path, formats) for path in files]
+    if workers == 1 or len(jobs) < POOL_THRESHOLD:
+        results = [compress_file(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            chunksize = max(1, len(jobs) // ((workers or os.cpu_count() or 1) * 4))
+            results = list(pool.map(compress_file, jobs, chunksize=chunksize))
+
+    # Drop cached blobs for content that is no longer in the site.
+    live = {f"{digest}.{fmt}" for digest, _, _, _ in results for fmt in formats}
+    for blob in CACHE_DIR.iterdir():
+        if blob.name not in live:
+            blob.unlink()
+
+    entries = [(path.relative_to(public), raw, sizes) for path, (_, raw, sizes, _) in zip(files, results)]
+    entries += [(path.relative_to(public), path.stat().st_size, {}) for path in small]
+    return {
+        "formats": formats,
+        "files": len(files),
+        "small": len(small),
+        "compressed": sum(count for _, _, _, count in results),
+        "entries": entries,
+        "elapsed": round(time.perf_counter() - started, 3),
+    }
+
+
+def size_report(entries, formats):
+    """{type: {files, raw, gz, br, largest, largest_raw, largest_gz}} sorted by raw size."""
+    report = {}
+    for rel, raw, sizes in entries:
+        group = report.setdefault(output_type(rel), {"files": 0, "raw": 0, **{fmt: 0 for fmt in formats},
+                                                     "largest": None, "largest_raw": 0, "largest_gz": 0})
+        group["files"] += 1
+        group["raw"] += raw
+        for fmt in formats:
+            group[fmt] += sizes.get(fmt, raw)
+        if raw > group["largest_raw"]:
+            group.update(largest=rel.as_posix(), largest_raw=raw, largest_gz=sizes.get("gz", raw))
+    return dict(sorted(report.items(), key=lambda item: -item[1]["raw"]))
+
+
+def check_budgets(report, budgets=BUDGETS):
+    """Messages for every budget the report goes over."""
+    broken = []
+    for group, limits in budgets.items():
+        stats = report.get(group)
+        if not stats:
+            continue
+        checks = (("file", stats["largest_raw"], f"largest file {stats['largest']}"),
+                  ("file_gzip", stats["largest_gz"], f"largest file {stats['largest']} (gzip)"),
+                  ("total", stats["raw"], "total"))
+        for key, value, what in checks:
+            if key in limits and value > limits[key]:
+                broken.append(f"{group}: {what} is {value / KiB:.0f} KiB, budget {limits[key] / KiB:.0f} KiB")
+    return broken
+
+
+def print_report(report, formats):
+    header = f"{'type':<10}{'files':>7}{'raw KiB':>11}" + "".join(f"{fmt + ' KiB':>11}" for fmt in formats) + \
+             f"  largest"
+    print(header)
+    print("-" * len(header))
+    for group, stats in report.items():
+        print(f"{group:<10}{stats['files']:>7}{stats['raw'] / KiB:>11.0f}"
+              + "".join(f"{stats[fmt] / KiB:>11.0f}" for fmt in formats)
+              + f"  {stats['largest']} ({stats['largest_raw'] / KiB:.0f} KiB)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Precompress public/ and check output size budgets.")
+    parser.add_argument("--public", type=Path, default=PUBLIC_DIR, help="built site directory (default: public/)")
+    parser.add_argument("--workers", type=int, help="processes (default: CPU count)")
+    parser.add_argument("--no-brotli", action="store_true", help="only write .gz siblings")
+    parser.add_argument("--force", action="store_true", help="ignore the cache and compress everything")
+    parser.add_argument("--report", type=Path, help="also write the size report as JSON")
+    parser.add_argument("--no-budgets", action="store_true", help="report sizes but never fail")
+    args = parser.parse_args(argv)
+
+    if not args.public.is_dir():
+        print(f"Error: {args.public} does not exist; run hugo first.")
+        return 1
+    if brotli is None and not args.no_brotli:
+        print("Note: 'brotli' is not installed, writing .gz only (pip install brotli)")
+
+    stats = precompress(args.public, workers=args.workers, use_brotli=not args.no_brotli, force=args.force)
+    report = size_report(stats["entries"], stats["formats"])
+    broken = [] if args.no_budgets else check_budgets(report)
+    print(f"Precompressed {stats['files']} files ({', '.join(stats['formats'])}): "
+          f"{stats['compressed']} newly compressed, the rest from cache; "
+          f"{stats['small']} under {MIN_BYTES} bytes left as is ({stats['elapsed']:.2f}s)")
+    print_report(report, stats["formats"])
+    if args.report:
+        args.report.write_text(json.dumps({"formats": stats["formats"], "types": report, "budgets": BUDGETS,
+                                           "over_budget": broken}, indent=2) + "\n", encoding="utf-8")
+    for message in broken:
+        print(f"OVER BUDGET: {message}")
+    return 1 if broken else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,20 +1,45 @@
 
+import argparse
+import glob
 import os
 import sys
-import re
 import hashlib
 import json
 import secrets
+import time
+from concurrent import futures  # ProcessPoolExecutor is imported on first use
+from datetime import datetime
 from pathlib import Path
 
-try:
-    from eth_account import Account
-    from eth_account.messages import encode_defunct
-except ImportError:
-    print("Error: 'eth_account' is required. Please run: pip install eth-account")
-    sys.exit(1)
+import frontmatter
+
+# eth_account is slow to import, so it is loaded on first use: --help, usage errors
+# and runs with nothing to sign never pay for it.
+Account = None
+encode_defunct = None
+
+
+def load_eth_account():
+    global Account, encode_defunct
+    if Account is not None:
+        return
+    try:
+        from eth_account import Account as account
+        from eth_account.messages import encode_defunct as encode
+    except ImportError:
+        print("Error: 'eth_account' is required. Please run: pip install eth-account")
+        sys.exit(1)
+    Account, encode_defunct = account, encode
+
 
 KEY_FILE = "signer_key.private"
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+# path -> (mtime, size, content_hash) of every file as last signed, for --incremental
+MANIFEST_FILE = PROJECT_ROOT / "data" / "signatures.json"
+# Signed Merkle root over every post's content_hash, plus per-post inclusion proofs, for --merkle
+MERKLE_FILE = PROJECT_ROOT / "data" / "merkle.json"
+CONTENT_ROOT = PROJECT_ROOT / "content"
+VERIFICATION_TABLE = "params.verification"
 
 def load_or_create_key():
     if os.path.exists(KEY_FILE):
@@ -26,6 +51,7 @@ def load_or_create_key():
         print("No private key found.")
         create = input("Generate new Ethereum private key for signing? (y/n): ").lower()
         if create == 'y':
+            load_eth_account()
             acct = Account.create()
             with open(KEY_FILE, "w") as f:
                 f.write(acct.key.hex())
@@ -35,6 +61,34 @@ def load_or_create_key():
         else:
             sys.exit("Cannot proceed without a key.")
 
+def hash_body(body):
+    # Normalize body for signing (trim whitespace to avoid git CRLF issues breaking hash)
+    # We sign the *trimmed* body
+    return hashlib.sha256(body.strip().encode('utf-8')).hexdigest()
+
+
+def read_verification(fm_type, front_matter_raw):
+    """Return the signer_address/signature/content_hash already in the front matter (TOML or YAML)."""
+    return frontmatter.read_table(fm_type, front_matter_raw, VERIFICATION_TABLE)
+
+
+def sign_timestamp():
+    return os.popen('date /t').read().strip() if os.name == 'nt' else datetime.now().strftime('%Y-%m-%d')
+
+
+def apply_signature(fm_type, front_matter_raw, body, address, signature, content_hash, timestamp):
+    """Return the full file text with the verification block replaced."""
+    # Only the verification table is rewritten as text; the rest of the front matter
+    # (comments included) and the body are kept byte for byte.
+    new_fm = frontmatter.replace_table(fm_type, front_matter_raw, VERIFICATION_TABLE, {
+        "signer_address": address,
+        "signature": signature,
+        "content_hash": content_hash,
+        "timestamp": timestamp,
+    })
+    return frontmatter.join(fm_type, new_fm, body)
+
+
 def sign_post(file_path, private_key):
     path = Path(file_path)
     if not path.exists():
@@ -44,29 +98,17 @@ def sign_post(file_path, private_key):
     with open(path, "r", encoding="utf-8") as f:
         content = f.read()
 
-    # Split Front Matter
-    # Robust regex for TOML/YAML front matter
-    match = re.search(r'^\+\+\+\r?\n(.*?)\r?\n\+\+\+\r?\n(.*)$', content, re.DOTALL)
-    fm_type = 'toml'
-    if not match:
-        match = re.search(r'^---\r?\n(.*?)\r?\n---\r?\n(.*)$', content, re.DOTALL)
-        fm_type = 'yaml'
-    
-    if not match:
+    parts = frontmatter.split(content)
+    if not parts:
         print("Could not parse Front Matter (must use +++ or ---)")
         return
+    fm_type, front_matter_raw, body = parts
 
-    front_matter_raw = match.group(1)
-    body = match.group(2)
-    
-    # Normalize body for signing (trim whitespace to avoid git CRLF issues breaking hash)
-    # We sign the *trimmed* body
-    body_to_sign = body.strip()
-    
     # Hash
-    content_hash = hashlib.sha256(body_to_sign.encode('utf-8')).hexdigest()
+    content_hash = hash_body(body)
     
     # Sign
+    load_eth_account()
     account = Account.from_key(private_key)
     message = encode_defunct(text=content_hash) # Sign the HASH, not the body (more efficient/standard)
     signed_message = account.sign_message(message)
@@ -76,49 +118,429 @@ def sign_post(file_path, private_key):
     print(f"Signer: {account.address}")
     print(f"Signature: {signature}")
 
-    # Update Front Matter
-    # We simply append/replace the [params.verification] block
-    # This is a simple string manipulation to avoid dropping comments in TOML/YAML libs
-    
-    new_fm = front_matter_raw
-    
-    # Remove existing verification block if present
-    new_fm = re.sub(r'\[params\.verification\].*?(\n\[|$)', r'\1', new_fm, flags=re.DOTALL)
-    
-    verification_block = f"""
-[params.verification]
-  signer_address = "{account.address}"
-  signature = "{signature}"
-  content_hash = "{content_hash}"
-  timestamp = "{os.popen('date /t').read().strip() if os.name == 'nt' else ''}"
-"""
-    
-    if fm_type == 'toml':
-        if "[params.verification]" not in front_matter_raw:
-             # Append to end of params or end of file
-             new_fm += verification_block
-    else:
-        # YAML format
-        yaml_block = f"""
-params:
-  verification:
-    signer_address: "{account.address}"
-    signature: "{signature}"
-    content_hash: "{content_hash}"
-"""
-        new_fm += yaml_block
-
-    new_content = f"+++\n{new_fm}\n+++\n{body}" if fm_type == 'toml' else f"---\n{new_fm}\n---\n{body}"
-    
-    with open(path, "w", encoding="utf-8") as f:
-        f.write(new_content)
+    new_content = apply_signature(
+        fm_type, front_matter_raw, body, account.address, signature, content_hash, sign_timestamp()
+    )
+    frontmatter.write_atomic(path, new_content)
     
     print(f"Successfully signed {file_path}")
 
-if __name__ == "__main__":
-    if len(sys.argv) < 2:
-        print("Usage: python sign_content.py <path_to_markdown_file>")
+
+# ------------------------------------------------------------
+# Batch signing
+# ------------------------------------------------------------
+# Below this many files a process pool costs more to start than it saves.
+POOL_THRESHOLD = 64
+
+_worker_account = None
+
+
+def _init_worker(private_key):
+    global _worker_account
+    load_eth_account()
+    _worker_account = Account.from_key(private_key)
+
+
+def _sign_hash(content_hash):
+    return _worker_account.sign_message(encode_defunct(text=content_hash)).signature.hex()
+
+
+def collect_markdown(targets):
+    """Expand directories (recursively) and glob patterns into a sorted list of .md files."""
+    found = set()
+    for target in targets:
+        if glob.has_magic(target):
+            found.update(Path(p) for p in glob.glob(target, recursive=True))
+        elif Path(target).is_dir():
+            found.update(Path(target).rglob("*.md"))
+        else:
+            found.add(Path(target))
+    return sorted(p for p in found if p.suffix == ".md" and p.is_file())
+
+
+def manifest_key(path):
+    path = Path(path).resolve()
+    try:
+        return path.relative_to(PROJECT_ROOT).as_posix()
+    except ValueError:
+        return path.as_posix()
+
+
+def load_manifest(signer, manifest_path=MANIFEST_FILE):
+    """Return the file table from the manifest, or an empty one if it was written for another key."""
+    try:
+        manifest = json.loads(Path(manifest_path).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if manifest.get("signer", "").lower() != signer.lower():
+        return {}
+    return manifest.get("files", {})
+
+
+def save_manifest(signer, files, manifest_path=MANIFEST_FILE):
+    manifest = {"signer": signer, "files": dict(sorted(files.items()))}
+    Path(manifest_path).parent.mkdir(parents=True, exist_ok=True)
+    frontmatter.write_atomic(manifest_path, json.dumps(manifest, indent=1, ensure_ascii=False) + "\n")
+
+
+def file_stamp(path, content_hash):
+    st = Path(path).stat()
+    return {"mtime": st.st_mtime_ns, "size": st.st_size, "content_hash": content_hash}
+
+
+def sign_all(paths, private_key, workers=None, incremental=False, manifest_path=MANIFEST_FILE):
+    """Sign every file in one process: the key is loaded once, signing runs in a process pool.
+
+    With incremental=True, files whose (mtime, size) match the manifest are not even
+    read, and files whose existing content_hash/signer already match are left untouched.
+    Returns the number of files signed.
+    """
+    load_eth_account()
+    address = Account.from_key(private_key).address
+    files = load_manifest(address, manifest_path) if incremental else {}
+    unread = unchanged = 0
+
+    jobs = []
+    for path in paths:
+        key = manifest_key(path)
+        if incremental:
+            entry = files.get(key)
+            st = path.stat()
+            if entry and entry.get("mtime") == st.st_mtime_ns and entry.get("size") == st.st_size:
+                unread += 1
+                continue
+
+        content = path.read_text(encoding="utf-8")
+        parts = frontmatter.split(content)
+        if not parts:
+            print(f"Skipped (no front matter): {path}")
+            continue
+        fm_type, front_matter_raw, body = parts
+        content_hash = hash_body(body)
+
+        if incremental:
+            existing = read_verification(fm_type, front_matter_raw)
+            if (existing.get("content_hash") == content_hash
+                    and existing.get("signer_address", "").lower() == address.lower()):
+                files[key] = file_stamp(path, content_hash)
+                unchanged += 1
+                continue
+
+        jobs.append((path, fm_type, front_matter_raw, body, content_hash))
+
+    if jobs:
+        hashes = [job[4] for job in jobs]
+        if workers == 1 or len(jobs) < POOL_THRESHOLD:
+            _init_worker(private_key)
+            signatures = [_sign_hash(h) for h in hashes]
+        else:
+            with futures.ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(private_key,)) as pool:
+                signatures = list(pool.map(_sign_hash, hashes, chunksize=32))
+
+        timestamp = sign_timestamp()
+        for (path, fm_type, front_matter_raw, body, content_hash), signature in zip(jobs, signatures):
+            frontmatter.write_atomic(path, apply_signature(
+                fm_type, front_matter_raw, body, address, signature, content_hash, timestamp
+            ))
+            if incremental:
+                files[manifest_key(path)] = file_stamp(path, content_hash)
+            print(f"Signed {path}")
+
+    if incremental:
+        save_manifest(address, files, manifest_path)
+        print(f"Unchanged: {unread} by manifest, {unchanged} by content hash")
+    print(f"Signer: {address}")
+    return len(jobs)
+
+
+# ------------------------------------------------------------
+# Merkle site manifest
+# ------------------------------------------------------------
+# Leaves and nodes are domain-separated so a leaf can never be passed off as a node:
+#   leaf = sha256(0x00 || content_hash), node = sha256(0x01 || left || right)
+# An odd node at the end of a level is promoted unchanged (no self-pairing).
+# Proof steps are "L:<hex>" / "R:<hex>" meaning the sibling sits left / right.
+
+def merkle_leaf(content_hash):
+    return hashlib.sha256(b"\x00" + bytes.fromhex(content_hash)).digest()
+
+
+def merkle_node(left, right):
+    return hashlib.sha256(b"\x01" + left + right).digest()
+
+
+def build_merkle(content_hashes):
+    """Return (root_hex, proofs) for a list of content hashes; proofs[i] belongs to content_hashes[i]."""
+    level = [merkle_leaf(h) for h in content_hashes]
+    proofs = [[] for _ in level]
+    positions = list(range(len(level)))
+    while len(level) > 1:
+        for leaf, index in enumerate(positions):
+            if index % 2:
+                proofs[leaf].append("L:" + level[index - 1].hex())
+            elif index + 1 < len(level):
+                proofs[leaf].append("R:" + level[index + 1].hex())
+            positions[leaf] = index // 2
+        level = [
+            merkle_node(level[i], level[i + 1]) if i + 1 < len(level) else level[i]
+            for i in range(0, len(level), 2)
+        ]
+    return (level[0].hex() if level else ""), proofs
+
+
+def merkle_root_from_proof(content_hash, proof):
+    """Recompute the root from one leaf and its proof (what the browser does in verify_signature.js)."""
+    node = merkle_leaf(content_hash)
+    for step in proof:
+        side, sibling = step.split(":", 1)
+        sibling = bytes.fromhex(sibling)
+        node = merkle_node(sibling, node) if side == "L" else merkle_node(node, sibling)
+    return node.hex()
+
+
+def content_key(path):
+    """Key used in merkle.json: the path relative to content/, as Hugo's .File.Path reports it."""
+    path = Path(path).resolve()
+    try:
+        return path.relative_to(CONTENT_ROOT).as_posix()
+    except ValueError:
+        return manifest_key(path)
+
+
+def collect_hashes(paths, signer, manifest_path=MANIFEST_FILE):
+    """Return {path: content_hash}, reusing manifest hashes for files whose mtime/size are unchanged."""
+    files = load_manifest(signer, manifest_path)
+    hashes = {}
+    for path in paths:
+        key = manifest_key(path)
+        entry = files.get(key)
+        st = path.stat()
+        if entry and entry.get("mtime") == st.st_mtime_ns and entry.get("size") == st.st_size:
+            hashes[path] = entry["content_hash"]
+            continue
+        parts = frontmatter.split(path.read_text(encoding="utf-8"))
+        if not parts:
+            print(f"Skipped (no front matter): {path}")
+            continue
+        hashes[path] = hash_body(parts[2])
+    return hashes
+
+
+def sign_merkle(paths, private_key, merkle_path=MERKLE_FILE, manifest_path=MANIFEST_FILE):
+    """Build the Merkle tree over all posts, sign only its root, and write merkle.json.
+
+    Posts are not rewritten; their inclusion proofs live in merkle.json keyed by
+    content path, so adding a post changes one data file instead of every post.
+    """
+    load_eth_account()
+    account = Account.from_key(private_key)
+    hashes = collect_hashes(paths, account.address, manifest_path)
+    entries = sorted((content_key(path), content_hash) for path, content_hash in hashes.items())
+    if not entries:
+        print("No posts to include in the Merkle tree.")
+        return None
+
+    root, proofs = build_merkle([content_hash for _, content_hash in entries])
+    signature = account.sign_message(encode_defunct(text=root)).signature.hex()
+    manifest = {
+        "root": root,
+        "signer_address": account.address,
+        "signature": signature,
+        "timestamp": sign_timestamp(),
+        "leaves": len(entries),
+        "posts": {
+            key: {"content_hash": content_hash, "proof": proof}
+            for (key, content_hash), proof in zip(entries, proofs)
+        },
+    }
+    Path(merkle_path).parent.mkdir(parents=True, exist_ok=True)
+    frontmatter.write_atomic(merkle_path, json.dumps(manifest, indent=1, ensure_ascii=False) + "\n")
+
+    print(f"Merkle Root: {root} ({len(entries)} posts)")
+    print(f"Signer: {account.address}")
+    print(f"Signature: {signature}")
+    return root
+
+
+# ------------------------------------------------------------
+# Offline verification
+# ------------------------------------------------------------
+def recover_signer(content_hash, signature):
+    load_eth_account()
+    signature = signature[2:] if signature.startswith("0x") else signature
+    return Account.recover_message(encode_defunct(text=content_hash), signature=bytes.fromhex(signature))
+
+
+def verify_file(path):
+    """Recompute the hash exactly like sign_post and recover the signer of the declared block."""
+    path = Path(path)
+    result = {"path": manifest_key(path), "key": content_key(path)}
+    parts = frontmatter.split(path.read_text(encoding="utf-8"))
+    if not parts:
+        result["status"] = "no_front_matter"
+        return result
+    result["content_hash"] = hash_body(parts[2])
+    declared = read_verification(parts[0], parts[1])
+    if not declared.get("signature"):
+        result["status"] = "unsigned"
+        return result
+
+    result["declared_hash"] = declared.get("content_hash")
+    result["declared_signer"] = declared.get("signer_address")
+    if result["declared_hash"] != result["content_hash"]:
+        result["status"] = "hash_mismatch"
+        return result
+    try:
+        result["recovered_signer"] = recover_signer(declared["content_hash"], declared["signature"])
+    except Exception as e:
+        result["status"] = "bad_signature"
+        result["error"] = str(e)
+        return result
+    if result["recovered_signer"].lower() != (result["declared_signer"] or "").lower():
+        result["status"] = "signer_mismatch"
+        return result
+    result["status"] = "ok"
+    return result
+
+
+def verify_merkle(results, merkle_path=MERKLE_FILE):
+    """Check the signed Merkle root and every post's leaf/proof against it."""
+    try:
+        manifest = json.loads(Path(merkle_path).read_text(encoding="utf-8"))
+    except OSError:
+        return None
+    report = {"root": manifest.get("root"), "signer": None, "root_signature_valid": False,
+              "covered": 0, "mismatches": [], "stale": []}
+    try:
+        report["signer"] = recover_signer(manifest["root"], manifest["signature"])
+        report["root_signature_valid"] = report["signer"].lower() == manifest.get("signer_address", "").lower()
+    except Exception as e:
+        report["error"] = str(e)
+
+    posts = manifest.get("posts", {})
+    seen = set()
+    for result in results:
+        entry = posts.get(result["key"])
+        if entry is None or "content_hash" not in result:
+            continue
+        seen.add(result["key"])
+        if entry["content_hash"] != result["content_hash"]:
+            report["mismatches"].append({"path": result["path"], "status": "merkle_hash_mismatch",
+                                         "expected": entry["content_hash"], "actual": result["content_hash"]})
+        elif merkle_root_from_proof(entry["content_hash"], entry["proof"]) != manifest["root"]:
+            report["mismatches"].append({"path": result["path"], "status": "merkle_bad_proof"})
+        else:
+            result["merkle"] = True
+            report["covered"] += 1
+    report["stale"] = sorted(set(posts) - seen)
+    return report
+
+
+def verify_all(paths, workers=None, signer=None, merkle_path=MERKLE_FILE):
+    """Verify every file (in a process pool for large trees) and return a JSON-serialisable report."""
+    started = time.perf_counter()
+    names = [str(path) for path in paths]
+    if workers == 1 or len(names) < POOL_THRESHOLD:
+        results = [verify_file(name) for name in names]
+    else:
+        with futures.ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(verify_file, names, chunksize=32))
+    files_done = time.perf_counter()
+
+    merkle = verify_merkle(results, merkle_path)
+    merkle_done = time.perf_counter()
+
+    mismatches = []
+    for result in results:
+        if result["status"] not in ("ok", "unsigned", "no_front_matter"):
+            mismatches.append({k: v for k, v in result.items() if k != "key"})
+        elif signer and result["status"] == "ok" and result["recovered_signer"].lower() != signer.lower():
+            mismatches.append({**{k: v for k, v in result.items() if k != "key"}, "status": "unexpected_signer"})
+    if merkle:
+        mismatches.extend(merkle["mismatches"])
+        if not merkle["root_signature_valid"]:
+            mismatches.append({"path": manifest_key(merkle_path), "status": "merkle_bad_root_signature"})
+        elif signer and merkle["signer"].lower() != signer.lower():
+            mismatches.append({"path": manifest_key(merkle_path), "status": "merkle_unexpected_signer"})
+
+    unsigned = [r["path"] for r in results if r["status"] == "unsigned" and not r.get("merkle")]
+    return {
+        "ok": not mismatches,
+        "checked": len(results),
+        "verified": sum(1 for r in results if r["status"] == "ok" or r.get("merkle")),
+        "unsigned": unsigned,
+        "mismatches": mismatches,
+        "merkle": merkle and {k: v for k, v in merkle.items() if k != "mismatches"},
+        "timings": {
+            "files": round(files_done - started, 4),
+            "merkle": round(merkle_done - files_done, 4),
+            "total": round(merkle_done - started, 4),
+        },
+    }
+
+
+def verify_main(argv):
+    parser = argparse.ArgumentParser(prog="sign_content.py verify",
+                                     description="Check every post's content_hash and signature offline.")
+    parser.add_argument("targets", nargs="*", default=["content"], help="files, directories or globs (default: content)")
+    parser.add_argument("--signer", help="fail unless every signature recovers to this address")
+    parser.add_argument("--report", help="write the JSON report to this file instead of stdout")
+    parser.add_argument("--workers", type=int, help="verification processes (default: CPU count)")
+    parser.add_argument("--require-signed", action="store_true", help="also fail when a post has no signature")
+    args = parser.parse_args(argv)
+
+    report = verify_all(collect_markdown(args.targets), args.workers, args.signer)
+    if args.require_signed and report["unsigned"]:
+        report["ok"] = False
+    text = json.dumps(report, indent=1, ensure_ascii=False)
+    if args.report:
+        Path(args.report).write_text(text + "\n", encoding="utf-8")
+        print(f"Checked {report['checked']} file(s) in {report['timings']['total']}s: "
+              f"{report['verified']} verified, {len(report['unsigned'])} unsigned, "
+              f"{len(report['mismatches'])} mismatched -> {args.report}")
+    else:
+        print(text)
+    sys.exit(0 if report["ok"] else 1)
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv[:1] == ["verify"]:
+        verify_main(argv[1:])
+        return
+
+    parser = argparse.ArgumentParser(description="Sign Markdown posts with the site's Ethereum key.",
+                                     epilog="Use 'sign_content.py verify [paths]' to check signatures offline.")
+    parser.add_argument("targets", nargs="*", help="Markdown files, directories or glob patterns (e.g. 'content/**/*.md')")
+    parser.add_argument("--all", metavar="DIR", action="append", default=[], help="sign every .md file under DIR")
+    parser.add_argument("--workers", type=int, help="signing processes for batch mode (default: CPU count)")
+    parser.add_argument("--merkle", action="store_true",
+                        help=f"sign one Merkle root over all matched posts into {MERKLE_FILE.relative_to(PROJECT_ROOT).as_posix()} instead of each post")
+    parser.add_argument("--incremental", action="store_true",
+                        help=f"skip files unchanged since last signing (tracked in {MANIFEST_FILE.relative_to(PROJECT_ROOT).as_posix()})")
+    args = parser.parse_args(argv)
+
+    targets = args.targets + args.all
+    if not targets:
+        parser.print_usage()
         sys.exit(1)
-    
-    pk = load_or_create_key()
-    sign_post(sys.argv[1], pk)
+
+    # Single plain file: keep the verbose one-file output.
+    if (len(targets) == 1 and not args.all and not args.incremental and not args.merkle
+            and not glob.has_magic(targets[0]) and not Path(targets[0]).is_dir()):
+        sign_post(targets[0], load_or_create_key())
+        return
+
+    paths = collect_markdown(targets)
+    if not paths:
+        print("No Markdown files matched.")
+        return
+    if args.merkle:
+        sign_merkle(paths, load_or_create_key())
+        return
+    count = sign_all(paths, load_or_create_key(), args.workers, incremental=args.incremental)
+    print(f"Signed {count} file(s).")
+
+
+if __name__ == "__main__":
+    main()